@@ -0,0 +1,318 @@
+import argparse
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import functions.functions
+import src.etl
+from functions.functions import get_env_var, get_years, setup_logger
+from src.etl import (
+    SESSIONS,
+    TABLES,
+    extract_transform_history,
+    extract_transform_tables,
+    load_postgres,
+    run_pipeline,
+)
+from src.processing.data_validation import DataValidation
+from .fastf1_offline import FastF1Offline
+
+
+logger = setup_logger("benchmark")
+
+# Seconds between RSS samples while a stage runs.
+INTERVAL_RSS = 0.01
+
+
+def get_rss() -> float:
+    """
+    Get the current resident set size of this process.
+
+    Returns:
+        float: RSS in MB, read from /proc/self/statm.
+    """
+
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024**2
+
+
+def run_stage(
+    stages: List[Dict], name: str, func: Callable, *args
+) -> Tuple[object, float]:
+    """
+    Run one pipeline stage and record its wall time and peak RSS.
+
+    RSS is sampled every INTERVAL_RSS seconds while the stage runs, unlike the
+    process-lifetime ru_maxrss, so a stage using less memory than an earlier one
+    reports a lower peak. Spikes shorter than the interval may be missed.
+
+    Args:
+        stages (List[Dict]): The stage records to append to.
+        name (str): The stage name.
+        func (Callable): The stage function.
+        *args: Arguments passed to func.
+
+    Returns:
+        Tuple[object, float]: The stage's output and its wall time in seconds.
+    """
+
+    peak = [get_rss()]
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.wait(INTERVAL_RSS):
+            peak[0] = max(peak[0], get_rss())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+
+    start = time.perf_counter()
+    try:
+        output = func(*args)
+    finally:
+        seconds = time.perf_counter() - start
+        done.set()
+        sampler.join()
+
+    stages.append(
+        {"stage": name, "seconds": seconds, "peak_rss_mb": max(peak[0], get_rss())}
+    )
+
+    return output, seconds
+
+
+def get_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command-line arguments of a benchmark run.
+
+    Args:
+        argv (Optional[List[str]]): The arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmark.etl_benchmark",
+        description="Run the ETL end to end on synthetic seasons and time each stage.",
+    )
+    parser.add_argument("--year-start", type=int, default=2018)
+    parser.add_argument("--year-end", type=int, default=2023)
+    parser.add_argument(
+        "--n-rounds", type=int, default=22, help="Rounds in each season."
+    )
+    parser.add_argument(
+        "--n-teams", type=int, default=10, help="Teams, of two drivers each."
+    )
+    parser.add_argument(
+        "--n-rookies", type=int, default=3, help="Drivers replaced every season."
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated seconds per FastF1 request.",
+    )
+    parser.add_argument(
+        "--sleep",
+        type=float,
+        default=0.0,
+        help="Pause between requests, replacing the ETL's rate-limit pause.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--skip-load",
+        action="store_true",
+        help="Stop after validation, without a database.",
+    )
+    parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="Overwrite existing rows instead of skipping them.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run the stages overlapped round by round, timed as one stage.",
+    )
+    parser.add_argument(
+        "--output", help="CSV file to append the stage timings to, for comparisons."
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Main function for the offline ETL benchmark.
+
+    This function performs the following steps:
+    1. Replaces FastF1 with an offline generator of synthetic seasons.
+    2. Extracts and transforms the sessions of every round.
+    3. Builds the normalized tables and validates them.
+    4. Loads them into the Postgres database of the POSTGRES_* environment variables,
+       unless --skip-load is given.
+    5. Logs rows/s, wall time and peak RSS per stage, or for the whole pipeline if
+       --pipeline is given.
+
+    Parameters:
+    argv (Optional[List[str]]): The command-line arguments. Defaults to sys.argv.
+
+    Returns:
+    pd.DataFrame: One row per stage with its rows, seconds, rows/s and peak RSS.
+    """
+
+    args = get_args(argv)
+
+    functions.functions.ff1 = FastF1Offline(
+        n_rounds=args.n_rounds,
+        n_teams=args.n_teams,
+        n_rookies=args.n_rookies,
+        latency=args.latency,
+        seed=args.seed,
+    )
+    src.etl.SLEEP_REQUEST = args.sleep
+
+    list_years = get_years(args.year_start, args.year_end)
+    stages = []
+
+    if args.pipeline:
+        if not args.skip_load:
+            get_env_var(".env")
+        db = [
+            os.environ.get(var)
+            for var in [
+                "POSTGRES_USER",
+                "POSTGRES_PASSWORD",
+                "POSTGRES_DB",
+                "POSTGRES_HOST",
+                "POSTGRES_PORT",
+                "SCHEMA_NAME",
+            ]
+        ]
+        output, _ = run_stage(
+            stages,
+            "pipeline",
+            run_pipeline,
+            list_years,
+            None,
+            SESSIONS,
+            [t["table"] for t in TABLES.values()],
+            *db,
+            args.upsert,
+            not args.skip_load,
+        )
+        stages[-1]["rows"] = sum(len(df) for df in output[0].values())
+    else:
+        run_stages(stages, list_years, args)
+
+    return log_stages(stages, list_years, args)
+
+
+def run_stages(
+    stages: List[Dict], list_years: List[int], args: argparse.Namespace
+) -> None:
+    """
+    Run the ETL stages one after the other, as the batch ETL does, timing each.
+
+    Args:
+        stages (List[Dict]): The stage records to append to.
+        list_years (List[int]): The years to process.
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        None.
+    """
+
+    output, _ = run_stage(stages, "extract", extract_transform_history, list_years)
+    stages[-1]["rows"] = sum(len(df) for df in output[:5] if df is not None)
+
+    tables, _ = run_stage(stages, "transform", extract_transform_tables, *output[:5])
+    stages[-1]["rows"] = sum(len(df) for df in tables)
+
+    instance_validation = DataValidation()
+    names = [t["table"] for t in TABLES.values()]
+    tables, _ = run_stage(
+        stages,
+        "validate",
+        lambda: [
+            instance_validation.get_df_valid(df, name)
+            for df, name in zip(tables, names)
+        ],
+    )
+    stages[-1]["rows"] = sum(len(df) for df in tables)
+
+    report = instance_validation.get_report()
+    if report:
+        logger.warning(f"Quarantined rows: {report}.")
+
+    if not args.skip_load:
+        get_env_var(".env")
+        run_stage(
+            stages,
+            "load",
+            load_postgres,
+            os.environ["POSTGRES_USER"],
+            os.environ["POSTGRES_PASSWORD"],
+            os.environ["POSTGRES_DB"],
+            os.environ["POSTGRES_HOST"],
+            os.environ["POSTGRES_PORT"],
+            *tables,
+            os.environ["SCHEMA_NAME"],
+            None,
+            args.upsert,
+        )
+        stages[-1]["rows"] = sum(len(df) for df in tables)
+
+
+def log_stages(
+    stages: List[Dict], list_years: List[int], args: argparse.Namespace
+) -> pd.DataFrame:
+    """
+    Log the throughput of each stage and append it to the output CSV, if any.
+
+    Args:
+        stages (List[Dict]): The stage records.
+        list_years (List[int]): The years processed.
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        pd.DataFrame: One row per stage with its rows, seconds, rows/s and peak RSS.
+    """
+
+    df_stages = pd.DataFrame(stages)[["stage", "rows", "seconds", "peak_rss_mb"]]
+    df_stages["rows_per_s"] = df_stages["rows"] / df_stages["seconds"]
+
+    for stage in df_stages.itertuples():
+        logger.info(
+            f"{stage.stage}: {stage.rows} rows in {stage.seconds:.2f}s "
+            f"({stage.rows_per_s:,.0f} rows/s), peak RSS {stage.peak_rss_mb:.0f} MB."
+        )
+    logger.info(
+        f"Total: {df_stages['seconds'].sum():.2f}s for {len(list_years)} seasons of "
+        f"{args.n_rounds} rounds and {2 * args.n_teams} drivers."
+    )
+
+    if args.output is not None:
+        df_stages.assign(
+            years=len(list_years),
+            n_rounds=args.n_rounds,
+            n_teams=args.n_teams,
+            latency=args.latency,
+        ).to_csv(
+            args.output,
+            mode="a",
+            header=not os.path.isfile(args.output),
+            index=False,
+        )
+
+    return df_stages
+
+
+if __name__ == "__main__":
+    main()
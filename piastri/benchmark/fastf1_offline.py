@@ -0,0 +1,297 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+
+CODES_RETIRED = ["R", "D", "E", "W", "F", "N"]
+
+
+class SessionOffline:
+    def __init__(
+        self,
+        year: int,
+        round: int,
+        session: str,
+        drivers: pd.DataFrame,
+        latency: float,
+    ):
+        self.year = year
+        self.round = round
+        self.session = session
+        self.drivers = drivers
+        self.latency = latency
+        self.event = pd.Series(
+            {
+                "RoundNumber": round,
+                "Country": f"Country {round}",
+                "Location": f"Circuit {round}",
+                "EventDate": pd.Timestamp(year=year, month=3, day=1)
+                + pd.Timedelta(weeks=round),
+                "EventName": f"Grand Prix {round}",
+            }
+        )
+        self.t0_date = self.event["EventDate"] + pd.Timedelta(hours=13)
+        self.results = None
+        self.weather_data = None
+        self.race_control_messages = None
+
+    def __get_results_quali(self, rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Generate qualifying results with Q1-Q3 knockouts of the slowest drivers.
+
+        Args:
+            rng (np.random.Generator): Random generator seeded by year and round.
+
+        Returns:
+            pd.DataFrame: Results in the shape of FastF1's session.results.
+        """
+
+        n = len(self.drivers)
+        base = rng.uniform(70, 100)
+        pace = base + self.drivers["pace"].to_numpy()
+
+        times = {}
+        running = np.arange(n)
+        for session, n_out in zip(["Q1", "Q2", "Q3"], [max(n - 15, 0), 5, 0]):
+            t = np.full(n, np.nan)
+            t[running] = pace[running] + rng.normal(0, 0.3, len(running))
+            times[session] = pd.to_timedelta(t, unit="s")
+            order = running[np.argsort(t[running])]
+            running = order[: len(order) - n_out] if n_out else order
+
+        df = self.drivers[["DriverId", "LastName", "FirstName", "TeamName"]].copy()
+        for session, t in times.items():
+            df[session] = t
+        # Drivers reaching a later session rank ahead of those knocked out before it.
+        stage = df[["Q1", "Q2", "Q3"]].notna().sum(axis=1)
+        last = df[["Q3", "Q2", "Q1"]].bfill(axis=1)["Q3"]
+        df = df.assign(stage=-stage, last=last).sort_values(["stage", "last"])
+        df["Position"] = np.arange(1, n + 1, dtype=float)
+
+        return df.drop(columns=["stage", "last"]).reset_index(drop=True)
+
+    def __get_results_race(self, rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Generate race results with retirements and gaps to the winner.
+
+        Args:
+            rng (np.random.Generator): Random generator seeded by year and round.
+
+        Returns:
+            pd.DataFrame: Results in the shape of FastF1's session.results.
+        """
+
+        n = len(self.drivers)
+        total = 5400 + 60 * self.drivers["pace"].to_numpy() + rng.normal(0, 15, n)
+        retired = rng.random(n) < 0.1
+        order = np.argsort(np.where(retired, np.inf, total))
+
+        df = (
+            self.drivers[["DriverId", "LastName", "FirstName", "TeamName"]]
+            .iloc[order]
+            .reset_index(drop=True)
+        )
+        total, retired = total[order], retired[order]
+
+        classified = np.arange(1, n + 1).astype(str).astype(object)
+        classified[retired] = rng.choice(CODES_RETIRED, retired.sum())
+        df["ClassifiedPosition"] = classified
+        df["Position"] = np.arange(1, n + 1, dtype=float)
+
+        # FastF1 reports the winner's total time and every other finisher's gap to it.
+        gap = np.where(retired, np.nan, total - total[0])
+        gap[0] = total[0]
+        df["Time"] = pd.to_timedelta(gap, unit="s")
+
+        return df
+
+    def __get_weather_data(self, rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Generate weather samples, once a minute as FastF1 reports them.
+
+        Args:
+            rng (np.random.Generator): Random generator seeded by year and round.
+
+        Returns:
+            pd.DataFrame: Samples in the shape of FastF1's session.weather_data.
+        """
+
+        n = 70 if self.session == "Q" else 110
+        track_temp = rng.uniform(20, 50) + np.cumsum(rng.normal(0, 0.2, n))
+
+        return pd.DataFrame(
+            {
+                "Time": pd.to_timedelta(np.arange(n), unit="min"),
+                "AirTemp": track_temp - rng.uniform(5, 15),
+                "Humidity": rng.uniform(30, 80, n),
+                "Pressure": rng.uniform(990, 1020, n),
+                "Rainfall": rng.random(n) < 0.05,
+                "TrackTemp": track_temp,
+                "WindDirection": rng.integers(0, 360, n),
+                "WindSpeed": rng.uniform(0, 5, n),
+            }
+        )
+
+    def __get_race_control_messages(self, rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Generate race control messages with sector yellows and, in races, a safety car.
+
+        Args:
+            rng (np.random.Generator): Random generator seeded by year and round.
+
+        Returns:
+            pd.DataFrame: Messages in the shape of FastF1's race_control_messages.
+        """
+
+        rows = [
+            (0, "Flag", "GREEN", "Track", None, None, "GREEN LIGHT - PIT EXIT OPEN")
+        ]
+        for minute in np.sort(rng.uniform(5, 60, 6)):
+            sector = int(rng.integers(1, 20))
+            rows.append((minute, "Flag", "YELLOW", "Sector", sector, None, "YELLOW"))
+            rows.append((minute + 1, "Flag", "CLEAR", "Sector", sector, None, "CLEAR"))
+        if self.session == "R":
+            minute = rng.uniform(20, 80)
+            rows.append(
+                (
+                    minute,
+                    "SafetyCar",
+                    None,
+                    "Track",
+                    None,
+                    "DEPLOYED",
+                    "SAFETY CAR DEPLOYED",
+                )
+            )
+            rows.append(
+                (minute + 5, "Flag", "CLEAR", "Track", None, None, "TRACK CLEAR")
+            )
+        rows.append((100, "Flag", "CHEQUERED", "Track", None, None, "CHEQUERED FLAG"))
+
+        df = pd.DataFrame(
+            rows,
+            columns=[
+                "Time",
+                "Category",
+                "Flag",
+                "Scope",
+                "Sector",
+                "Status",
+                "Message",
+            ],
+        )
+        df["Time"] = self.t0_date + pd.to_timedelta(df["Time"], unit="min")
+        df["RacingNumber"] = None
+        df["Lap"] = (df["Time"] - self.t0_date).dt.total_seconds() // 90 + 1
+
+        return df.sort_values("Time").reset_index(drop=True)
+
+    def load(self, **kwargs) -> None:
+        """
+        Generate the session's results, weather and messages after a simulated latency.
+
+        Args:
+            **kwargs: Ignored, accepted for compatibility with FastF1.
+
+        Returns:
+            None.
+        """
+
+        time.sleep(self.latency)
+
+        rng = np.random.default_rng([self.year, self.round, ord(self.session)])
+        if self.session == "Q":
+            self.results = self.__get_results_quali(rng)
+        else:
+            self.results = self.__get_results_race(rng)
+        self.weather_data = self.__get_weather_data(rng)
+        self.race_control_messages = self.__get_race_control_messages(rng)
+
+
+class FastF1Offline:
+    def __init__(
+        self,
+        n_rounds: int = 22,
+        n_teams: int = 10,
+        n_rookies: int = 3,
+        latency: float = 0.0,
+        seed: int = 0,
+    ):
+        self.n_rounds = n_rounds
+        self.n_teams = n_teams
+        self.n_rookies = n_rookies
+        self.latency = latency
+        self.seed = seed
+        self.grids = {}
+
+    def __get_grid(self, year: int) -> pd.DataFrame:
+        """
+        Get a season's drivers, replacing a few with rookies every year.
+
+        Args:
+            year (int): The season.
+
+        Returns:
+            pd.DataFrame: One row per driver with FastF1 result columns and a pace offset.
+        """
+
+        if year in self.grids:
+            return self.grids[year]
+
+        n = 2 * self.n_teams
+        rng = np.random.default_rng([self.seed, year])
+
+        if year - 1 in self.grids:
+            grid = self.grids[year - 1].copy()
+            out = rng.choice(n, self.n_rookies, replace=False)
+            grid.loc[out, "DriverId"] = [f"driver_{year}_{i}" for i in range(len(out))]
+            grid.loc[out, "pace"] = rng.normal(1.0, 0.5, len(out))
+        else:
+            grid = pd.DataFrame(
+                {
+                    "DriverId": [f"driver_{year}_{i}" for i in range(n)],
+                    "TeamName": [f"Team {i // 2}" for i in range(n)],
+                    "pace": rng.normal(1.0, 0.5, n),
+                }
+            )
+
+        grid["LastName"] = grid["DriverId"].str.title()
+        grid["FirstName"] = "First"
+        self.grids[year] = grid
+
+        return grid
+
+    def get_event_schedule(self, year: int, **kwargs) -> pd.DataFrame:
+        """
+        Stand-in for fastf1.get_event_schedule, including a round 0 testing event.
+
+        Args:
+            year (int): The season.
+            **kwargs: Ignored, accepted for compatibility with FastF1.
+
+        Returns:
+            pd.DataFrame: The schedule with a 'RoundNumber' column.
+        """
+
+        time.sleep(self.latency)
+
+        return pd.DataFrame({"RoundNumber": list(range(0, self.n_rounds + 1))})
+
+    def get_session(self, year: int, round: int, session: str) -> SessionOffline:
+        """
+        Stand-in for fastf1.get_session.
+
+        Args:
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (Q, R).
+
+        Returns:
+            SessionOffline: A session whose load() generates results.
+        """
+
+        for y in range(min([year, *self.grids]), year + 1):
+            grid = self.__get_grid(y)
+
+        return SessionOffline(year, round, session, grid, self.latency)
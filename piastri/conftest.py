@@ -0,0 +1,2 @@
+# Makes `src` and `functions` importable from the tests when pytest runs from this
+# directory.
@@ -5,12 +5,13 @@ import smtplib
 
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Dict, List
+from typing import Any, Dict, List
 
 import fastf1 as ff1
 import pandas as pd
 
-from sqlalchemy import create_engine, MetaData, Table
+from sqlalchemy import create_engine, MetaData, or_, select, Table, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.dialects.postgresql import insert
 
 
@@ -68,6 +69,21 @@ def get_rounds(year: int) -> List[int]:
     return [r for r in rounds_all if r > 0]
 
 
+def get_schedule(year: int) -> pd.DataFrame:
+    """
+    Get the event schedule of a given year, with the start of every session.
+
+    Args:
+        year (int): The year of the schedule.
+
+    Returns:
+        pd.DataFrame: One row per event, with 'RoundNumber' and 'Session1' to 'Session5'
+            names and 'Session1DateUtc' to 'Session5DateUtc' start times.
+    """
+
+    return ff1.get_event_schedule(year, include_testing=False)
+
+
 def get_data_session(year: str, round: str, session: str) -> None:
     """
     Retrieve session data for a given year, round, and session.
@@ -87,39 +103,41 @@ def get_data_session(year: str, round: str, session: str) -> None:
     return session
 
 
-def get_df_sessions(df_quali: pd.DataFrame, df_race: pd.DataFrame) -> pd.DataFrame:
+def get_data_session_results(year: int, round: int, session: str) -> object:
     """
-    Concatenates the given qualifying and race DataFrames into a single DataFrame.
+    Retrieve only the results and event of a session, skipping laps, telemetry,
+    weather and messages, for frequent polling.
 
     Args:
-        df_quali (pd.DataFrame): The DataFrame containing qualifying data.
-        df_race (pd.DataFrame): The DataFrame containing race data.
+        year (int): The year of the session.
+        round (int): The round number of the session.
+        session (str): The session type (Q, R).
 
     Returns:
-        pd.DataFrame: The concatenated DataFrame containing both qualifying and race data.
+        object: The session, with results loaded.
     """
 
-    df_sessions = pd.concat([df_quali, df_race], ignore_index=True)
-    df_sessions = df_sessions.dropna(subset=["id_driver"])
+    session = ff1.get_session(year, round, session)
+    session.load(laps=False, telemetry=False, weather=False, messages=False)
 
-    return df_sessions
+    return session
 
 
-def get_df_denormalized(
-    df_sessions: pd.DataFrame, df_event: pd.DataFrame
-) -> pd.DataFrame:
+def get_df_sessions(df_quali: pd.DataFrame, df_race: pd.DataFrame) -> pd.DataFrame:
     """
-    Merge the sessions DataFrame with the event DataFrame based on the year and round columns.
+    Concatenates the given qualifying and race DataFrames into a single DataFrame.
 
     Args:
-        df_sessions (pd.DataFrame): The sessions DataFrame.
-        df_event (pd.DataFrame): The event DataFrame.
+        df_quali (pd.DataFrame): The DataFrame containing qualifying data.
+        df_race (pd.DataFrame): The DataFrame containing race data.
 
     Returns:
-        pd.DataFrame: DataFrame containing denormalized data for sessions and event.
+        pd.DataFrame: The concatenated DataFrame containing both qualifying and race data.
     """
 
-    return df_event.merge(df_sessions, on=["year", "round"], how="outer")
+    df_sessions = pd.concat([df_quali, df_race], ignore_index=True)
+
+    return df_sessions
 
 
 def get_env_var(filename: str) -> None:
@@ -150,8 +168,8 @@ def set_env_var():
         - POSTGRES_PASSWORD: Password for the PostgreSQL database.
         - POSTGRES_HOST: Host address of the PostgreSQL database.
         - POSTGRES_PORT: Port number of the PostgreSQL database.
-        - YEAR_START: Starting year for some process (converted to int).
-        - YEAR_END: Ending year for some process (converted to int).
+        - YEAR_START: Starting year for some process (converted to int), optional.
+        - YEAR_END: Ending year for some process (converted to int), optional.
         - SCHEMA_NAME: Name of the schema in the PostgreSQL database.
         - EMAIL_PW: Password for email.
 
@@ -162,8 +180,8 @@ def set_env_var():
             - db_password (str): Password for the PostgreSQL database.
             - db_host (str): Host address of the PostgreSQL database.
             - db_port (str): Port number of the PostgreSQL database.
-            - year_start (int): Starting year for some process.
-            - year_end (int): Ending year for some process.
+            - year_start (Optional[int]): Starting year for some process, None if unset.
+            - year_end (Optional[int]): Ending year for some process, None if unset.
             - schema (str): Name of the schema in the PostgreSQL database.
             - pw (str): Password for email.
     """
@@ -174,8 +192,9 @@ def set_env_var():
     db_host = os.environ["POSTGRES_HOST"]
     db_port = os.environ["POSTGRES_PORT"]
 
-    year_start = int(os.environ["YEAR_START"])
-    year_end = int(os.environ["YEAR_END"])
+    # Years may come from elsewhere, e.g. the ETL's --year-start and --year-end.
+    year_start = int(os.environ["YEAR_START"]) if "YEAR_START" in os.environ else None
+    year_end = int(os.environ["YEAR_END"]) if "YEAR_END" in os.environ else None
 
     schema = os.environ["SCHEMA_NAME"]
 
@@ -194,6 +213,29 @@ def set_env_var():
     )
 
 
+def get_engine(user: str, password: str, database: str, host: str, port: str) -> Engine:
+    """
+    Create a SQLAlchemy engine, with a connection pool, for a PostgreSQL database.
+
+    Args:
+        user (str): The username for the database connection.
+        password (str): The password for the database connection.
+        database (str): The name of the database.
+        host (str): The host address of the database.
+        port (str): The port number of the database.
+
+    Returns:
+        Engine: The SQLAlchemy engine.
+    """
+
+    return create_engine(
+        f"postgresql://{user}:{password}@{host}:{port}/{database}",
+        pool_size=5,
+        max_overflow=5,
+        pool_pre_ping=True,
+    )
+
+
 def write_df_postgres(
     user: str,
     password: str,
@@ -204,6 +246,8 @@ def write_df_postgres(
     schema: str,
     table: str,
     keys: List[str],
+    upsert: bool = False,
+    version: bool = False,
 ) -> None:
     """
     Write a DataFrame to a PostgreSQL table.
@@ -218,23 +262,203 @@ def write_df_postgres(
         schema (str): The schema for the target table.
         table (str): The target table for the DataFrame.
         keys (List[str]): A list of primary key columns for the target table.
+        upsert (bool): Whether to overwrite existing rows with conflicting keys.
+        version (bool): Whether to bump the schema's data_version in the same
+            transaction if any row was inserted or changed, so readers caching the
+            data notice the write.
+
+    Returns:
+        None.
+    """
+
+    if df.empty:
+        return None
+
+    engine = get_engine(user, password, database, host, port)
+
+    metadata = MetaData()
+    obj_table = Table(table, metadata, autoload_with=engine, schema=schema)
+
+    # Rows are written in key order, so concurrent writers lock shared rows in the
+    # same order. Missing values of any dtype, such as pd.NA, load as NULL.
+    df = df.sort_values(keys) if keys else df
+    data = df.astype(object).where(df.notna(), None).to_dict("records")
+
+    columns = [c for c in df.columns if c not in keys]
+
+    # Existing rows are only updated where a value differs, so the row count is that
+    # of rows inserted or changed.
+    stmt = insert(obj_table).values(data)
+    if upsert and keys and columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={c: stmt.excluded[c] for c in columns},
+            where=or_(
+                *[obj_table.c[c].is_distinct_from(stmt.excluded[c]) for c in columns]
+            ),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+
+    with engine.begin() as connection:
+        n_rows = connection.execute(stmt).rowcount
+        if version and n_rows:
+            connection.execute(
+                text(f"UPDATE {schema}.data_version SET version = version + 1")
+            )
+
+
+def refresh_view_postgres(
+    user: str,
+    password: str,
+    database: str,
+    host: str,
+    port: str,
+    schema: str,
+    view: str,
+) -> None:
+    """
+    Refresh a PostgreSQL materialized view without blocking readers.
+
+    Args:
+        user (str): The username for the database connection.
+        password (str): The password for the database connection.
+        database (str): The name of the database.
+        host (str): The host address of the database.
+        port (str): The port number of the database.
+        schema (str): The schema of the materialized view.
+        view (str): The materialized view to refresh.
 
     Returns:
         None.
     """
 
-    engine = create_engine(f"postgresql://{user}:{password}@{host}:{port}/{database}")
+    engine = get_engine(user, password, database, host, port)
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {schema}.{view}")
+        )
+
+
+def write_keys_postgres(
+    user: str,
+    password: str,
+    database: str,
+    host: str,
+    port: str,
+    df: pd.DataFrame,
+    schema: str,
+    table: str,
+    natural: str,
+    key: str,
+    upsert: bool = False,
+) -> Dict[Any, int]:
+    """
+    Insert dimension rows by natural key and return the surrogate key of each.
+
+    Keys are assigned by the table's identity column, so concurrent writers can't give
+    the same key to different rows. Rows are written in natural key order, so
+    concurrent writers lock shared rows in the same order. The schema's data_version
+    is bumped in the same transaction if any row was inserted or changed.
+
+    Args:
+        user (str): The username for the database connection.
+        password (str): The password for the database connection.
+        database (str): The name of the database.
+        host (str): The host address of the database.
+        port (str): The port number of the database.
+        df (pd.DataFrame): The dimension rows, without their surrogate key.
+        schema (str): The schema for the target table.
+        table (str): The dimension table.
+        natural (str): The natural key column, with a unique constraint.
+        key (str): The surrogate key column, an identity column.
+        upsert (bool): Whether to overwrite the other columns of existing rows.
+
+    Returns:
+        Dict[Any, int]: The surrogate key of every natural key in df.
+    """
+
+    if df.empty:
+        return {}
+
+    engine = get_engine(user, password, database, host, port)
 
     metadata = MetaData()
     obj_table = Table(table, metadata, autoload_with=engine, schema=schema)
 
-    data = df.to_dict("records")
+    data = df.drop_duplicates(subset=[natural]).sort_values(natural).to_dict("records")
+    columns = [c for c in df.columns if c != natural] if upsert else []
 
+    # RETURNING only covers rows inserted or changed; existing rows are updated only
+    # where a value differs, and their keys are read afterwards.
     stmt = insert(obj_table).values(data)
-    stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+    if columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[natural],
+            set_={c: stmt.excluded[c] for c in columns},
+            where=or_(
+                *[obj_table.c[c].is_distinct_from(stmt.excluded[c]) for c in columns]
+            ),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[natural])
+    stmt = stmt.returning(obj_table.c[natural], obj_table.c[key])
 
     with engine.begin() as connection:
-        connection.execute(stmt)
+        keys = dict(connection.execute(stmt).all())
+        if keys:
+            connection.execute(
+                text(f"UPDATE {schema}.data_version SET version = version + 1")
+            )
+
+        values = [row[natural] for row in data if row[natural] not in keys]
+        if values:
+            keys.update(
+                connection.execute(
+                    select(obj_table.c[natural], obj_table.c[key]).where(
+                        obj_table.c[natural].in_(values)
+                    )
+                ).all()
+            )
+
+    return {value: int(k) for value, k in keys.items()}
+
+
+def write_df_staging(df: pd.DataFrame, path: str, name: str) -> None:
+    """
+    Stage a DataFrame on disk so later ETL stages can run without re-extracting.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to stage.
+        path (str): The staging directory.
+        name (str): The name of the staged DataFrame.
+
+    Returns:
+        None.
+    """
+
+    os.makedirs(path, exist_ok=True)
+    df.to_pickle(os.path.join(path, f"{name}.pkl"))
+
+
+def read_df_staging(path: str, name: str) -> pd.DataFrame:
+    """
+    Read a DataFrame staged by a previous ETL run.
+
+    Args:
+        path (str): The staging directory.
+        name (str): The name of the staged DataFrame.
+
+    Returns:
+        pd.DataFrame: The staged DataFrame.
+    """
+
+    file = os.path.join(path, f"{name}.pkl")
+    if not os.path.isfile(file):
+        raise FileNotFoundError(f"No staged data for {name} in {path}.")
+
+    return pd.read_pickle(file)
 
 
 def email_missing_data(
@@ -0,0 +1,287 @@
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from sqlalchemy.engine import Connection
+
+from .functions import get_engine
+
+
+TYPES_ARROW = {
+    "smallint": pa.int16(),
+    "integer": pa.int32(),
+    "bigint": pa.int64(),
+    "real": pa.float32(),
+    "double precision": pa.float64(),
+    "numeric": pa.float64(),
+    "interval": pa.float64(),
+    "boolean": pa.bool_(),
+    "date": pa.date32(),
+    "timestamp without time zone": pa.timestamp("us"),
+    "timestamp with time zone": pa.timestamp("us", tz="UTC"),
+}
+
+
+def get_column_types(connection: Connection, schema: str, table: str) -> Dict[str, str]:
+    """
+    Get the columns of a table, view or materialized view with their Postgres types.
+
+    Args:
+        connection (Connection): An open connection to the database.
+        schema (str): The schema of the relation.
+        table (str): The table, view or materialized view.
+
+    Returns:
+        Dict[str, str]: Type names keyed by column, in table order.
+    """
+
+    # pg_attribute, unlike information_schema, also covers materialized views.
+    rows = connection.exec_driver_sql(
+        """
+        SELECT
+            a.attname,
+            format_type(a.atttypid, NULL)
+        FROM
+            pg_attribute a
+        WHERE
+            a.attrelid = to_regclass(%(relation)s)
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+        ORDER BY
+            a.attnum
+        """,
+        {"relation": f"{schema}.{table}"},
+    ).all()
+
+    if not rows:
+        raise ValueError(f"No relation {schema}.{table} in the database.")
+
+    return dict(rows)
+
+
+def get_query_select(
+    types: Dict[str, str],
+    schema: str,
+    table: str,
+    columns: Optional[List[str]] = None,
+    years: Optional[List[int]] = None,
+    rounds: Optional[List[int]] = None,
+) -> Tuple[str, Dict[str, List[int]]]:
+    """
+    Build a SELECT projecting the requested columns and filtering on year and round.
+
+    Intervals are selected as seconds, so every column maps to an Arrow type.
+
+    Args:
+        types (Dict[str, str]): Column types from get_column_types.
+        schema (str): The schema of the relation.
+        table (str): The table, view or materialized view.
+        columns (Optional[List[str]]): Columns to select. Defaults to all.
+        years (Optional[List[int]]): Years to keep. Defaults to all.
+        rounds (Optional[List[int]]): Rounds to keep. Defaults to all.
+
+    Returns:
+        Tuple[str, Dict[str, List[int]]]: The statement, in the driver's parameter
+            style, and its parameters.
+    """
+
+    columns = columns or list(types)
+    cols_unknown = set(columns) - set(types)
+    if cols_unknown:
+        raise ValueError(f"{schema}.{table} has no columns {cols_unknown}.")
+
+    select = [
+        (
+            f'EXTRACT(EPOCH FROM "{col}") AS "{col}"'
+            if types[col] == "interval"
+            else f'"{col}"'
+        )
+        for col in columns
+    ]
+
+    where = []
+    params = {}
+    for col, values in [("year", years), ("round", rounds)]:
+        if values is None:
+            continue
+        if col not in types:
+            raise ValueError(f"{schema}.{table} has no column {col} to filter on.")
+        where.append(f'"{col}" = ANY(%({col}s)s)')
+        params[f"{col}s"] = [int(v) for v in values]
+
+    query = f'SELECT {", ".join(select)} FROM "{schema}"."{table}"'
+    if where:
+        query += f" WHERE {' AND '.join(where)}"
+
+    return query, params
+
+
+def get_types_arrow(
+    types: Dict[str, str], columns: Optional[List[str]] = None
+) -> Dict[str, pa.DataType]:
+    """
+    Map the Postgres types of the selected columns to the Arrow types they're read as.
+
+    Intervals are selected as seconds, and types without an Arrow equivalent, such as
+    text and enums, are read as strings.
+
+    Args:
+        types (Dict[str, str]): Column types from get_column_types.
+        columns (Optional[List[str]]): The selected columns. Defaults to all.
+
+    Returns:
+        Dict[str, pa.DataType]: Arrow types keyed by column.
+    """
+
+    return {col: TYPES_ARROW.get(types[col], pa.string()) for col in columns or types}
+
+
+def read_df_chunks(
+    user: str,
+    password: str,
+    database: str,
+    host: str,
+    port: str,
+    schema: str,
+    table: str,
+    columns: Optional[List[str]] = None,
+    years: Optional[List[int]] = None,
+    rounds: Optional[List[int]] = None,
+    chunksize: int = 50000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a table as DataFrames of at most chunksize rows, through a server-side cursor.
+
+    Only one chunk is held in memory at a time; intervals are returned as seconds.
+
+    Args:
+        user (str): The username for the database connection.
+        password (str): The password for the database connection.
+        database (str): The name of the database.
+        host (str): The host address of the database.
+        port (str): The port number of the database.
+        schema (str): The schema of the relation.
+        table (str): The table, view or materialized view to read.
+        columns (Optional[List[str]]): Columns to read. Defaults to all.
+        years (Optional[List[int]]): Years to keep. Defaults to all.
+        rounds (Optional[List[int]]): Rounds to keep. Defaults to all.
+        chunksize (int): The number of rows per DataFrame.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+    """
+
+    engine = get_engine(user, password, database, host, port)
+
+    # The pool is closed once the generator is exhausted, closed or collected.
+    try:
+        with engine.connect() as connection:
+            types = get_column_types(connection, schema, table)
+            query, params = get_query_select(
+                types, schema, table, columns, years, rounds
+            )
+
+            result = connection.execution_options(
+                stream_results=True, max_row_buffer=chunksize
+            ).exec_driver_sql(query, params)
+            keys = list(result.keys())
+
+            for rows in result.partitions(chunksize):
+                yield pd.DataFrame.from_records(rows, columns=keys)
+    finally:
+        engine.dispose()
+
+
+def read_batches_arrow(
+    user: str,
+    password: str,
+    database: str,
+    host: str,
+    port: str,
+    schema: str,
+    table: str,
+    columns: Optional[List[str]] = None,
+    years: Optional[List[int]] = None,
+    rounds: Optional[List[int]] = None,
+    block_size: int = 1 << 20,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Stream a table as Arrow record batches through COPY TO STDOUT.
+
+    Postgres writes CSV into a pipe from a background thread while Arrow parses it
+    block by block, so memory stays bounded by block_size and rows never become
+    Python objects. Intervals are returned as seconds.
+
+    Args:
+        user (str): The username for the database connection.
+        password (str): The password for the database connection.
+        database (str): The name of the database.
+        host (str): The host address of the database.
+        port (str): The port number of the database.
+        schema (str): The schema of the relation.
+        table (str): The table, view or materialized view to read.
+        columns (Optional[List[str]]): Columns to read. Defaults to all.
+        years (Optional[List[int]]): Years to keep. Defaults to all.
+        rounds (Optional[List[int]]): Rounds to keep. Defaults to all.
+        block_size (int): Bytes of CSV parsed into each record batch.
+
+    Yields:
+        pa.RecordBatch: The next batch of rows, typed from the table's columns.
+    """
+
+    engine = get_engine(user, password, database, host, port)
+
+    # The pool is closed once the generator is exhausted, closed or collected.
+    try:
+        with engine.connect() as connection:
+            types = get_column_types(connection, schema, table)
+            query, params = get_query_select(
+                types, schema, table, columns, years, rounds
+            )
+
+            cursor = connection.connection.cursor()
+            copy = cursor.mogrify(
+                f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", params
+            )
+
+            fd_read, fd_write = os.pipe()
+            errors = []
+
+            def write_csv():
+                try:
+                    with open(fd_write, "wb") as file:
+                        cursor.copy_expert(copy, file)
+                except Exception as e:
+                    errors.append(e)
+
+            thread = threading.Thread(target=write_csv, daemon=True)
+            thread.start()
+
+            file = open(fd_read, "rb")
+            try:
+                reader = pa_csv.open_csv(
+                    file,
+                    read_options=pa_csv.ReadOptions(block_size=block_size),
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types=get_types_arrow(types, columns),
+                        true_values=["t"],
+                        false_values=["f"],
+                        strings_can_be_null=True,
+                        quoted_strings_can_be_null=False,
+                    ),
+                )
+                for batch in reader:
+                    yield batch
+            finally:
+                # Closing the read end stops the COPY if the consumer stops early.
+                file.close()
+                thread.join()
+
+            if errors:
+                raise errors[0]
+    finally:
+        engine.dispose()
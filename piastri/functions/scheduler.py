@@ -0,0 +1,160 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+# Marks the end of a stage's input; each worker consumes one.
+DONE = object()
+
+
+class Stage:
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Hashable, Any], Any],
+        workers: int = 1,
+        retries: int = 0,
+        backoff: float = 1.0,
+    ):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+
+
+class Pipeline:
+    def __init__(
+        self,
+        stages: List[Stage],
+        maxsize: int = 2,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.stages = stages
+        self.maxsize = maxsize
+        self.logger = logger or logging.getLogger(__name__)
+        self.queues = None
+        self.workers_left = None
+        self.lock = threading.Lock()
+        self.results = {}
+        self.failed = {}
+        self.seconds = {}
+
+    def __run_task(self, stage: Stage, key: Hashable, payload: Any) -> Tuple[bool, Any]:
+        """
+        Run one task of a stage, retrying with exponential backoff.
+
+        Args:
+            stage (Stage): The stage to run.
+            key (Hashable): The task key, e.g. (year, round).
+            payload (Any): The output of the previous stage for this key.
+
+        Returns:
+            Tuple[bool, Any]: Whether the task succeeded, and its output.
+        """
+
+        for attempt in range(stage.retries + 1):
+            start = time.perf_counter()
+            try:
+                output, error = stage.func(key, payload), None
+            except Exception as e:
+                output, error = None, e
+            with self.lock:
+                self.seconds[stage.name] += time.perf_counter() - start
+
+            if error is None:
+                return True, output
+            if attempt == stage.retries:
+                self.logger.error(f"{stage.name} failed for {key}: {error}.")
+                with self.lock:
+                    self.failed[key] = (stage.name, error)
+                return False, None
+
+            self.logger.warning(
+                f"{stage.name} failed for {key}, retrying ({attempt + 1}/"
+                f"{stage.retries}): {error}."
+            )
+            time.sleep(stage.backoff * 2**attempt)
+
+    def __work(self, i: int) -> None:
+        """
+        Worker loop of stage i: take tasks from its queue and pass outputs downstream.
+
+        A task whose output is None is dropped, as is one that failed every attempt.
+        The last worker of a stage to finish signals the end of input to the next one.
+
+        Args:
+            i (int): The index of the stage.
+
+        Returns:
+            None.
+        """
+
+        stage = self.stages[i]
+        last = i == len(self.stages) - 1
+
+        while True:
+            item = self.queues[i].get()
+            if item is DONE:
+                break
+
+            key, payload = item
+            ok, output = self.__run_task(stage, key, payload)
+            if not ok or output is None:
+                continue
+
+            if last:
+                with self.lock:
+                    self.results[key] = output
+            else:
+                self.queues[i + 1].put((key, output))
+
+        with self.lock:
+            self.workers_left[i] -= 1
+            finished = self.workers_left[i] == 0
+        if finished and not last:
+            for _ in range(self.stages[i + 1].workers):
+                self.queues[i + 1].put(DONE)
+
+    def run(self, tasks: List[Tuple[Hashable, Any]]) -> Dict[Hashable, Any]:
+        """
+        Run every task through the stages, overlapping stages across tasks.
+
+        Stages are connected by queues of at most maxsize tasks, so a fast stage runs
+        ahead of a slow one by a bounded number of tasks, and throughput is set by the
+        slowest stage rather than the sum of all stages.
+
+        Args:
+            tasks (List[Tuple[Hashable, Any]]): (key, input) pairs for the first stage.
+
+        Returns:
+            Dict[Hashable, Any]: The output of the last stage, keyed by task. Failed
+                tasks are in self.failed with their stage and error, and the busy time
+                of each stage in self.seconds.
+        """
+
+        self.queues = [queue.Queue(maxsize=self.maxsize) for _ in self.stages]
+        self.workers_left = [stage.workers for stage in self.stages]
+        self.results = {}
+        self.failed = {}
+        self.seconds = {stage.name: 0.0 for stage in self.stages}
+
+        threads = [
+            threading.Thread(target=self.__work, args=(i,), daemon=True)
+            for i, stage in enumerate(self.stages)
+            for _ in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        for task in tasks:
+            self.queues[0].put(task)
+        for _ in range(self.stages[0].workers):
+            self.queues[0].put(DONE)
+
+        for thread in threads:
+            thread.join()
+
+        return self.results
@@ -3,57 +3,162 @@ SET search_path TO sessions;
 
 CREATE SCHEMA IF NOT EXISTS sessions;
 
-CREATE TABLE IF NOT EXISTS events_denormalized (
-    year SMALLINT NOT NULL,
-    round SMALLINT NOT NULL,
-    name_circuit TEXT NOT NULL,
-    country_circuit TEXT NOT NULL,
-    id_driver TEXT NOT NULL,
-    name_driver_last TEXT NOT NULL,
-    name_driver_first TEXT NOT NULL,
-    name_team TEXT NOT NULL,
-    session TEXT NOT NULL,
-    position TEXT NOT NULL,
-    time INTERVAL NULL, 
-    PRIMARY KEY (year, round, id_driver, session)
+DO $$
+BEGIN
+    CREATE TYPE result_status AS ENUM (
+        'classified',
+        'dnq',
+        'dnf',
+        'retired',
+        'disqualified',
+        'excluded',
+        'withdrawn',
+        'failed_to_qualify',
+        'not_classified'
+    );
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS session_types (
+    key_session SMALLINT PRIMARY KEY,
+    session TEXT NOT NULL UNIQUE
 );
 
+INSERT INTO session_types (key_session, session)
+VALUES (1, 'Q1'), (2, 'Q2'), (3, 'Q3'), (4, 'Race')
+ON CONFLICT DO NOTHING;
+
 CREATE TABLE IF NOT EXISTS events (
     year SMALLINT NOT NULL,
     round SMALLINT NOT NULL,
-    name_circuit TEXT NOT NULL,
+    key_circuit SMALLINT NOT NULL,
     PRIMARY KEY (year, round)
 );
 
 CREATE TABLE IF NOT EXISTS drivers (
-    id_driver TEXT PRIMARY KEY,
+    key_driver SMALLINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    id_driver TEXT NOT NULL UNIQUE,
     name_driver_last TEXT NOT NULL,
     name_driver_first TEXT NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS team_names (
+    key_team SMALLINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    name_team TEXT NOT NULL UNIQUE
+);
+
 CREATE TABLE IF NOT EXISTS teams (
-    name_team TEXT NOT NULL,
+    key_team SMALLINT NOT NULL,
     year SMALLINT NOT NULL,
-    id_driver TEXT NOT NULL,
-    UNIQUE (name_team, year, id_driver)
+    key_driver SMALLINT NOT NULL,
+    UNIQUE (key_team, year, key_driver)
 );
 
 CREATE TABLE IF NOT EXISTS circuits (
-    name_circuit TEXT PRIMARY KEY,
+    key_circuit SMALLINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    name_circuit TEXT NOT NULL UNIQUE,
     country_circuit TEXT NOT NULL
 );
 
 CREATE TABLE IF NOT EXISTS results (
     year SMALLINT NOT NULL,
     round SMALLINT NOT NULL,
-    id_driver TEXT NOT NULL,
-    name_team TEXT NOT NULL,
-    session TEXT NOT NULL,
-    position TEXT NOT NULL,
+    key_driver SMALLINT NOT NULL,
+    key_team SMALLINT NOT NULL,
+    key_session SMALLINT NOT NULL,
+    position SMALLINT NULL,
+    status result_status NOT NULL,
     time INTERVAL NULL,
-    PRIMARY KEY (year, round, id_driver, session)
+    PRIMARY KEY (year, round, key_driver, key_session)
+);
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL
+);
+
+INSERT INTO data_version (id, version)
+VALUES (TRUE, 0)
+ON CONFLICT DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS weather (
+    year SMALLINT NOT NULL,
+    round SMALLINT NOT NULL,
+    session TEXT NOT NULL,
+    time INTERVAL NOT NULL,
+    air_temp REAL NULL,
+    track_temp REAL NULL,
+    humidity REAL NULL,
+    pressure REAL NULL,
+    rainfall BOOLEAN NULL,
+    wind_speed REAL NULL,
+    wind_direction SMALLINT NULL,
+    PRIMARY KEY (year, round, session, time)
+);
+
+CREATE TABLE IF NOT EXISTS race_control (
+    year SMALLINT NOT NULL,
+    round SMALLINT NOT NULL,
+    session TEXT NOT NULL,
+    seq SMALLINT NOT NULL,
+    time INTERVAL NOT NULL,
+    lap SMALLINT NULL,
+    category TEXT NULL,
+    flag TEXT NULL,
+    scope TEXT NULL,
+    sector SMALLINT NULL,
+    racing_number TEXT NULL,
+    status TEXT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (year, round, session, seq)
 );
 
+CREATE MATERIALIZED VIEW IF NOT EXISTS events_denormalized AS
+    SELECT
+        r.year,
+        r.round,
+        e.key_circuit,
+        c.name_circuit,
+        c.country_circuit,
+        r.key_driver,
+        d.id_driver,
+        d.name_driver_last,
+        d.name_driver_first,
+        r.key_team,
+        t.name_team,
+        r.key_session,
+        s.session,
+        r.position,
+        r.status,
+        r.time
+    FROM
+        sessions.results r
+    LEFT JOIN
+        sessions.events e
+    ON
+        e.year = r.year
+        AND e.round = r.round
+    LEFT JOIN
+        sessions.circuits c
+    ON
+        c.key_circuit = e.key_circuit
+    LEFT JOIN
+        sessions.drivers d
+    ON
+        d.key_driver = r.key_driver
+    LEFT JOIN
+        sessions.team_names t
+    ON
+        t.key_team = r.key_team
+    LEFT JOIN
+        sessions.session_types s
+    ON
+        s.key_session = r.key_session;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ed_pk
+    ON sessions.events_denormalized (year, round, key_driver, key_session);
+
 CREATE INDEX IF NOT EXISTS idx_ed_y
     ON sessions.events_denormalized (year);
 
@@ -61,10 +166,10 @@ CREATE INDEX IF NOT EXISTS idx_ed_r
     ON sessions.events_denormalized (round);
 
 CREATE INDEX IF NOT EXISTS idx_ed_d
-    ON sessions.events_denormalized (id_driver);
+    ON sessions.events_denormalized (key_driver);
 
 CREATE INDEX IF NOT EXISTS idx_ed_s
-    ON sessions.events_denormalized (session);
+    ON sessions.events_denormalized (key_session);
 
 CREATE INDEX IF NOT EXISTS idx_e_y
     ON sessions.events (year);
@@ -72,26 +177,20 @@ CREATE INDEX IF NOT EXISTS idx_e_y
 CREATE INDEX IF NOT EXISTS idx_e_r
     ON sessions.events (round);
 
-CREATE INDEX IF NOT EXISTS idx_d_i
-    ON sessions.drivers (id_driver);
-
-CREATE INDEX IF NOT EXISTS idx_t_n
-    ON sessions.teams (name_team);
+CREATE INDEX IF NOT EXISTS idx_t_k
+    ON sessions.teams (key_team);
 
 CREATE INDEX IF NOT EXISTS idx_t_y
     ON sessions.teams (year);
 
-CREATE INDEX IF NOT EXISTS idx_c_n
-    ON sessions.circuits (name_circuit);
-
 CREATE INDEX IF NOT EXISTS idx_r_y
     ON sessions.results (year);
 
 CREATE INDEX IF NOT EXISTS idx_r_r
     ON sessions.results (round);
 
-CREATE INDEX IF NOT EXISTS idx_r_i
-    ON sessions.results (id_driver);
+CREATE INDEX IF NOT EXISTS idx_r_d
+    ON sessions.results (key_driver);
 
 CREATE INDEX IF NOT EXISTS idx_r_s
-    ON sessions.results (session);
\ No newline at end of file
+    ON sessions.results (key_session);
@@ -0,0 +1,54 @@
+-- Replaces the events_denormalized table, which duplicated results joined with
+-- events, circuits and drivers, with a materialized view over the normalized tables.
+-- The ETL refreshes the view concurrently after each load.
+BEGIN;
+
+SET search_path TO sessions;
+
+DROP TABLE IF EXISTS sessions.events_denormalized;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS events_denormalized AS
+    SELECT
+        r.year,
+        r.round,
+        e.name_circuit,
+        c.country_circuit,
+        r.id_driver,
+        d.name_driver_last,
+        d.name_driver_first,
+        r.name_team,
+        r.session,
+        r.position,
+        r.time
+    FROM
+        sessions.results r
+    LEFT JOIN
+        sessions.events e
+    ON
+        e.year = r.year
+        AND e.round = r.round
+    LEFT JOIN
+        sessions.circuits c
+    ON
+        c.name_circuit = e.name_circuit
+    LEFT JOIN
+        sessions.drivers d
+    ON
+        d.id_driver = r.id_driver;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ed_pk
+    ON sessions.events_denormalized (year, round, id_driver, session);
+
+CREATE INDEX IF NOT EXISTS idx_ed_y
+    ON sessions.events_denormalized (year);
+
+CREATE INDEX IF NOT EXISTS idx_ed_r
+    ON sessions.events_denormalized (round);
+
+CREATE INDEX IF NOT EXISTS idx_ed_d
+    ON sessions.events_denormalized (id_driver);
+
+CREATE INDEX IF NOT EXISTS idx_ed_s
+    ON sessions.events_denormalized (session);
+
+COMMIT;
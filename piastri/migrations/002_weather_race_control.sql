@@ -0,0 +1,39 @@
+-- Adds per-session weather samples and race control messages, keyed by session time
+-- so they can be joined as of each lap.
+BEGIN;
+
+SET search_path TO sessions;
+
+CREATE TABLE IF NOT EXISTS weather (
+    year SMALLINT NOT NULL,
+    round SMALLINT NOT NULL,
+    session TEXT NOT NULL,
+    time INTERVAL NOT NULL,
+    air_temp REAL NULL,
+    track_temp REAL NULL,
+    humidity REAL NULL,
+    pressure REAL NULL,
+    rainfall BOOLEAN NULL,
+    wind_speed REAL NULL,
+    wind_direction SMALLINT NULL,
+    PRIMARY KEY (year, round, session, time)
+);
+
+CREATE TABLE IF NOT EXISTS race_control (
+    year SMALLINT NOT NULL,
+    round SMALLINT NOT NULL,
+    session TEXT NOT NULL,
+    seq SMALLINT NOT NULL,
+    time INTERVAL NOT NULL,
+    lap SMALLINT NULL,
+    category TEXT NULL,
+    flag TEXT NULL,
+    scope TEXT NULL,
+    sector SMALLINT NULL,
+    racing_number TEXT NULL,
+    status TEXT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (year, round, session, seq)
+);
+
+COMMIT;
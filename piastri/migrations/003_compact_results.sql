@@ -0,0 +1,284 @@
+-- Replaces the text dimensions repeated in every result with SMALLINT surrogate keys,
+-- and the text position mixing places with DNQ/DNF codes with a SMALLINT position
+-- and a result_status enum. Existing rows get keys in natural key order, and identity
+-- columns assign the keys of later rows. Fails, changing nothing, if results or
+-- rosters reference a driver or session that doesn't exist.
+BEGIN;
+
+SET search_path TO sessions;
+
+DO $$
+DECLARE
+    n_results INTEGER;
+    n_teams INTEGER;
+BEGIN
+    SELECT COUNT(*) INTO n_results
+    FROM results r
+    LEFT JOIN drivers d ON d.id_driver = r.id_driver
+    WHERE d.id_driver IS NULL
+        OR r.session NOT IN ('Q1', 'Q2', 'Q3', 'Race');
+
+    SELECT COUNT(*) INTO n_teams
+    FROM teams t
+    LEFT JOIN drivers d ON d.id_driver = t.id_driver
+    WHERE d.id_driver IS NULL;
+
+    IF n_results > 0 OR n_teams > 0 THEN
+        RAISE EXCEPTION
+            '% results and % teams rows reference a missing driver or session; '
+            'load the missing drivers or delete the rows, then rerun.',
+            n_results, n_teams;
+    END IF;
+END $$;
+
+DROP MATERIALIZED VIEW IF EXISTS sessions.events_denormalized;
+
+CREATE TYPE result_status AS ENUM (
+    'classified',
+    'dnq',
+    'dnf',
+    'retired',
+    'disqualified',
+    'excluded',
+    'withdrawn',
+    'failed_to_qualify',
+    'not_classified'
+);
+
+CREATE TABLE IF NOT EXISTS session_types (
+    key_session SMALLINT PRIMARY KEY,
+    session TEXT NOT NULL UNIQUE
+);
+
+INSERT INTO session_types (key_session, session)
+VALUES (1, 'Q1'), (2, 'Q2'), (3, 'Q3'), (4, 'Race')
+ON CONFLICT DO NOTHING;
+
+-- Drivers and circuits keep their rows and gain a key as primary key.
+ALTER TABLE drivers ADD COLUMN key_driver SMALLINT;
+
+UPDATE drivers d
+SET key_driver = k.key_driver
+FROM (
+    SELECT id_driver, ROW_NUMBER() OVER (ORDER BY id_driver) AS key_driver
+    FROM drivers
+) k
+WHERE k.id_driver = d.id_driver;
+
+ALTER TABLE drivers DROP CONSTRAINT drivers_pkey;
+ALTER TABLE drivers ALTER COLUMN key_driver SET NOT NULL;
+ALTER TABLE drivers ADD PRIMARY KEY (key_driver);
+ALTER TABLE drivers ADD UNIQUE (id_driver);
+ALTER TABLE drivers ALTER COLUMN key_driver ADD GENERATED ALWAYS AS IDENTITY;
+SELECT setval(
+    pg_get_serial_sequence('sessions.drivers', 'key_driver'),
+    COALESCE(MAX(key_driver), 0) + 1,
+    false
+)
+FROM drivers;
+DROP INDEX IF EXISTS idx_d_i;
+
+ALTER TABLE circuits ADD COLUMN key_circuit SMALLINT;
+
+UPDATE circuits c
+SET key_circuit = k.key_circuit
+FROM (
+    SELECT name_circuit, ROW_NUMBER() OVER (ORDER BY name_circuit) AS key_circuit
+    FROM circuits
+) k
+WHERE k.name_circuit = c.name_circuit;
+
+ALTER TABLE circuits DROP CONSTRAINT circuits_pkey;
+ALTER TABLE circuits ALTER COLUMN key_circuit SET NOT NULL;
+ALTER TABLE circuits ADD PRIMARY KEY (key_circuit);
+ALTER TABLE circuits ADD UNIQUE (name_circuit);
+ALTER TABLE circuits ALTER COLUMN key_circuit ADD GENERATED ALWAYS AS IDENTITY;
+SELECT setval(
+    pg_get_serial_sequence('sessions.circuits', 'key_circuit'),
+    COALESCE(MAX(key_circuit), 0) + 1,
+    false
+)
+FROM circuits;
+DROP INDEX IF EXISTS idx_c_n;
+
+ALTER TABLE events ADD COLUMN key_circuit SMALLINT;
+
+UPDATE events e
+SET key_circuit = c.key_circuit
+FROM circuits c
+WHERE c.name_circuit = e.name_circuit;
+
+ALTER TABLE events ALTER COLUMN key_circuit SET NOT NULL;
+ALTER TABLE events DROP COLUMN name_circuit;
+
+-- Team keys cover the names of both rosters and results; rosters keep only the keys.
+CREATE TABLE team_names (
+    key_team SMALLINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    name_team TEXT NOT NULL UNIQUE
+);
+
+INSERT INTO team_names (key_team, name_team)
+OVERRIDING SYSTEM VALUE
+SELECT ROW_NUMBER() OVER (ORDER BY name_team), name_team
+FROM (
+    SELECT name_team FROM teams
+    UNION
+    SELECT name_team FROM results
+) n;
+
+SELECT setval(
+    pg_get_serial_sequence('sessions.team_names', 'key_team'),
+    COALESCE(MAX(key_team), 0) + 1,
+    false
+)
+FROM team_names;
+
+CREATE TABLE teams_compact (
+    key_team SMALLINT NOT NULL,
+    year SMALLINT NOT NULL,
+    key_driver SMALLINT NOT NULL,
+    UNIQUE (key_team, year, key_driver)
+);
+
+INSERT INTO teams_compact (key_team, year, key_driver)
+SELECT k.key_team, t.year, d.key_driver
+FROM teams t
+INNER JOIN team_names k ON k.name_team = t.name_team
+INNER JOIN drivers d ON d.id_driver = t.id_driver;
+
+-- Results whose team or driver is missing from the rosters get roster rows, so their
+-- names stay reachable from their keys.
+INSERT INTO teams_compact (key_team, year, key_driver)
+SELECT DISTINCT k.key_team, r.year, d.key_driver
+FROM results r
+INNER JOIN team_names k ON k.name_team = r.name_team
+INNER JOIN drivers d ON d.id_driver = r.id_driver
+ON CONFLICT DO NOTHING;
+
+CREATE TABLE results_compact (
+    year SMALLINT NOT NULL,
+    round SMALLINT NOT NULL,
+    key_driver SMALLINT NOT NULL,
+    key_team SMALLINT NOT NULL,
+    key_session SMALLINT NOT NULL,
+    position SMALLINT NULL,
+    status result_status NOT NULL,
+    time INTERVAL NULL,
+    PRIMARY KEY (year, round, key_driver, key_session)
+);
+
+INSERT INTO results_compact
+SELECT
+    r.year,
+    r.round,
+    d.key_driver,
+    k.key_team,
+    s.key_session,
+    CASE
+        WHEN r.position ~ '^[0-9]+(\.0+)?$'
+        THEN CAST(CAST(r.position AS NUMERIC) AS SMALLINT)
+    END,
+    CAST(
+        CASE
+            WHEN r.position ~ '^[0-9]+(\.0+)?$' THEN 'classified'
+            WHEN r.position = 'DNQ' THEN 'dnq'
+            WHEN r.position = 'DNF' THEN 'dnf'
+            WHEN r.position = 'R' THEN 'retired'
+            WHEN r.position = 'D' THEN 'disqualified'
+            WHEN r.position = 'E' THEN 'excluded'
+            WHEN r.position = 'W' THEN 'withdrawn'
+            WHEN r.position = 'F' THEN 'failed_to_qualify'
+            ELSE 'not_classified'
+        END AS result_status
+    ),
+    r.time
+FROM results r
+INNER JOIN drivers d ON d.id_driver = r.id_driver
+INNER JOIN team_names k ON k.name_team = r.name_team
+INNER JOIN session_types s ON s.session = r.session;
+
+DROP TABLE teams;
+DROP TABLE results;
+ALTER TABLE teams_compact RENAME TO teams;
+ALTER TABLE results_compact RENAME TO results;
+ALTER TABLE teams
+    RENAME CONSTRAINT teams_compact_key_team_year_key_driver_key
+    TO teams_key_team_year_key_driver_key;
+ALTER TABLE results RENAME CONSTRAINT results_compact_pkey TO results_pkey;
+
+CREATE INDEX IF NOT EXISTS idx_t_k
+    ON sessions.teams (key_team);
+
+CREATE INDEX IF NOT EXISTS idx_t_y
+    ON sessions.teams (year);
+
+CREATE INDEX IF NOT EXISTS idx_r_y
+    ON sessions.results (year);
+
+CREATE INDEX IF NOT EXISTS idx_r_r
+    ON sessions.results (round);
+
+CREATE INDEX IF NOT EXISTS idx_r_d
+    ON sessions.results (key_driver);
+
+CREATE INDEX IF NOT EXISTS idx_r_s
+    ON sessions.results (key_session);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS events_denormalized AS
+    SELECT
+        r.year,
+        r.round,
+        e.key_circuit,
+        c.name_circuit,
+        c.country_circuit,
+        r.key_driver,
+        d.id_driver,
+        d.name_driver_last,
+        d.name_driver_first,
+        r.key_team,
+        t.name_team,
+        r.key_session,
+        s.session,
+        r.position,
+        r.status,
+        r.time
+    FROM
+        sessions.results r
+    LEFT JOIN
+        sessions.events e
+    ON
+        e.year = r.year
+        AND e.round = r.round
+    LEFT JOIN
+        sessions.circuits c
+    ON
+        c.key_circuit = e.key_circuit
+    LEFT JOIN
+        sessions.drivers d
+    ON
+        d.key_driver = r.key_driver
+    LEFT JOIN
+        sessions.team_names t
+    ON
+        t.key_team = r.key_team
+    LEFT JOIN
+        sessions.session_types s
+    ON
+        s.key_session = r.key_session;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ed_pk
+    ON sessions.events_denormalized (year, round, key_driver, key_session);
+
+CREATE INDEX IF NOT EXISTS idx_ed_y
+    ON sessions.events_denormalized (year);
+
+CREATE INDEX IF NOT EXISTS idx_ed_r
+    ON sessions.events_denormalized (round);
+
+CREATE INDEX IF NOT EXISTS idx_ed_d
+    ON sessions.events_denormalized (key_driver);
+
+CREATE INDEX IF NOT EXISTS idx_ed_s
+    ON sessions.events_denormalized (key_session);
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- Adds a single-row data version that the ETL and watch mode bump in the same
+-- transaction as every write, so the query service notices in-place updates too.
+BEGIN;
+
+SET search_path TO sessions;
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL
+);
+
+INSERT INTO data_version (id, version)
+VALUES (TRUE, 0)
+ON CONFLICT DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,165 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+KEYS_SESSION = ["year", "round", "session"]
+
+COLS_WEATHER = ["air_temp", "track_temp", "humidity", "rainfall", "wind_speed"]
+
+# Weather is sampled about once a minute; older samples, e.g. across a gap in the
+# feed, aren't attached. Track state applies until the next message.
+TOLERANCE_WEATHER = pd.Timedelta(minutes=5)
+
+# Track-scoped flags; CLEAR ends a yellow or a safety car period like GREEN does.
+FLAGS_TRACK = {
+    "GREEN": "GREEN",
+    "CLEAR": "GREEN",
+    "YELLOW": "YELLOW",
+    "DOUBLE YELLOW": "DOUBLE YELLOW",
+    "RED": "RED",
+    "CHEQUERED": "CHEQUERED",
+}
+
+
+def get_df_track_state(df_race_control: pd.DataFrame) -> pd.DataFrame:
+    """
+    Derive the track-wide flag and safety car state in force after every message.
+
+    Safety car periods start with a (VIRTUAL) SAFETY CAR DEPLOYED message and end with
+    the next track-wide green or chequered flag. Sector and driver flags are ignored.
+
+    Args:
+        df_race_control (pd.DataFrame): Race control messages from DataMessages.
+
+    Returns:
+        pd.DataFrame: One row per message with 'flag', 'safety_car' (SC, VSC or None)
+            and 'n_neutral', the number of neutralisations (safety car or red flag)
+            started so far in the session.
+    """
+
+    df = df_race_control.sort_values(KEYS_SESSION + ["seq"]).reset_index(drop=True)
+    by = [df[k] for k in KEYS_SESSION]
+
+    message = df["message"].fillna("").str.upper()
+    deployed = message.str.contains("SAFETY CAR DEPLOYED", regex=False)
+    flag = df["flag"].where(df["scope"] == "Track").map(FLAGS_TRACK)
+
+    # "" marks the end of a safety car period, so forward-filling carries it too.
+    safety_car = pd.Series(
+        np.select(
+            [
+                deployed & message.str.startswith("VIRTUAL"),
+                deployed,
+                flag.isin(["GREEN", "CHEQUERED"]),
+            ],
+            ["VSC", "SC", ""],
+            default=None,
+        ),
+        index=df.index,
+        dtype=object,
+    )
+
+    df["flag"] = flag.groupby(by).ffill()
+    df["safety_car"] = safety_car.groupby(by).ffill().replace("", None)
+
+    neutral = df["safety_car"].notna() | (df["flag"] == "RED")
+    neutral_prev = neutral.groupby(by).shift(fill_value=False).astype(bool)
+    df["n_neutral"] = (neutral & ~neutral_prev).groupby(by).cumsum()
+
+    return df[KEYS_SESSION + ["time", "flag", "safety_car", "n_neutral"]]
+
+
+def get_df_asof(
+    df_left: pd.DataFrame,
+    col_time: str,
+    df_right: pd.DataFrame,
+    cols: List[str],
+    tolerance: Optional[pd.Timedelta] = None,
+) -> pd.DataFrame:
+    """
+    Attach to every row the latest right-hand values at or before its time, per session.
+
+    Args:
+        df_left (pd.DataFrame): Rows keyed by session, with a non-null col_time.
+        col_time (str): The session-time column of df_left.
+        df_right (pd.DataFrame): Time-indexed rows keyed by session, with 'time'.
+        cols (List[str]): The columns of df_right to attach.
+        tolerance (Optional[pd.Timedelta]): The oldest right-hand row to attach, if
+            limited.
+
+    Returns:
+        pd.DataFrame: df_left sorted by col_time, with cols added, missing where no
+            right-hand row of the session is early enough.
+    """
+
+    df_right = df_right[KEYS_SESSION + ["time"] + cols].dropna(subset=["time"])
+    # Empty tables, e.g. of sessions without weather, have object columns.
+    dtypes = {k: df_left[k].dtype for k in KEYS_SESSION}
+    df_right = df_right.astype({**dtypes, "time": df_left[col_time].dtype})
+    df_right = df_right.sort_values("time")
+
+    return pd.merge_asof(
+        df_left.sort_values(col_time),
+        df_right.rename(columns={"time": col_time}),
+        on=col_time,
+        by=KEYS_SESSION,
+        direction="backward",
+        tolerance=tolerance,
+    )
+
+
+def get_df_laps_conditions(
+    df_laps: pd.DataFrame,
+    df_weather: pd.DataFrame,
+    df_race_control: pd.DataFrame,
+    col_start: str = "LapStartTime",
+    col_end: str = "Time",
+) -> pd.DataFrame:
+    """
+    Attach the weather and track state to every lap with vectorized as-of joins.
+
+    Each lap gets the latest weather sample, within TOLERANCE_WEATHER, and track state
+    at its start, whatever the number of sessions. 'neutralised' also flags laps where a safety car or red
+    flag period began before the lap ended.
+
+    Args:
+        df_laps (pd.DataFrame): Laps with 'year', 'round', 'session' (Qualifying or
+            Race) and session times of their start and end, e.g. FastF1 laps.
+        df_weather (pd.DataFrame): Weather samples from DataWeather.
+        df_race_control (pd.DataFrame): Race control messages from DataMessages.
+        col_start (str): The column of df_laps holding the lap start time.
+        col_end (str): The column of df_laps holding the lap end time.
+
+    Returns:
+        pd.DataFrame: df_laps in its original order, with weather columns, 'flag',
+            'safety_car' and 'neutralised'.
+    """
+
+    df_laps = df_laps.reset_index(drop=True)
+    df_state = get_df_track_state(df_race_control)
+
+    df_start = df_laps.loc[df_laps[col_start].notna(), KEYS_SESSION + [col_start]]
+    df_start = get_df_asof(
+        df_start.reset_index(), col_start, df_weather, COLS_WEATHER, TOLERANCE_WEATHER
+    )
+    df_start = get_df_asof(
+        df_start, col_start, df_state, ["flag", "safety_car", "n_neutral"]
+    )
+
+    df_end = df_laps.loc[df_laps[col_end].notna(), KEYS_SESSION + [col_end]]
+    df_end = get_df_asof(df_end.reset_index(), col_end, df_state, ["n_neutral"])
+
+    df_start = df_start.set_index("index")
+    n_neutral_end = df_end.set_index("index")["n_neutral"].reindex(df_start.index)
+
+    df_conditions = df_start[COLS_WEATHER + ["flag", "safety_car"]].assign(
+        neutralised=(
+            df_start["safety_car"].notna()
+            | (df_start["flag"] == "RED")
+            | (n_neutral_end.fillna(0) > df_start["n_neutral"].fillna(0))
+        )
+    )
+
+    return df_laps.join(df_conditions.drop(columns=df_laps.columns, errors="ignore"))
@@ -0,0 +1,326 @@
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from functions.functions import read_df_staging, write_df_staging
+
+
+SESSIONS_QUALI = ["Q1", "Q2", "Q3"]
+
+COLS_RESULTS = [
+    "year",
+    "round",
+    "id_driver",
+    "name_team",
+    "session",
+    "position",
+    "time",
+]
+
+COLS_AGGREGATES = [
+    "year",
+    "id_rookie",
+    "id_teammate",
+    "name_team",
+    "session_type",
+]
+
+
+class RookieAnalysis:
+    def __init__(self):
+        self.df_teams = None
+        self.df_rookies = None
+        self.df_results = None
+        self.df_rounds = pd.DataFrame(columns=["year", "round"])
+        self.df_gaps = None
+        self.df_aggregates = None
+
+    def __get_df_rookies(self, df_teams: pd.DataFrame) -> pd.DataFrame:
+        """
+        Find rookie seasons from the data itself.
+
+        A driver's rookie season is the first year they appear in the teams data. Drivers
+        already present in the earliest year are excluded, as their debut may predate it.
+
+        Args:
+            df_teams (pd.DataFrame): Normalized team data with 'name_team', 'year' and
+                'id_driver'.
+
+        Returns:
+            pd.DataFrame: One row per rookie with columns 'id_driver' and 'year'.
+        """
+
+        df_first = df_teams.groupby("id_driver", as_index=False)["year"].min()
+        df_rookies = df_first[df_first["year"] > df_teams["year"].min()]
+
+        return df_rookies.reset_index(drop=True)
+
+    def __get_df_numeric(self, df_results: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert result positions and times to numbers.
+
+        Args:
+            df_results (pd.DataFrame): Normalized result data.
+
+        Returns:
+            pd.DataFrame: Result data with numeric 'position' (NaN for DNQ/DNF) and 'time'
+                in seconds.
+        """
+
+        return df_results.assign(
+            position=pd.to_numeric(df_results["position"], errors="coerce"),
+            time=pd.to_timedelta(df_results["time"]).dt.total_seconds(),
+            session_type=np.where(
+                df_results["session"].isin(SESSIONS_QUALI), "quali", "race"
+            ),
+        )
+
+    def __get_df_gaps(
+        self, df_results: pd.DataFrame, df_rookies: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Compute per-round qualifying and race gaps between rookies and their teammates.
+
+        Qualifying compares the latest session both drivers set a time in; races compare
+        classified finishes, skipping rounds where either driver didn't finish.
+
+        Args:
+            df_results (pd.DataFrame): Numeric result data from __get_df_numeric.
+            df_rookies (pd.DataFrame): Rookie seasons from __get_df_rookies.
+
+        Returns:
+            pd.DataFrame: One row per round, session type and rookie-teammate pair.
+        """
+
+        df_rookie = df_results.merge(
+            df_rookies, on=["id_driver", "year"], how="inner"
+        ).rename(columns={"id_driver": "id_rookie"})
+
+        df_pairs = df_rookie.merge(
+            df_results,
+            on=["year", "round", "name_team", "session", "session_type"],
+            suffixes=("_rookie", "_teammate"),
+        ).rename(columns={"id_driver": "id_teammate"})
+        df_pairs = df_pairs[df_pairs["id_rookie"] != df_pairs["id_teammate"]]
+        df_pairs = df_pairs.dropna(
+            subset=[
+                "position_rookie",
+                "position_teammate",
+                "time_rookie",
+                "time_teammate",
+            ]
+        )
+
+        df_pairs = df_pairs.sort_values("session").drop_duplicates(
+            subset=["year", "round", "id_rookie", "id_teammate", "session_type"],
+            keep="last",
+        )
+
+        return df_pairs.assign(
+            gap=df_pairs["time_rookie"] - df_pairs["time_teammate"],
+            gap_pct=(df_pairs["time_rookie"] / df_pairs["time_teammate"] - 1) * 100,
+            ahead=(df_pairs["position_rookie"] < df_pairs["position_teammate"]).astype(
+                int
+            ),
+        )[
+            COLS_AGGREGATES
+            + ["round", "session", "position_rookie", "position_teammate"]
+            + ["gap", "gap_pct", "ahead"]
+        ].reset_index(
+            drop=True
+        )
+
+    def __get_df_sums(self, df_gaps: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate per-round gaps into additive sums, so new rounds can be added later.
+
+        Args:
+            df_gaps (pd.DataFrame): Per-round gaps from __get_df_gaps.
+
+        Returns:
+            pd.DataFrame: Counts and sums per rookie, teammate and session type.
+        """
+
+        return (
+            df_gaps.assign(
+                gap_sq=df_gaps["gap"] ** 2, gap_pct_sq=df_gaps["gap_pct"] ** 2
+            )
+            .groupby(COLS_AGGREGATES, as_index=False)
+            .agg(
+                n_rounds=("round", "size"),
+                n_ahead=("ahead", "sum"),
+                sum_gap=("gap", "sum"),
+                sum_gap_sq=("gap_sq", "sum"),
+                sum_gap_pct=("gap_pct", "sum"),
+                sum_gap_pct_sq=("gap_pct_sq", "sum"),
+            )
+        )
+
+    def __get_df_unmatched(
+        self, df: pd.DataFrame, df_keys: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Get the rows of a DataFrame whose (year, round) isn't in df_keys.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to filter.
+            df_keys (pd.DataFrame): Distinct 'year' and 'round' pairs to exclude.
+
+        Returns:
+            pd.DataFrame: The rows of df for other rounds.
+        """
+
+        df = df.merge(df_keys, on=["year", "round"], how="left", indicator=True)
+
+        return df[df["_merge"] == "left_only"].drop(columns="_merge")
+
+    def update(
+        self, df_results: pd.DataFrame, df_teams: pd.DataFrame, replace: bool = False
+    ) -> pd.DataFrame:
+        """
+        Add newly loaded rounds to the stored aggregates.
+
+        Only (year, round) pairs not processed before are analysed, and their result
+        rows are kept with the aggregates. If rookie status changes for a year already
+        processed, for instance after backfilling an earlier season, every round of
+        that year is reanalysed from the kept result rows.
+
+        Args:
+            df_results (pd.DataFrame): Normalized result data containing at least the new
+                rounds.
+            df_teams (pd.DataFrame): Normalized team data, accumulated across updates
+                to determine rookie seasons.
+            replace (bool): Whether to reprocess rounds of df_results already processed,
+                e.g. after they were reloaded with corrected data.
+
+        Returns:
+            pd.DataFrame: The per-round gaps added by this update.
+        """
+
+        self.df_teams = (
+            pd.concat([self.df_teams, df_teams], ignore_index=True)
+            .drop_duplicates()
+            .reset_index(drop=True)
+        )
+        df_rookies = self.__get_df_rookies(self.df_teams)
+
+        df_keys = df_results[["year", "round"]].drop_duplicates()
+        if not replace:
+            df_keys = self.__get_df_unmatched(df_keys, self.df_rounds)
+
+        df_results = df_results.merge(df_keys, on=["year", "round"])[COLS_RESULTS]
+        if self.df_results is not None:
+            df_results = pd.concat(
+                [self.__get_df_unmatched(self.df_results, df_keys), df_results],
+                ignore_index=True,
+            )
+        self.df_results = df_results
+
+        if self.df_rookies is not None:
+            df_changed = df_rookies.merge(
+                self.df_rookies, how="outer", indicator=True
+            ).query("_merge != 'both'")
+            years_changed = set(df_changed["year"]) & set(self.df_rounds["year"])
+            df_keys = pd.concat(
+                [df_keys, self.df_rounds[self.df_rounds["year"].isin(years_changed)]],
+                ignore_index=True,
+            ).drop_duplicates()
+
+        self.df_rookies = df_rookies
+
+        df_rounds = self.__get_df_unmatched(self.df_rounds, df_keys)
+        rebuilt = len(df_rounds) < len(self.df_rounds)
+        if rebuilt:
+            self.df_gaps = self.__get_df_unmatched(self.df_gaps, df_keys)
+
+        df_gaps_new = self.__get_df_gaps(
+            self.__get_df_numeric(self.df_results.merge(df_keys, on=["year", "round"])),
+            df_rookies,
+        )
+
+        self.df_rounds = pd.concat([df_rounds, df_keys], ignore_index=True).astype(int)
+        self.df_gaps = pd.concat([self.df_gaps, df_gaps_new], ignore_index=True)
+        if rebuilt:
+            self.df_aggregates = self.__get_df_sums(self.df_gaps)
+        else:
+            self.df_aggregates = (
+                pd.concat(
+                    [self.df_aggregates, self.__get_df_sums(df_gaps_new)],
+                    ignore_index=True,
+                )
+                .groupby(COLS_AGGREGATES, as_index=False)
+                .sum()
+            )
+
+        return df_gaps_new
+
+    def get_df_summary(self, year: Optional[int] = None) -> pd.DataFrame:
+        """
+        Summarize the stored aggregates per rookie, teammate and session type.
+
+        Args:
+            year (Optional[int]): Restrict to rookies of this season.
+
+        Returns:
+            pd.DataFrame: Round counts, share of rounds ahead of the teammate, and the mean
+                and standard deviation of the time gap in seconds and percent.
+        """
+
+        df = self.df_aggregates
+        if year is not None:
+            df = df[df["year"] == year]
+
+        n = df["n_rounds"]
+        mean_gap = df["sum_gap"] / n
+        mean_gap_pct = df["sum_gap_pct"] / n
+
+        return df[COLS_AGGREGATES + ["n_rounds", "n_ahead"]].assign(
+            share_ahead=df["n_ahead"] / n,
+            mean_gap=mean_gap,
+            std_gap=np.sqrt(np.maximum(df["sum_gap_sq"] / n - mean_gap**2, 0)),
+            mean_gap_pct=mean_gap_pct,
+            std_gap_pct=np.sqrt(
+                np.maximum(df["sum_gap_pct_sq"] / n - mean_gap_pct**2, 0)
+            ),
+        )
+
+    def load_state(self, path: str) -> None:
+        """
+        Restore stored aggregates from the staging directory, if present.
+
+        Args:
+            path (str): The staging directory.
+
+        Returns:
+            None.
+        """
+
+        if not os.path.isfile(os.path.join(path, "df_rookie_results.pkl")):
+            return None
+
+        self.df_teams = read_df_staging(path, "df_rookie_teams")
+        self.df_results = read_df_staging(path, "df_rookie_results")
+        self.df_rounds = read_df_staging(path, "df_rookie_rounds")
+        self.df_rookies = read_df_staging(path, "df_rookies")
+        self.df_gaps = read_df_staging(path, "df_rookie_gaps")
+        self.df_aggregates = read_df_staging(path, "df_rookie_aggregates")
+
+    def save_state(self, path: str) -> None:
+        """
+        Store the aggregates in the staging directory for the next update.
+
+        Args:
+            path (str): The staging directory.
+
+        Returns:
+            None.
+        """
+
+        write_df_staging(self.df_teams, path, "df_rookie_teams")
+        write_df_staging(self.df_results, path, "df_rookie_results")
+        write_df_staging(self.df_rounds, path, "df_rookie_rounds")
+        write_df_staging(self.df_rookies, path, "df_rookies")
+        write_df_staging(self.df_gaps, path, "df_rookie_gaps")
+        write_df_staging(self.df_aggregates, path, "df_rookie_aggregates")
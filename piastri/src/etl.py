@@ -1,5 +1,7 @@
+import argparse
+import os
 import time
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -9,38 +11,146 @@ from functions.functions import (
     get_rounds,
     get_data_session,
     get_df_sessions,
-    get_df_denormalized,
     get_env_var,
+    read_df_staging,
+    refresh_view_postgres,
     set_env_var,
     setup_logger,
     write_df_postgres,
+    write_df_staging,
+    write_keys_postgres,
 )
+from functions.scheduler import Pipeline, Stage
+from .analysis.rookies import RookieAnalysis
 from .processing.data_quali import DataQuali
 from .processing.data_race import DataRace
 from .processing.data_event import DataEvent
+from .processing.data_messages import DataMessages
 from .processing.data_normalized import DataNormalized
+from .processing.data_validation import DataValidation
+from .processing.data_weather import DataWeather
 
 
 logger = setup_logger("etl")
 
+# Pause between FastF1 requests, in seconds, to stay within API rate limits.
+SLEEP_REQUEST = 3
+
+STAGES = ["extract", "transform", "load"]
+
+SESSIONS = ["Q", "R"]
+
+TABLES = {
+    "df_events": {"table": "events", "primary_keys": ["year", "round"]},
+    "df_drivers": {"table": "drivers", "primary_keys": ["key_driver"]},
+    "df_teams": {"table": "teams", "primary_keys": ["key_team", "year", "key_driver"]},
+    "df_circuits": {"table": "circuits", "primary_keys": ["key_circuit"]},
+    "df_results": {
+        "table": "results",
+        "primary_keys": ["year", "round", "key_driver", "key_session"],
+    },
+    "df_weather": {
+        "table": "weather",
+        "primary_keys": ["year", "round", "session", "time"],
+    },
+    "df_race_control": {
+        "table": "race_control",
+        "primary_keys": ["year", "round", "session", "seq"],
+    },
+}
+
+# Dimensions whose surrogate keys the database assigns. The rows of each 'df' are
+# inserted by 'natural' key before loading, and the provisional keys of the batch are
+# replaced with the keys returned. A 'df' loaded into another table than the
+# dimension's, like teams for team_names, is loaded without the natural key.
+DIMENSIONS = {
+    "driver": {
+        "df": "df_drivers",
+        "table": "drivers",
+        "natural": "id_driver",
+        "key": "key_driver",
+        "columns": ["id_driver", "name_driver_last", "name_driver_first"],
+    },
+    "team": {
+        "df": "df_teams",
+        "table": "team_names",
+        "natural": "name_team",
+        "key": "key_team",
+        "columns": ["name_team"],
+    },
+    "circuit": {
+        "df": "df_circuits",
+        "table": "circuits",
+        "natural": "name_circuit",
+        "key": "key_circuit",
+        "columns": ["name_circuit", "country_circuit"],
+    },
+}
+
+VIEWS = {"events_denormalized": ["events", "drivers", "teams", "circuits", "results"]}
+
+# Concurrency and retries per stage of a pipelined run. One extract worker keeps
+# FastF1 requests within the rate limit.
+PIPELINE = {
+    "extract": {"workers": 1, "retries": 2, "backoff": 10.0},
+    "transform": {"workers": 1, "retries": 0, "backoff": 0.0},
+    "load": {"workers": 2, "retries": 2, "backoff": 5.0},
+}
+
+# Rounds a stage may run ahead of the next one in a pipelined run.
+PIPELINE_QUEUE_SIZE = 2
+
+
+def get_plan(
+    list_years: List[int], list_rounds: Optional[List[int]] = None
+) -> Dict[int, List[int]]:
+    """
+    Resolves the rounds to process for each year, optionally restricted to given rounds.
+
+    Args:
+        list_years (List[int]): A list of years to process.
+        list_rounds (Optional[List[int]]): Round numbers to restrict each year to.
+
+    Returns:
+        Dict[int, List[int]]: The rounds to process, keyed by year.
+    """
+
+    plan = {}
+    for year in list_years:
+        rounds = get_rounds(year)
+        if list_rounds is not None:
+            rounds = [r for r in rounds if r in list_rounds]
+        plan[year] = rounds
+
+    return plan
+
 
 def extract_transform_history(
     list_years: List[int],
-) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    list_rounds: Optional[List[int]] = None,
+    list_sessions: List[str] = SESSIONS,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
-    Extracts and transforms historical data for qualifying, race, and event sessions for multiple years and rounds.
+    Extracts and transforms historical data for qualifying, race, and event sessions for multiple years and rounds,
+    along with the weather and race control messages of each session.
     Args:
         list_years (List[int]): A list of years to extract and transform.
+        list_rounds (Optional[List[int]]): Round numbers to restrict each year to.
+        list_sessions (List[str]): The session types to extract, of "Q" and "R".
     Returns:
         Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: A tuple containing three pandas DataFrames:
             - df_quali_all: DataFrame containing qualifying session data for all years and rounds.
             - df_race_all: DataFrame containing race session data for all years and rounds.
             - df_event_all: DataFrame containing event data for all years and rounds.
+            - df_weather_all: DataFrame containing weather samples for all sessions.
+            - df_messages_all: DataFrame containing race control messages for all sessions.
     """
 
     df_quali_all = []
     df_race_all = []
     df_event_all = []
+    df_weather_all = []
+    df_messages_all = []
 
     session_missing = {}
     quali_missing = {}
@@ -50,18 +160,25 @@ def extract_transform_history(
     instance_quali = DataQuali()
     instance_race = DataRace()
     instance_event = DataEvent()
+    instance_weather = DataWeather()
+    instance_messages = DataMessages()
 
-    for year in list_years:
+    plan = get_plan(list_years, list_rounds)
+
+    for year, rounds in plan.items():
         logger.info(f"year: {year}")
-        list_rounds = get_rounds(year)
 
-        for round in list_rounds:
+        for round in rounds:
             try:
-                data_session_quali = get_data_session(year, round, "Q")
-                data_session_race = get_data_session(year, round, "R")
+                data_session_quali = (
+                    get_data_session(year, round, "Q") if "Q" in list_sessions else None
+                )
+                data_session_race = (
+                    get_data_session(year, round, "R") if "R" in list_sessions else None
+                )
 
                 logger.info(
-                    f"Retrieved qualifying and race session data for round {round} of {year}."
+                    f"Retrieved {'/'.join(list_sessions)} session data for round {round} of {year}."
                 )
             except Exception as e:
                 logger.error(
@@ -75,12 +192,15 @@ def extract_transform_history(
                 continue
 
             try:
-                df_quali = instance_quali.get_df_quali(data_session_quali, year, round)
-                df_quali_all.append(df_quali)
+                if data_session_quali is not None:
+                    df_quali = instance_quali.get_df_quali(
+                        data_session_quali, year, round
+                    )
+                    df_quali_all.append(df_quali)
 
-                logger.info(
-                    f"Retrieved qualifying dataframe for round {round} of {year}."
-                )
+                    logger.info(
+                        f"Retrieved qualifying dataframe for round {round} of {year}."
+                    )
             except Exception as e:
                 logger.error(
                     f"Error retrieving qualifying data for round {round} of {year}: {e}."
@@ -92,13 +212,16 @@ def extract_transform_history(
 
                 continue
 
-            time.sleep(3)
+            time.sleep(SLEEP_REQUEST)
 
             try:
-                df_race = instance_race.get_df_race(data_session_race, year, round)
-                df_race_all.append(df_race)
+                if data_session_race is not None:
+                    df_race = instance_race.get_df_race(data_session_race, year, round)
+                    df_race_all.append(df_race)
 
-                logger.info(f"Retrieved race dataframe for round {round} of {year}.")
+                    logger.info(
+                        f"Retrieved race dataframe for round {round} of {year}."
+                    )
             except Exception as e:
                 logger.error(
                     f"Error retrieving race data for round {round} of {year}: {e}."
@@ -110,10 +233,14 @@ def extract_transform_history(
 
                 continue
 
-            time.sleep(3)
+            time.sleep(SLEEP_REQUEST)
 
             try:
-                df_event = instance_event.get_df_event(data_session_race)
+                df_event = instance_event.get_df_event(
+                    data_session_race
+                    if data_session_race is not None
+                    else data_session_quali
+                )
                 df_event_all.append(df_event)
 
                 logger.info(f"Retrieved event dataframe for round {round} of {year}.")
@@ -126,16 +253,54 @@ def extract_transform_history(
                     event_missing[year] = []
                 event_missing[year].append(round)
 
-            time.sleep(3)
+            for session, data_session in [
+                ("Q", data_session_quali),
+                ("R", data_session_race),
+            ]:
+                if data_session is None:
+                    continue
+                try:
+                    df_weather_all.append(
+                        instance_weather.get_df_weather(
+                            data_session, year, round, session
+                        )
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Error retrieving {session} weather for round {round} of {year}: {e}."
+                    )
+
+                try:
+                    df_messages_all.append(
+                        instance_messages.get_df_messages(
+                            data_session, year, round, session
+                        )
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Error retrieving {session} messages for round {round} of {year}: {e}."
+                    )
+
+            time.sleep(SLEEP_REQUEST)
 
-    df_quali_all = pd.concat(df_quali_all, ignore_index=True)
-    df_race_all = pd.concat(df_race_all, ignore_index=True)
+    df_quali_all = pd.concat(df_quali_all, ignore_index=True) if df_quali_all else None
+    df_race_all = pd.concat(df_race_all, ignore_index=True) if df_race_all else None
+    if not df_event_all:
+        raise ValueError("No session data was retrieved for the requested scope.")
     df_event_all = pd.concat(df_event_all, ignore_index=True)
+    df_weather_all = (
+        pd.concat(df_weather_all, ignore_index=True) if df_weather_all else None
+    )
+    df_messages_all = (
+        pd.concat(df_messages_all, ignore_index=True) if df_messages_all else None
+    )
 
     return (
         df_quali_all,
         df_race_all,
         df_event_all,
+        df_weather_all,
+        df_messages_all,
         session_missing,
         quali_missing,
         race_missing,
@@ -144,38 +309,151 @@ def extract_transform_history(
 
 
 def extract_transform_tables(
-    df_quali_all: pd.DataFrame, df_race_all: pd.DataFrame, df_event_all: pd.DataFrame
+    df_quali_all: pd.DataFrame,
+    df_race_all: pd.DataFrame,
+    df_event_all: pd.DataFrame,
+    df_weather_all: Optional[pd.DataFrame] = None,
+    df_messages_all: Optional[pd.DataFrame] = None,
+    keys: Optional[Dict[str, Dict[str, int]]] = None,
 ) -> Tuple[
-    pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame
+    pd.DataFrame,
+    pd.DataFrame,
+    pd.DataFrame,
+    pd.DataFrame,
+    pd.DataFrame,
+    pd.DataFrame,
+    pd.DataFrame,
 ]:
     """
-    Extracts and transforms data from multiple dataframes to generate denormalized tables.
+    Extracts and transforms data from multiple dataframes to generate normalized tables.
+
+    The denormalized dataset is a materialized view over these tables in Postgres.
+
     Args:
         df_quali_all (pd.DataFrame): The dataframe containing qualifying data.
         df_race_all (pd.DataFrame): The dataframe containing race data.
         df_event_all (pd.DataFrame): The dataframe containing event data.
+        df_weather_all (Optional[pd.DataFrame]): The dataframe containing weather data.
+        df_messages_all (Optional[pd.DataFrame]): The dataframe containing race control messages.
+        keys (Optional[Dict[str, Dict[str, int]]]): Provisional surrogate keys shared
+            with other batches, extended in place with new ones. load_postgres replaces
+            them with the keys assigned by the database. Defaults to keys from 1.
     Returns:
-        Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-            A tuple of dataframes representing the denormalized tables:
-            - df_denormalized: The dataframe for the denormalized table.
+        Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+            A tuple of dataframes representing the normalized tables:
             - df_events: The dataframe containing normalized event data.
             - df_drivers: The dataframe containing normalized driver data.
             - df_teams: The dataframe containing normalized team data.
             - df_circuits: The dataframe containing normalized circuit data.
             - df_results: The dataframe containing normalized result data.
+            - df_weather: The dataframe containing weather data.
+            - df_race_control: The dataframe containing race control messages.
     """
 
-    instance_normalized = DataNormalized()
+    instance_normalized = DataNormalized(keys)
 
     df_sessions_all = get_df_sessions(df_quali_all, df_race_all)
-    df_denormalized = get_df_denormalized(df_sessions_all, df_event_all)
     df_events = instance_normalized.get_df_events(df_event_all)
     df_drivers = instance_normalized.get_df_drivers(df_sessions_all)
     df_teams = instance_normalized.get_df_teams(df_sessions_all)
     df_circuits = instance_normalized.get_df_circuits(df_event_all)
     df_results = instance_normalized.get_df_results(df_sessions_all)
+    df_weather = instance_normalized.get_df_weather(df_weather_all)
+    df_race_control = instance_normalized.get_df_race_control(df_messages_all)
 
-    return df_denormalized, df_events, df_drivers, df_teams, df_circuits, df_results
+    return (
+        df_events,
+        df_drivers,
+        df_teams,
+        df_circuits,
+        df_results,
+        df_weather,
+        df_race_control,
+    )
+
+
+def resolve_keys_postgres(
+    db_user: str,
+    db_password: str,
+    db_name: str,
+    db_host: str,
+    db_port: str,
+    dict_df: Dict[str, pd.DataFrame],
+    schema: str,
+    list_tables: Optional[List[str]] = None,
+    upsert: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Inserts the dimension rows of a batch and replaces its provisional surrogate keys
+    with the keys assigned by the database.
+
+    Only dimensions referenced by the tables to load are resolved. Rows referencing a
+    dimension row that isn't in the batch, e.g. because it was quarantined, are
+    dropped.
+
+    Args:
+        db_user (str): The username for the PostgreSQL database.
+        db_password (str): The password for the PostgreSQL database.
+        db_name (str): The name of the PostgreSQL database.
+        db_host (str): The host address of the PostgreSQL database.
+        db_port (str): The port number of the PostgreSQL database.
+        dict_df (Dict[str, pd.DataFrame]): The batch's tables, keyed by TABLES names.
+        schema (str): The schema for the target tables.
+        list_tables (Optional[List[str]]): Names of the tables to load. Defaults to all.
+        upsert (bool): Whether to overwrite existing dimension rows loaded in
+            list_tables.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The tables with the database's surrogate keys.
+    """
+
+    dict_df = dict(dict_df)
+    names_load = [
+        name
+        for name in dict_df
+        if list_tables is None or TABLES[name]["table"] in list_tables
+    ]
+
+    for dimension, spec in DIMENSIONS.items():
+        key, natural = spec["key"], spec["natural"]
+        names = [name for name in names_load if key in dict_df[name].columns]
+        if not names:
+            continue
+
+        df_dimension = dict_df[spec["df"]]
+        keys_db = write_keys_postgres(
+            db_user,
+            db_password,
+            db_name,
+            db_host,
+            db_port,
+            df_dimension[spec["columns"]],
+            schema,
+            spec["table"],
+            natural,
+            key,
+            upsert and spec["df"] in names_load,
+        )
+        df_keys = df_dimension.drop_duplicates(subset=[key])
+        keys = pd.Series(df_keys[natural].map(keys_db).to_numpy(), index=df_keys[key])
+
+        for name in names:
+            df = dict_df[name]
+            values = df[key].map(keys)
+            unresolved = values.isna()
+            if unresolved.any():
+                logger.warning(
+                    f"Dropping {unresolved.sum()} {TABLES[name]['table']} rows "
+                    f"referencing a {dimension} missing from the batch."
+                )
+            dict_df[name] = df[~unresolved].assign(
+                **{key: values[~unresolved].astype(int)}
+            )
+
+        if TABLES[spec["df"]]["table"] != spec["table"]:
+            dict_df[spec["df"]] = dict_df[spec["df"]].drop(columns=[natural])
+
+    return dict_df
 
 
 def load_postgres(
@@ -184,16 +462,24 @@ def load_postgres(
     db_name: str,
     db_host: str,
     db_port: str,
-    df_denormalized: pd.DataFrame,
     df_events: pd.DataFrame,
     df_drivers: pd.DataFrame,
     df_teams: pd.DataFrame,
     df_circuits: pd.DataFrame,
     df_results: pd.DataFrame,
+    df_weather: pd.DataFrame,
+    df_race_control: pd.DataFrame,
     schema: str,
+    list_tables: Optional[List[str]] = None,
+    upsert: bool = False,
+    refresh: bool = True,
 ) -> None:
     """
-    Loads the given DataFrames into corresponding tables in Postgres.
+    Loads the given DataFrames into corresponding tables in Postgres, then refreshes
+    the materialized views built on the loaded tables.
+
+    Drivers, teams and circuits are inserted first by natural key, so the surrogate
+    keys of every table are those assigned by the database.
 
     Args:
         db_user (str): The username for the PostgreSQL database.
@@ -201,45 +487,51 @@ def load_postgres(
         db_name (str): The name of the PostgreSQL database.
         db_host (str): The host address of the PostgreSQL database.
         db_port (str): The port number of the PostgreSQL database.
-        df_denormalized (pd.DataFrame): The DataFrame containing denormalized data.
         df_events (pd.DataFrame): The DataFrame containing event data.
         df_drivers (pd.DataFrame): The DataFrame containing driver data.
         df_teams (pd.DataFrame): The DataFrame containing team data.
         df_circuits (pd.DataFrame): The DataFrame containing circuit data.
         df_results (pd.DataFrame): The DataFrame containing result data.
+        df_weather (pd.DataFrame): The DataFrame containing weather data.
+        df_race_control (pd.DataFrame): The DataFrame containing race control messages.
         schema (str): The schema for the target tables.
+        list_tables (Optional[List[str]]): Names of the tables to load. Defaults to all.
+        upsert (bool): Whether to overwrite existing rows with conflicting keys.
+        refresh (bool): Whether to refresh the materialized views after loading.
 
     Returns:
         None
     """
 
     dict_df = {
-        "df_denormalized": df_denormalized,
         "df_events": df_events,
         "df_drivers": df_drivers,
         "df_teams": df_teams,
         "df_circuits": df_circuits,
         "df_results": df_results,
+        "df_weather": df_weather,
+        "df_race_control": df_race_control,
     }
-
-    dict_db = {
-        "df_denormalized": {
-            "table": "events_denormalized",
-            "primary_keys": ["year", "round", "id_driver", "session"],
-        },
-        "df_events": {"table": "events", "primary_keys": ["year", "round"]},
-        "df_drivers": {"table": "drivers", "primary_keys": ["id_driver"]},
-        "df_teams": {"table": "teams", "primary_keys": None},
-        "df_circuits": {"table": "circuits", "primary_keys": ["name_circuit"]},
-        "df_results": {
-            "table": "results",
-            "primary_keys": ["year", "round", "id_driver", "session"],
-        },
-    }
+    dict_df = resolve_keys_postgres(
+        db_user,
+        db_password,
+        db_name,
+        db_host,
+        db_port,
+        dict_df,
+        schema,
+        list_tables,
+        upsert,
+    )
+    tables_dimension = {spec["table"] for spec in DIMENSIONS.values()}
 
     for df_name, df in dict_df.items():
-        table_name = dict_db[df_name]["table"]
-        primary_keys = dict_db[df_name]["primary_keys"]
+        table_name = TABLES[df_name]["table"]
+        primary_keys = TABLES[df_name]["primary_keys"]
+        if list_tables is not None and table_name not in list_tables:
+            continue
+        if table_name in tables_dimension:
+            continue
         logger.info(f"Loading {table_name} into Postgres.")
         write_df_postgres(
             db_user,
@@ -251,32 +543,550 @@ def load_postgres(
             schema,
             table_name,
             primary_keys,
+            upsert,
+            version=True,
+        )
+
+    if refresh:
+        refresh_views_postgres(
+            db_user, db_password, db_name, db_host, db_port, schema, list_tables
         )
 
     return None
 
 
-def main():
+def refresh_views_postgres(
+    db_user: str,
+    db_password: str,
+    db_name: str,
+    db_host: str,
+    db_port: str,
+    schema: str,
+    list_tables: Optional[List[str]] = None,
+) -> None:
+    """
+    Refreshes the materialized views built on the given tables.
+
+    Args:
+        db_user (str): The username for the PostgreSQL database.
+        db_password (str): The password for the PostgreSQL database.
+        db_name (str): The name of the PostgreSQL database.
+        db_host (str): The host address of the PostgreSQL database.
+        db_port (str): The port number of the PostgreSQL database.
+        schema (str): The schema of the views.
+        list_tables (Optional[List[str]]): Names of the loaded tables. Defaults to all.
+
+    Returns:
+        None
+    """
+
+    for view_name, view_tables in VIEWS.items():
+        if list_tables is None or set(view_tables) & set(list_tables):
+            logger.info(f"Refreshing {view_name} in Postgres.")
+            refresh_view_postgres(
+                db_user, db_password, db_name, db_host, db_port, schema, view_name
+            )
+
+    return None
+
+
+def extract_round(
+    year: int, round: int, list_sessions: List[str] = SESSIONS
+) -> Tuple[object, object]:
+    """
+    Extracts the sessions of one round, pausing after each to respect rate limits.
+
+    Args:
+        year (int): The year of the round.
+        round (int): The round number.
+        list_sessions (List[str]): The session types to extract, of "Q" and "R".
+
+    Returns:
+        Tuple[object, object]: The qualifying and race sessions, None if not requested.
+    """
+
+    data_sessions = {}
+    for session in SESSIONS:
+        if session in list_sessions:
+            data_sessions[session] = get_data_session(year, round, session)
+            time.sleep(SLEEP_REQUEST)
+
+    logger.info(
+        f"Retrieved {'/'.join(list_sessions)} session data for round {round} of {year}."
+    )
+
+    return data_sessions.get("Q"), data_sessions.get("R")
+
+
+def transform_round(
+    year: int,
+    round: int,
+    data_session_quali: object,
+    data_session_race: object,
+    missing: Dict[str, Dict[int, List[int]]],
+    keys: Optional[Dict[str, Dict[str, int]]] = None,
+) -> Optional[Tuple[pd.DataFrame, ...]]:
+    """
+    Transforms the sessions of one round into rows of every table.
+
+    Like extract_transform_history, a round whose qualifying or race data fails is
+    skipped and recorded in missing, while missing weather or messages are only logged.
+
+    Args:
+        year (int): The year of the round.
+        round (int): The round number.
+        data_session_quali (object): The qualifying session, or None.
+        data_session_race (object): The race session, or None.
+        missing (Dict[str, Dict[int, List[int]]]): Rounds with missing data, keyed by
+            "quali", "race" and "event", updated in place.
+        keys (Optional[Dict[str, Dict[str, int]]]): Provisional surrogate keys shared
+            by every round, extended in place with new ones.
+
+    Returns:
+        Optional[Tuple[pd.DataFrame, ...]]: The round's tables, in the order of
+            TABLES, or None if the round is skipped.
+    """
+
+    try:
+        df_quali = (
+            DataQuali().get_df_quali(data_session_quali, year, round)
+            if data_session_quali is not None
+            else None
+        )
+    except Exception as e:
+        logger.error(
+            f"Error retrieving qualifying data for round {round} of {year}: {e}."
+        )
+        missing["quali"].setdefault(year, []).append(round)
+        return None
+
+    try:
+        df_race = (
+            DataRace().get_df_race(data_session_race, year, round)
+            if data_session_race is not None
+            else None
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving race data for round {round} of {year}: {e}.")
+        missing["race"].setdefault(year, []).append(round)
+        return None
+
+    try:
+        df_event = DataEvent().get_df_event(
+            data_session_race if data_session_race is not None else data_session_quali
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving event data for round {round} of {year}: {e}.")
+        missing["event"].setdefault(year, []).append(round)
+        df_event = pd.DataFrame(
+            columns=["year", "round", "name_circuit", "country_circuit"]
+        )
+
+    df_weather = []
+    df_messages = []
+    for session, data_session in [("Q", data_session_quali), ("R", data_session_race)]:
+        if data_session is None:
+            continue
+        try:
+            df_weather.append(
+                DataWeather().get_df_weather(data_session, year, round, session)
+            )
+        except Exception as e:
+            logger.error(
+                f"Error retrieving {session} weather for round {round} of {year}: {e}."
+            )
+
+        try:
+            df_messages.append(
+                DataMessages().get_df_messages(data_session, year, round, session)
+            )
+        except Exception as e:
+            logger.error(
+                f"Error retrieving {session} messages for round {round} of {year}: {e}."
+            )
+
+    logger.info(f"Transformed round {round} of {year}.")
+
+    return extract_transform_tables(
+        df_quali,
+        df_race,
+        df_event,
+        pd.concat(df_weather, ignore_index=True) if df_weather else None,
+        pd.concat(df_messages, ignore_index=True) if df_messages else None,
+        keys,
+    )
+
+
+def run_pipeline(
+    list_years: List[int],
+    list_rounds: Optional[List[int]],
+    list_sessions: List[str],
+    list_tables: List[str],
+    db_user: str,
+    db_password: str,
+    db_name: str,
+    db_host: str,
+    db_port: str,
+    schema: str,
+    upsert: bool = False,
+    load: bool = True,
+) -> Tuple[
+    Dict[str, pd.DataFrame],
+    Dict[str, pd.DataFrame],
+    Dict[str, Dict[int, List[int]]],
+]:
+    """
+    Extracts, transforms, validates and loads round by round, overlapping the stages.
+
+    Round N+1 is extracted while round N is transformed and earlier rounds are
+    validated and loaded, each stage with the concurrency and retries set in PIPELINE.
+    Every round resolves its dimension keys through the natural-key upsert of
+    load_postgres, so rounds loaded concurrently share the keys of the drivers, teams
+    and circuits they have in common. Rows conflicting between rounds, such as a
+    driver renamed from one round to the next, are only found once every round is
+    loaded; the database keeps the row of one of the rounds, and they are logged and
+    quarantined so they can be corrected. Materialized views are not refreshed;
+    call refresh_views_postgres once the pipeline finishes.
+
+    Args:
+        list_years (List[int]): A list of years to process.
+        list_rounds (Optional[List[int]]): Round numbers to restrict each year to.
+        list_sessions (List[str]): The session types to extract, of "Q" and "R".
+        list_tables (List[str]): Names of the tables to load.
+        db_user (str): The username for the PostgreSQL database.
+        db_password (str): The password for the PostgreSQL database.
+        db_name (str): The name of the PostgreSQL database.
+        db_host (str): The host address of the PostgreSQL database.
+        db_port (str): The port number of the PostgreSQL database.
+        schema (str): The schema for the target tables.
+        upsert (bool): Whether to overwrite existing rows with conflicting keys.
+        load (bool): Whether to load into Postgres, or only validate.
+
+    Returns:
+        Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame], Dict[str, Dict[int, List[int]]]]:
+            - tables: The valid rows of every round, keyed by TABLES names, with one
+              row per key.
+            - quarantine: The rows failing validation, keyed by table.
+            - missing: Rounds with missing data, keyed by "session", "quali", "race"
+              and "event"; rounds failing extraction or loading count as "session".
+    """
+
+    missing = {"session": {}, "quali": {}, "race": {}, "event": {}}
+    keys_provisional = {}
+
+    def extract(key: Tuple[int, int], payload: None) -> Tuple[object, object]:
+        return extract_round(*key, list_sessions)
+
+    def transform(
+        key: Tuple[int, int], sessions: Tuple[object, object]
+    ) -> Optional[Tuple[pd.DataFrame, ...]]:
+        return transform_round(*key, *sessions, missing, keys_provisional)
+
+    def validate_load(
+        key: Tuple[int, int], tables: Tuple[pd.DataFrame, ...]
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame]]:
+        instance_validation = DataValidation()
+        tables = {
+            name: instance_validation.get_df_valid(df, TABLES[name]["table"])
+            for name, df in zip(TABLES, tables)
+        }
+        if load:
+            load_postgres(
+                db_user,
+                db_password,
+                db_name,
+                db_host,
+                db_port,
+                *tables.values(),
+                schema,
+                list_tables,
+                upsert,
+                refresh=False,
+            )
+            logger.info(f"Loaded round {key[1]} of {key[0]}.")
+        return tables, instance_validation.df_quarantine
+
+    pipeline = Pipeline(
+        [
+            Stage("extract", extract, **PIPELINE["extract"]),
+            Stage("transform", transform, **PIPELINE["transform"]),
+            Stage("load", validate_load, **PIPELINE["load"]),
+        ],
+        maxsize=PIPELINE_QUEUE_SIZE,
+        logger=logger,
+    )
+
+    plan = get_plan(list_years, list_rounds)
+    results = pipeline.run(
+        [((year, round), None) for year, rounds in plan.items() for round in rounds]
+    )
+
+    for year, round in pipeline.failed:
+        missing["session"].setdefault(year, []).append(round)
+
+    logger.info(
+        "Busy time per stage: "
+        + ", ".join(f"{k} {v:.1f}s" for k, v in pipeline.seconds.items())
+        + "."
+    )
+
+    rounds_loaded = sorted(results)
+    if not rounds_loaded:
+        raise ValueError("No session data was retrieved for the requested scope.")
+
+    # Every round passed validation on its own, so across rounds only rows sharing a
+    # key with different values fail.
+    instance_conflicts = DataValidation()
+    tables = {}
+    for name, spec in TABLES.items():
+        df = pd.concat(
+            [results[key][0][name] for key in rounds_loaded], ignore_index=True
+        )
+        instance_conflicts.get_df_valid(df, spec["table"])
+        tables[name] = (
+            df.drop_duplicates()
+            .drop_duplicates(subset=spec["primary_keys"])
+            .reset_index(drop=True)
+        )
+
+    report = instance_conflicts.get_report()
+    if report:
+        logger.warning(
+            "Rows conflicting between rounds were loaded from one of the rounds; "
+            f"correct them and rerun with --upsert: {report}."
+        )
+
+    quarantine = {
+        table: pd.concat(
+            [results[key][1].get(table) for key in rounds_loaded]
+            + [instance_conflicts.df_quarantine.get(table)],
+            ignore_index=True,
+        )
+        for table in (t["table"] for t in TABLES.values())
+    }
+
+    return tables, quarantine, missing
+
+
+def write_quarantine(instance_validation: DataValidation, path: str) -> None:
+    """
+    Logs the rows that failed validation and stages them for triage.
+
+    Args:
+        instance_validation (DataValidation): The validator holding quarantined rows.
+        path (str): The staging directory.
+
+    Returns:
+        None
+    """
+
+    report = instance_validation.get_report()
+    if report:
+        logger.warning(f"Quarantined rows failing validation: {report}.")
+        for table, df in instance_validation.df_quarantine.items():
+            if not df.empty:
+                write_df_staging(df, path, f"quarantine_{table}")
+
+
+def update_rookies(
+    df_results: pd.DataFrame,
+    df_teams: pd.DataFrame,
+    df_drivers: pd.DataFrame,
+    path: str,
+    replace: bool,
+) -> None:
+    """
+    Adds newly loaded rounds to the rookie-vs-teammate aggregates in staging.
+
+    The aggregates are keyed by driver IDs and team names rather than surrogate keys.
+
+    Args:
+        df_results (pd.DataFrame): The loaded result data.
+        df_teams (pd.DataFrame): The loaded team data.
+        df_drivers (pd.DataFrame): The loaded driver data.
+        path (str): The staging directory holding the aggregates.
+        replace (bool): Whether to reprocess rounds already in the aggregates.
+
+    Returns:
+        None
+    """
+
+    instance_normalized = DataNormalized()
+    df_results = instance_normalized.get_df_named(df_results, df_drivers, df_teams)
+    df_teams = instance_normalized.get_df_named(df_teams, df_drivers, df_teams)
+
+    instance_rookies = RookieAnalysis()
+    instance_rookies.load_state(path)
+    df_gaps_new = instance_rookies.update(df_results, df_teams, replace)
+    instance_rookies.save_state(path)
+
+    logger.info(f"Updated rookie aggregates with {len(df_gaps_new)} new comparisons.")
+
+
+def get_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command-line arguments scoping an ETL run.
+
+    Args:
+        argv (Optional[List[str]]): The arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.etl",
+        description="Extract F1 sessions from FastF1, transform and load into Postgres.",
+    )
+    parser.add_argument(
+        "--year-start", type=int, help="First year to process. Defaults to YEAR_START."
+    )
+    parser.add_argument(
+        "--year-end", type=int, help="Last year to process. Defaults to YEAR_END."
+    )
+    parser.add_argument(
+        "--rounds", type=int, nargs="+", help="Round numbers to process in each year."
+    )
+    parser.add_argument(
+        "--sessions",
+        nargs="+",
+        choices=SESSIONS,
+        default=SESSIONS,
+        help="Session types to extract.",
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=[t["table"] for t in TABLES.values()],
+        help="Tables to load. Defaults to all.",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=STAGES,
+        help="Stages to run; later stages read earlier ones from the staging directory.",
+    )
+    parser.add_argument(
+        "--staging-dir",
+        default=os.environ.get("STAGING_DIR", "staging"),
+        help="Directory holding staged data between stages.",
+    )
+    parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="Overwrite existing rows instead of skipping them.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the work to be done without running it.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap extract, transform and load round by round, without staging.",
+    )
+
+    args = parser.parse_args(argv)
+    if args.pipeline and set(args.stages) != set(STAGES):
+        parser.error("--pipeline runs every stage; drop --stages.")
+
+    return args
+
+
+def log_plan(
+    args: argparse.Namespace, list_years: List[int], list_tables: List[str]
+) -> None:
+    """
+    Logs the work an ETL run would do, with the rounds resolved from the schedule.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+        list_years (List[int]): The years in scope.
+        list_tables (List[str]): The tables in scope.
+
+    Returns:
+        None
+    """
+
+    logger.info(f"Stages: {', '.join(args.stages)}.")
+
+    if "extract" in args.stages:
+        try:
+            plan = get_plan(list_years, args.rounds)
+        except Exception as e:
+            logger.warning(f"Error fetching the schedule, rounds not resolved: {e}.")
+            plan = {year: args.rounds for year in list_years}
+
+        for year, rounds in plan.items():
+            logger.info(
+                f"Extract {'/'.join(args.sessions)} for {year}, rounds: "
+                f"{', '.join(map(str, rounds)) if rounds is not None else 'all'}."
+            )
+        if all(rounds is not None for rounds in plan.values()):
+            n_sessions = sum(len(rounds) for rounds in plan.values())
+            logger.info(f"Extract {n_sessions * len(args.sessions)} sessions in total.")
+    elif "transform" in args.stages:
+        logger.info(f"Read extracted data from {args.staging_dir}.")
+    else:
+        logger.info(f"Read transformed tables from {args.staging_dir}.")
+
+    if "load" in args.stages:
+        mode = "upsert" if args.upsert else "insert new rows"
+        logger.info(f"Load ({mode}) tables: {', '.join(list_tables)}.")
+
+    if args.pipeline:
+        logger.info("Overlap the stages round by round.")
+
+
+def main(argv: Optional[List[str]] = None):
     """
     Main function for ETL process.
 
     This function performs the following steps:
-    1. Retrieves environment variables from the ".env" file.
-    2. Sets environment variables for database connection.
-    3. Retrieves a list of years based on the start and end year provided.
-    4. Extracts and transforms historical data for the specified years.
-    5. Emails any failed data fetching.
-    6. Extracts and transforms historical data to load in Postgres tables.
-    7. Loads the transformed data into a Postgres.
+    1. Parses command-line arguments scoping the run, defaulting to every round of
+       YEAR_START to YEAR_END, both sessions and all tables.
+    2. Retrieves environment variables from the ".env" file, which a dry run doesn't
+       need.
+    3. Logs the plan, with the rounds of every year from the schedule, and stops if
+       this is a dry run.
+    4. Sets environment variables for database connection, and runs every stage round
+       by round through a pipeline if requested.
+    5. Extracts and transforms historical data, weather and race control messages for
+       the specified years, or reads it from the staging directory.
+    6. Emails any failed data fetching.
+    7. Extracts and transforms historical data to load in Postgres tables, with
+       provisional surrogate keys.
+    8. Validates the transformed data, quarantining rows that would fail to load.
+    9. Loads the transformed data into a Postgres, replacing the provisional keys
+       with those assigned by the database.
+    10. Updates the rookie-vs-teammate aggregates with newly loaded rounds.
 
     Parameters:
-    None
+    argv (Optional[List[str]]): The command-line arguments. Defaults to sys.argv.
 
     Returns:
     None
     """
 
-    get_env_var(".env")
+    args = get_args(argv)
+
+    # A dry run only needs the years, from the arguments or the environment.
+    if not args.dry_run or os.path.isfile(".env"):
+        get_env_var(".env")
+
+    year_start = args.year_start or os.environ.get("YEAR_START")
+    year_end = args.year_end or os.environ.get("YEAR_END")
+    if year_start is None or year_end is None:
+        raise ValueError("Set --year-start and --year-end, or YEAR_START and YEAR_END.")
+
+    list_years = get_years(int(year_start), int(year_end))
+    list_tables = args.tables or [t["table"] for t in TABLES.values()]
+
+    log_plan(args, list_years, list_tables)
+    if args.dry_run:
+        return None
 
     (
         db_name,
@@ -284,46 +1094,159 @@ def main():
         db_password,
         db_host,
         db_port,
-        year_start,
-        year_end,
+        _,
+        _,
         schema,
         pw,
     ) = set_env_var()
 
-    list_years = get_years(year_start, year_end)
+    if args.pipeline:
+        tables, quarantine, missing = run_pipeline(
+            list_years,
+            args.rounds,
+            args.sessions,
+            list_tables,
+            db_user,
+            db_password,
+            db_name,
+            db_host,
+            db_port,
+            schema,
+            args.upsert,
+        )
 
-    (
-        df_quali_all,
-        df_race_all,
-        df_event_all,
-        session_missing,
-        quali_missing,
-        race_missing,
-        event_missing,
-    ) = extract_transform_history(list_years)
+        email_missing_data(
+            missing["session"],
+            missing["quali"],
+            missing["race"],
+            missing["event"],
+            pw,
+            logger,
+        )
 
-    email_missing_data(
-        session_missing, quali_missing, race_missing, event_missing, pw, logger
-    )
+        instance_validation = DataValidation()
+        instance_validation.df_quarantine = quarantine
+        write_quarantine(instance_validation, args.staging_dir)
 
-    df_denormalized, df_events, df_drivers, df_teams, df_circuits, df_results = (
-        extract_transform_tables(df_quali_all, df_race_all, df_event_all)
-    )
+        refresh_views_postgres(
+            db_user, db_password, db_name, db_host, db_port, schema, list_tables
+        )
 
-    load_postgres(
-        db_user,
-        db_password,
-        db_name,
-        db_host,
-        db_port,
-        df_denormalized,
-        df_events,
-        df_drivers,
-        df_teams,
-        df_circuits,
-        df_results,
-        schema,
-    )
+        if "results" in list_tables:
+            update_rookies(
+                tables["df_results"],
+                tables["df_teams"],
+                tables["df_drivers"],
+                args.staging_dir,
+                args.upsert,
+            )
+
+        return None
+
+    if "extract" in args.stages:
+        (
+            df_quali_all,
+            df_race_all,
+            df_event_all,
+            df_weather_all,
+            df_messages_all,
+            session_missing,
+            quali_missing,
+            race_missing,
+            event_missing,
+        ) = extract_transform_history(list_years, args.rounds, args.sessions)
+
+        email_missing_data(
+            session_missing, quali_missing, race_missing, event_missing, pw, logger
+        )
+
+        for name, df in {
+            "df_quali_all": df_quali_all,
+            "df_race_all": df_race_all,
+            "df_event_all": df_event_all,
+            "df_weather_all": df_weather_all,
+            "df_messages_all": df_messages_all,
+        }.items():
+            write_df_staging(
+                df if df is not None else pd.DataFrame(), args.staging_dir, name
+            )
+
+    if "transform" in args.stages:
+        if "extract" not in args.stages:
+            (
+                df_quali_all,
+                df_race_all,
+                df_event_all,
+                df_weather_all,
+                df_messages_all,
+            ) = (
+                read_df_staging(args.staging_dir, name)
+                for name in [
+                    "df_quali_all",
+                    "df_race_all",
+                    "df_event_all",
+                    "df_weather_all",
+                    "df_messages_all",
+                ]
+            )
+            df_quali_all = df_quali_all if not df_quali_all.empty else None
+            df_race_all = df_race_all if not df_race_all.empty else None
+            df_weather_all = df_weather_all if not df_weather_all.empty else None
+            df_messages_all = df_messages_all if not df_messages_all.empty else None
+
+        tables = extract_transform_tables(
+            df_quali_all,
+            df_race_all,
+            df_event_all,
+            df_weather_all,
+            df_messages_all,
+        )
+
+        for name, df in zip(TABLES, tables):
+            write_df_staging(df, args.staging_dir, name)
+
+    if "load" in args.stages:
+        if "transform" not in args.stages:
+            tables = [read_df_staging(args.staging_dir, name) for name in TABLES]
+
+        instance_validation = DataValidation()
+        (
+            df_events,
+            df_drivers,
+            df_teams,
+            df_circuits,
+            df_results,
+            df_weather,
+            df_race_control,
+        ) = (
+            instance_validation.get_df_valid(df, TABLES[name]["table"])
+            for name, df in zip(TABLES, tables)
+        )
+
+        write_quarantine(instance_validation, args.staging_dir)
+
+        load_postgres(
+            db_user,
+            db_password,
+            db_name,
+            db_host,
+            db_port,
+            df_events,
+            df_drivers,
+            df_teams,
+            df_circuits,
+            df_results,
+            df_weather,
+            df_race_control,
+            schema,
+            list_tables,
+            args.upsert,
+        )
+
+        if "results" in list_tables:
+            update_rookies(
+                df_results, df_teams, df_drivers, args.staging_dir, args.upsert
+            )
 
 
 if __name__ == "__main__":
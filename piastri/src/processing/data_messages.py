@@ -0,0 +1,145 @@
+import pandas as pd
+
+from .data_weather import SESSION_NAMES
+
+
+class DataMessages:
+    def __init__(self):
+        self.df_raw = None
+        self.df_processed = None
+        self.df_final = None
+
+    def __get_df_raw(self, data_session: object) -> pd.DataFrame:
+        """
+        Retrieve race control messages, such as flags and safety car periods, from
+        session data.
+
+        Args:
+            data_session (object): The raw session data.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the relevant columns from the messages.
+        """
+
+        col_required = [
+            "Time",
+            "Lap",
+            "Category",
+            "Flag",
+            "Scope",
+            "Sector",
+            "RacingNumber",
+            "Status",
+            "Message",
+        ]
+
+        try:
+            self.df_raw = data_session.race_control_messages[col_required].copy()
+        except (KeyError, TypeError) as e:
+            raise ValueError(
+                f"Session data doesn't contain race control messages: {e}."
+            )
+
+        if data_session.t0_date is None:
+            raise ValueError("Session data doesn't contain a start time for messages.")
+
+        # Messages carry wall-clock times; weather and laps carry session times.
+        self.df_raw["Time"] = self.df_raw["Time"] - data_session.t0_date
+
+        return self.df_raw
+
+    def __get_df_processed(
+        self, df_raw: pd.DataFrame, year: int, round: int, session: str
+    ) -> pd.DataFrame:
+        """
+        Process the raw race control messages and return a processed DataFrame.
+
+        Args:
+            df_raw (pd.DataFrame): The raw messages DataFrame.
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (Q, R).
+
+        Returns:
+            pd.DataFrame: The processed messages DataFrame, with 'time' as the session
+                time of each message and 'seq' as its order within the session.
+        """
+
+        self.df_processed = (
+            df_raw.dropna(subset=["Time", "Message"])
+            .sort_values("Time", kind="stable")
+            .reset_index(drop=True)
+        )
+
+        self.df_processed["year"] = year
+        self.df_processed["round"] = round
+        self.df_processed["session"] = SESSION_NAMES[session]
+        self.df_processed["seq"] = self.df_processed.index + 1
+
+        self.df_processed.columns = self.df_processed.columns.str.lower()
+        self.df_processed.rename(
+            columns={"racingnumber": "racing_number"}, inplace=True
+        )
+
+        for col in ["lap", "sector"]:
+            values = pd.to_numeric(self.df_processed[col], errors="coerce")
+            self.df_processed[col] = values.astype("Int16").astype(object)
+            self.df_processed.loc[values.isna(), col] = None
+        for col in ["category", "flag", "scope", "racing_number", "status"]:
+            values = self.df_processed[col]
+            self.df_processed[col] = values.astype(object).where(values.notna(), None)
+
+        return self.df_processed
+
+    def __get_df_final(self, df_processed: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns a DataFrame containing the final race control messages.
+
+        Args:
+            df_processed (pd.DataFrame): The processed DataFrame containing messages.
+
+        Returns:
+            pd.DataFrame: The DataFrame containing the final messages.
+        """
+
+        self.df_final = df_processed[
+            [
+                "year",
+                "round",
+                "session",
+                "seq",
+                "time",
+                "lap",
+                "category",
+                "flag",
+                "scope",
+                "sector",
+                "racing_number",
+                "status",
+                "message",
+            ]
+        ]
+
+        return self.df_final
+
+    def get_df_messages(
+        self, data_session: object, year: int, round: int, session: str
+    ) -> pd.DataFrame:
+        """
+        Retrieves the final DataFrame containing the session's race control messages.
+
+        Args:
+            data_session (object): The raw session data.
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (Q, R).
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the race control messages.
+        """
+
+        df_raw = self.__get_df_raw(data_session)
+        df_processed = self.__get_df_processed(df_raw, year, round, session)
+        df_final = self.__get_df_final(df_processed)
+
+        return df_final
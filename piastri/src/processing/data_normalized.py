@@ -1,13 +1,90 @@
+from typing import Dict, Optional
+
 import pandas as pd
 
 
+# Fixed keys of the session_types table seeded by init-db.sql.
+SESSION_KEYS = {"Q1": 1, "Q2": 2, "Q3": 3, "Race": 4}
+
+# Values of the result_status enum for each non-numeric position code. Other codes
+# are not_classified, as in migrations/003_compact_results.sql.
+STATUSES = {
+    "DNQ": "dnq",
+    "DNF": "dnf",
+    "R": "retired",
+    "D": "disqualified",
+    "E": "excluded",
+    "W": "withdrawn",
+    "F": "failed_to_qualify",
+    "N": "not_classified",
+}
+
+COLS_WEATHER = [
+    "year",
+    "round",
+    "session",
+    "time",
+    "air_temp",
+    "track_temp",
+    "humidity",
+    "pressure",
+    "rainfall",
+    "wind_speed",
+    "wind_direction",
+]
+
+COLS_RACE_CONTROL = [
+    "year",
+    "round",
+    "session",
+    "seq",
+    "time",
+    "lap",
+    "category",
+    "flag",
+    "scope",
+    "sector",
+    "racing_number",
+    "status",
+    "message",
+]
+
+
 class DataNormalized:
-    def __init__(self):
+    def __init__(self, keys: Optional[Dict[str, Dict[str, int]]] = None):
+        self.keys = keys if keys is not None else {}
         self.df_events = None
         self.df_drivers = None
         self.df_teams = None
         self.df_circuits = None
         self.df_results = None
+        self.df_weather = None
+        self.df_race_control = None
+
+    def __get_keys(self, values: pd.Series, dimension: str) -> pd.Series:
+        """
+        Map natural keys of a dimension to provisional surrogate keys.
+
+        New values get the next keys after the largest known one, in sorted order, and
+        are added to self.keys so later calls, and instances sharing it, reuse them.
+        The keys only relate the tables of a batch; the database assigns the keys
+        stored when the batch is loaded.
+
+        Args:
+            values (pd.Series): Natural keys, e.g. driver IDs.
+            dimension (str): The dimension: "driver", "team" or "circuit".
+
+        Returns:
+            pd.Series: The surrogate key of each value.
+        """
+
+        keys = self.keys.setdefault(dimension, {})
+
+        new = sorted(set(values.dropna()) - set(keys))
+        start = max(keys.values(), default=0) + 1
+        keys.update({value: start + i for i, value in enumerate(new)})
+
+        return values.map(keys)
 
     def get_df_events(self, df_event: pd.DataFrame) -> pd.DataFrame:
         """
@@ -17,12 +94,16 @@ class DataNormalized:
             df_event (pd.DataFrame): The input DataFrame containing event data.
 
         Returns:
-            pd.DataFrame: Normalized DataFrame with columns 'year', 'round', and 'name_circuit'.
+            pd.DataFrame: Normalized DataFrame with columns 'year', 'round', and 'key_circuit'.
         """
 
-        self.df_events = df_event[["year", "round", "name_circuit"]].reset_index(
-            drop=True
-        )
+        self.df_events = pd.DataFrame(
+            {
+                "year": df_event["year"],
+                "round": df_event["round"],
+                "key_circuit": self.__get_keys(df_event["name_circuit"], "circuit"),
+            }
+        ).reset_index(drop=True)
 
         return self.df_events
 
@@ -35,7 +116,7 @@ class DataNormalized:
 
         Returns:
             pd.DataFrame: Normalized DataFrame with columns.
-                'id_driver', 'name_driver_last', and 'name_driver_first'.
+                'key_driver', 'id_driver', 'name_driver_last', and 'name_driver_first'.
         """
 
         self.df_drivers = (
@@ -43,6 +124,9 @@ class DataNormalized:
             .drop_duplicates()
             .reset_index(drop=True)
         )
+        self.df_drivers.insert(
+            0, "key_driver", self.__get_keys(self.df_drivers["id_driver"], "driver")
+        )
 
         return self.df_drivers
 
@@ -55,15 +139,25 @@ class DataNormalized:
 
         Returns:
             pd.DataFrame: Normalized DataFrame with columns.
-                'name_team', 'year', and 'id_driver'.
+                'key_team', 'name_team', 'year', and 'key_driver'. 'name_team' fills
+                the team_names table and isn't stored in teams.
         """
 
-        self.df_teams = (
+        df_teams = (
             df_sessions[["name_team", "year", "id_driver"]]
             .drop_duplicates()
             .reset_index(drop=True)
         )
 
+        self.df_teams = pd.DataFrame(
+            {
+                "key_team": self.__get_keys(df_teams["name_team"], "team"),
+                "name_team": df_teams["name_team"],
+                "year": df_teams["year"],
+                "key_driver": self.__get_keys(df_teams["id_driver"], "driver"),
+            }
+        )
+
         return self.df_teams
 
     def get_df_circuits(self, df_event: pd.DataFrame) -> pd.DataFrame:
@@ -75,12 +169,17 @@ class DataNormalized:
 
         Returns:
             pd.DataFrame: Normalized DataFrame with columns.
-                'name_circuit' and 'country_circuit'.
+                'key_circuit', 'name_circuit' and 'country_circuit'.
         """
 
         self.df_circuits = df_event[["name_circuit", "country_circuit"]].reset_index(
             drop=True
         )
+        self.df_circuits.insert(
+            0,
+            "key_circuit",
+            self.__get_keys(self.df_circuits["name_circuit"], "circuit"),
+        )
 
         return self.df_circuits
 
@@ -93,11 +192,119 @@ class DataNormalized:
 
         Returns:
             pd.DataFrame: Normalized DataFrame with columns.
-                'year', 'round', 'id_driver', 'name_team', 'session', 'position' and 'time'.
+                'year', 'round', 'key_driver', 'key_team', 'key_session', 'position',
+                'status' and 'time'. Positions are integers, None unless classified,
+                with the reason in 'status', not_classified for unknown codes.
         """
 
-        self.df_results = df_sessions[
-            ["year", "round", "id_driver", "name_team", "session", "position", "time"]
-        ].reset_index(drop=True)
+        df_sessions = df_sessions.reset_index(drop=True)
+        position = pd.to_numeric(df_sessions["position"], errors="coerce")
+        status = (
+            df_sessions["position"]
+            .astype(str)
+            .map(STATUSES)
+            .fillna(STATUSES["N"])
+        )
+
+        self.df_results = pd.DataFrame(
+            {
+                "year": df_sessions["year"],
+                "round": df_sessions["round"],
+                "key_driver": self.__get_keys(df_sessions["id_driver"], "driver"),
+                "key_team": self.__get_keys(df_sessions["name_team"], "team"),
+                "key_session": df_sessions["session"].map(SESSION_KEYS),
+                "position": position.round()
+                .astype("Int16")
+                .astype(object)
+                .where(position.notna(), None),
+                "status": status.where(position.isna(), "classified"),
+                "time": df_sessions["time"],
+            }
+        )
 
         return self.df_results
+
+    def get_df_named(
+        self, df: pd.DataFrame, df_drivers: pd.DataFrame, df_teams: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Replace the surrogate keys of results or teams with their natural keys.
+
+        Args:
+            df (pd.DataFrame): Normalized result or team data.
+            df_drivers (pd.DataFrame): Normalized driver data covering df's drivers.
+            df_teams (pd.DataFrame): Normalized team data covering df's teams.
+
+        Returns:
+            pd.DataFrame: df with 'id_driver', 'name_team' and 'session' in place of
+                'key_driver', 'key_team' and 'key_session', where present.
+        """
+
+        names = {
+            "key_driver": df_drivers.set_index("key_driver")["id_driver"],
+            "key_team": df_teams.drop_duplicates("key_team").set_index("key_team")[
+                "name_team"
+            ],
+            "key_session": pd.Series(
+                list(SESSION_KEYS), index=list(SESSION_KEYS.values())
+            ),
+        }
+
+        df = df.drop(columns=["name_team"], errors="ignore")
+        for col, values in names.items():
+            if col in df.columns:
+                df[col] = df[col].map(values)
+
+        return df.rename(
+            columns={
+                "key_driver": "id_driver",
+                "key_team": "name_team",
+                "key_session": "session",
+            }
+        )
+
+    def get_df_weather(self, df_weather: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Get a DataFrame of weather samples keyed by session and session time.
+
+        Args:
+            df_weather (Optional[pd.DataFrame]): The input DataFrame containing weather
+                data, or None if no session had any.
+
+        Returns:
+            pd.DataFrame: DataFrame with columns
+                'year', 'round', 'session', 'time' and the weather measurements.
+        """
+
+        if df_weather is None:
+            self.df_weather = pd.DataFrame(columns=COLS_WEATHER)
+            return self.df_weather
+
+        self.df_weather = (
+            df_weather[COLS_WEATHER]
+            .drop_duplicates(subset=["year", "round", "session", "time"])
+            .reset_index(drop=True)
+        )
+
+        return self.df_weather
+
+    def get_df_race_control(self, df_messages: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Get a DataFrame of race control messages keyed by session and message order.
+
+        Args:
+            df_messages (Optional[pd.DataFrame]): The input DataFrame containing race
+                control messages, or None if no session had any.
+
+        Returns:
+            pd.DataFrame: DataFrame with columns
+                'year', 'round', 'session', 'seq', 'time' and the message fields.
+        """
+
+        if df_messages is None:
+            self.df_race_control = pd.DataFrame(columns=COLS_RACE_CONTROL)
+            return self.df_race_control
+
+        self.df_race_control = df_messages[COLS_RACE_CONTROL].reset_index(drop=True)
+
+        return self.df_race_control
@@ -0,0 +1,164 @@
+from typing import Dict
+
+import pandas as pd
+
+from .data_normalized import SESSION_KEYS, STATUSES
+
+
+SPEC = {
+    "events": {
+        "keys": ["year", "round"],
+        "not_null": ["year", "round", "key_circuit"],
+        "domains": {
+            "year": {"min": 1950, "max": 2100},
+            "round": {"min": 1, "max": 30},
+        },
+    },
+    "drivers": {
+        "keys": ["key_driver"],
+        "not_null": [
+            "key_driver",
+            "id_driver",
+            "name_driver_last",
+            "name_driver_first",
+        ],
+        "domains": {},
+    },
+    "teams": {
+        "keys": ["key_team", "year", "key_driver"],
+        "not_null": ["key_team", "name_team", "year", "key_driver"],
+        "domains": {"year": {"min": 1950, "max": 2100}},
+    },
+    "circuits": {
+        "keys": ["key_circuit"],
+        "not_null": ["key_circuit", "name_circuit", "country_circuit"],
+        "domains": {},
+    },
+    "results": {
+        "keys": ["year", "round", "key_driver", "key_session"],
+        "not_null": [
+            "year",
+            "round",
+            "key_driver",
+            "key_team",
+            "key_session",
+            "status",
+        ],
+        "domains": {
+            "year": {"min": 1950, "max": 2100},
+            "round": {"min": 1, "max": 30},
+            "key_session": {"values": list(SESSION_KEYS.values())},
+            "position": {"min": 1, "max": 99},
+            "status": {"values": ["classified", *STATUSES.values()]},
+        },
+    },
+    "weather": {
+        "keys": ["year", "round", "session", "time"],
+        "not_null": ["year", "round", "session", "time"],
+        "domains": {
+            "year": {"min": 1950, "max": 2100},
+            "round": {"min": 1, "max": 30},
+            "session": {"values": ["Qualifying", "Race"]},
+            "humidity": {"min": 0, "max": 100},
+            "wind_direction": {"min": 0, "max": 360},
+        },
+    },
+    "race_control": {
+        "keys": ["year", "round", "session", "seq"],
+        "not_null": ["year", "round", "session", "seq", "time", "message"],
+        "domains": {
+            "year": {"min": 1950, "max": 2100},
+            "round": {"min": 1, "max": 30},
+            "session": {"values": ["Qualifying", "Race"]},
+        },
+    },
+}
+
+
+class DataValidation:
+    def __init__(self, spec: Dict = SPEC):
+        self.spec = spec
+        self.df_quarantine = {}
+
+    def __get_df_checks(self, df: pd.DataFrame, spec: Dict) -> pd.DataFrame:
+        """
+        Evaluate every check of a table's spec as a boolean column, True where a row fails.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to validate, without exact duplicate rows.
+            spec (Dict): The table's spec, with 'keys', 'not_null' and 'domains'.
+
+        Returns:
+            pd.DataFrame: One boolean column per check, aligned with df.
+        """
+
+        checks = {}
+
+        for col in spec["not_null"]:
+            checks[f"null {col}"] = df[col].isna()
+
+        for col, domain in spec["domains"].items():
+            values = df[col]
+            present = values.notna()
+            if "min" in domain or "max" in domain:
+                numeric = pd.to_numeric(values, errors="coerce")
+                outside = numeric.isna() | ~numeric.between(
+                    domain.get("min", float("-inf")), domain.get("max", float("inf"))
+                )
+                checks[f"range {col}"] = present & outside
+            if "values" in domain:
+                checks[f"domain {col}"] = present & ~values.isin(domain["values"])
+            if "pattern" in domain:
+                matches = values.astype(str).str.fullmatch(domain["pattern"])
+                checks[f"pattern {col}"] = present & ~matches
+
+        checks["duplicate key"] = df.duplicated(spec["keys"], keep=False)
+
+        return pd.DataFrame(checks, index=df.index)
+
+    def get_df_valid(self, df: pd.DataFrame, table: str) -> pd.DataFrame:
+        """
+        Validate a DataFrame against its table's spec and quarantine offending rows.
+
+        Exact duplicate rows are dropped; rows sharing a key with different values are
+        all quarantined, since the right one can't be chosen.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to validate.
+            table (str): The target table, a key of the spec.
+
+        Returns:
+            pd.DataFrame: The rows passing every check.
+        """
+
+        spec = self.spec[table]
+
+        cols_missing = set(spec["not_null"]) - set(df.columns)
+        if cols_missing:
+            raise ValueError(
+                f"{table} is missing the required columns: {cols_missing}."
+            )
+
+        df = df.drop_duplicates()
+        df_checks = self.__get_df_checks(df, spec)
+        failed = df_checks.any(axis=1)
+
+        df_failed = df_checks.loc[failed]
+        reasons = df_failed.dot(df_failed.columns + "; ").str.rstrip("; ")
+        self.df_quarantine[table] = df.loc[failed].assign(reason=reasons)
+
+        return df.loc[~failed].reset_index(drop=True)
+
+    def get_report(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count the quarantined rows of each table per failed check.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Counts per check, keyed by table.
+        """
+
+        return {
+            table: df["reason"].str.split("; ").explode().value_counts().to_dict()
+            for table, df in self.df_quarantine.items()
+            if not df.empty
+        }
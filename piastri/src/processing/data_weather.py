@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+
+SESSION_NAMES = {"Q": "Qualifying", "R": "Race"}
+
+
+class DataWeather:
+    def __init__(self):
+        self.df_raw = None
+        self.df_processed = None
+        self.df_final = None
+
+    def __get_df_raw(self, data_session: object) -> pd.DataFrame:
+        """
+        Retrieve weather samples, taken about once a minute, from session data.
+
+        Args:
+            data_session (object): The raw session data.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the relevant columns from the weather data.
+        """
+
+        col_required = [
+            "Time",
+            "AirTemp",
+            "TrackTemp",
+            "Humidity",
+            "Pressure",
+            "Rainfall",
+            "WindSpeed",
+            "WindDirection",
+        ]
+
+        try:
+            self.df_raw = data_session.weather_data[col_required].copy()
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Session data doesn't contain weather data: {e}.")
+
+        return self.df_raw
+
+    def __get_df_processed(
+        self, df_raw: pd.DataFrame, year: int, round: int, session: str
+    ) -> pd.DataFrame:
+        """
+        Process the raw weather data and return a processed DataFrame.
+
+        Args:
+            df_raw (pd.DataFrame): The raw weather data DataFrame.
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (Q, R).
+
+        Returns:
+            pd.DataFrame: The processed weather data DataFrame, with 'time' as the
+                session time of each sample.
+        """
+
+        self.df_processed = df_raw.dropna(subset=["Time"]).reset_index(drop=True)
+
+        self.df_processed["year"] = year
+        self.df_processed["round"] = round
+        self.df_processed["session"] = SESSION_NAMES[session]
+
+        self.df_processed.rename(
+            columns={
+                "Time": "time",
+                "AirTemp": "air_temp",
+                "TrackTemp": "track_temp",
+                "Humidity": "humidity",
+                "Pressure": "pressure",
+                "Rainfall": "rainfall",
+                "WindSpeed": "wind_speed",
+                "WindDirection": "wind_direction",
+            },
+            inplace=True,
+        )
+        # Nullable dtypes keep missing samples missing, instead of rain or an error.
+        self.df_processed["rainfall"] = self.df_processed["rainfall"].astype("boolean")
+        self.df_processed = self.df_processed.drop_duplicates(subset=["time"])
+
+        return self.df_processed
+
+    def __get_df_final(self, df_processed: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns a DataFrame containing the final weather data.
+
+        Args:
+            df_processed (pd.DataFrame): The processed DataFrame containing weather data.
+
+        Returns:
+            pd.DataFrame: The DataFrame containing the final weather data.
+        """
+
+        self.df_final = df_processed[
+            [
+                "year",
+                "round",
+                "session",
+                "time",
+                "air_temp",
+                "track_temp",
+                "humidity",
+                "pressure",
+                "rainfall",
+                "wind_speed",
+                "wind_direction",
+            ]
+        ].astype(
+            {
+                "air_temp": np.float32,
+                "track_temp": np.float32,
+                "humidity": np.float32,
+                "pressure": np.float32,
+                "wind_speed": np.float32,
+                "wind_direction": "Int16",
+            }
+        )
+
+        return self.df_final
+
+    def get_df_weather(
+        self, data_session: object, year: int, round: int, session: str
+    ) -> pd.DataFrame:
+        """
+        Retrieves the final DataFrame containing the session's weather samples.
+
+        Args:
+            data_session (object): The raw session data.
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (Q, R).
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the weather data.
+        """
+
+        df_raw = self.__get_df_raw(data_session)
+        df_processed = self.__get_df_processed(df_raw, year, round, session)
+        df_final = self.__get_df_final(df_processed)
+
+        return df_final
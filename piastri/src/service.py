@@ -0,0 +1,553 @@
+import datetime
+import decimal
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from functions.functions import get_engine, get_env_var, set_env_var, setup_logger
+from .analysis.rookies import COLS_RESULTS, RookieAnalysis
+
+
+logger = setup_logger("service")
+
+
+def get_queries(schema: str) -> Dict[str, Any]:
+    """
+    Build the read-only SQL statements served by the query service.
+
+    Results are joined on their integer keys, and driver IDs and names are looked up
+    only for the rows returned. The rookie queries return every result and team row
+    by driver ID and team name, for RookieAnalysis.
+
+    Args:
+        schema (str): The schema containing the normalized tables.
+
+    Returns:
+        Dict[str, Any]: SQLAlchemy text clauses keyed by query name.
+    """
+
+    results_seconds = f"""
+        SELECT
+            year,
+            round,
+            key_driver,
+            key_team,
+            key_session,
+            position,
+            EXTRACT(EPOCH FROM time) AS time
+        FROM
+            {schema}.results
+    """
+
+    return {
+        "version": text(
+            f"""
+            SELECT
+                COALESCE(MAX(version), 0) AS version
+            FROM
+                {schema}.data_version
+            """
+        ),
+        "driver_results": text(
+            f"""
+            SELECT
+                r.year,
+                r.round,
+                c.name_circuit,
+                c.country_circuit,
+                t.name_team,
+                s.session,
+                r.position,
+                CAST(r.status AS TEXT) AS status,
+                EXTRACT(EPOCH FROM r.time) AS time
+            FROM
+                {schema}.results r
+            INNER JOIN
+                {schema}.drivers d
+            ON
+                d.key_driver = r.key_driver
+            INNER JOIN
+                {schema}.session_types s
+            ON
+                s.key_session = r.key_session
+            LEFT JOIN
+                {schema}.team_names t
+            ON
+                t.key_team = r.key_team
+            LEFT JOIN
+                {schema}.events e
+            ON
+                e.year = r.year
+                AND e.round = r.round
+            LEFT JOIN
+                {schema}.circuits c
+            ON
+                c.key_circuit = e.key_circuit
+            WHERE
+                d.id_driver = :id_driver
+                AND r.year = :year
+            ORDER BY
+                r.round,
+                r.key_session
+            """
+        ),
+        "head_to_head": text(
+            f"""
+            WITH r AS ({results_seconds} WHERE year = :year)
+            SELECT
+                d.round,
+                s.session,
+                tm.name_team,
+                dt.id_driver AS id_teammate,
+                d.position,
+                t.position AS position_teammate,
+                d.time,
+                t.time AS time_teammate,
+                d.time - t.time AS gap
+            FROM
+                r d
+            INNER JOIN
+                {schema}.drivers dd
+            ON
+                dd.key_driver = d.key_driver
+            INNER JOIN
+                r t
+            ON
+                t.round = d.round
+                AND t.key_session = d.key_session
+                AND t.key_team = d.key_team
+                AND t.key_driver <> d.key_driver
+            INNER JOIN
+                {schema}.drivers dt
+            ON
+                dt.key_driver = t.key_driver
+            INNER JOIN
+                {schema}.session_types s
+            ON
+                s.key_session = d.key_session
+            LEFT JOIN
+                {schema}.team_names tm
+            ON
+                tm.key_team = d.key_team
+            WHERE
+                dd.id_driver = :id_driver
+            ORDER BY
+                d.round,
+                d.key_session
+            """
+        ),
+        "rookie_results": text(
+            f"""
+            SELECT
+                r.year,
+                r.round,
+                d.id_driver,
+                t.name_team,
+                s.session,
+                r.position,
+                r.time
+            FROM
+                {schema}.results r
+            INNER JOIN
+                {schema}.drivers d
+            ON
+                d.key_driver = r.key_driver
+            INNER JOIN
+                {schema}.session_types s
+            ON
+                s.key_session = r.key_session
+            INNER JOIN
+                {schema}.team_names t
+            ON
+                t.key_team = r.key_team
+            """
+        ),
+        "rookie_teams": text(
+            f"""
+            SELECT
+                n.name_team,
+                t.year,
+                d.id_driver
+            FROM
+                {schema}.teams t
+            INNER JOIN
+                {schema}.drivers d
+            ON
+                d.key_driver = t.key_driver
+            INNER JOIN
+                {schema}.team_names n
+            ON
+                n.key_team = t.key_team
+            """
+        ),
+    }
+
+
+def get_json_safe(value: Any) -> Any:
+    """
+    Convert database values that json cannot serialize.
+
+    Args:
+        value (Any): A value returned by the database driver.
+
+    Returns:
+        Any: A JSON-serializable equivalent.
+    """
+
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+
+    return value
+
+
+class CacheLRU:
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = None
+        self.lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        """
+        Get a cached response body and mark it as most recently used.
+
+        Args:
+            key (Tuple): The cache key.
+
+        Returns:
+            Optional[bytes]: The cached body, or None on a miss.
+        """
+
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key: Tuple, body: bytes, version: Any) -> None:
+        """
+        Cache a response body, evicting the least recently used entry when full.
+
+        Bodies computed against another data version than the cache's are dropped, so
+        a request that was in flight when the cache was cleared can't repopulate it
+        with stale data.
+
+        Args:
+            key (Tuple): The cache key.
+            body (bytes): The serialized response body.
+            version (Any): The data version the body was computed against.
+
+        Returns:
+            None.
+        """
+
+        with self.lock:
+            if version != self.version:
+                return
+            self.entries[key] = body
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self, version: Any = None) -> None:
+        """
+        Drop every cached response and only accept bodies of a new data version.
+
+        Args:
+            version (Any): The data version of the bodies to cache from now on.
+
+        Returns:
+            None.
+        """
+
+        with self.lock:
+            self.entries.clear()
+            self.version = version
+
+
+class QueryService:
+    def __init__(
+        self,
+        engine: Engine,
+        schema: str,
+        maxsize: int = 256,
+        interval_version: float = 30.0,
+    ):
+        self.engine = engine
+        self.queries = get_queries(schema)
+        self.cache = CacheLRU(maxsize)
+        self.interval_version = interval_version
+        self.version = None
+        self.time_version = 0.0
+        self.lock = threading.Lock()
+        self.rookies = []
+
+    def __get_rows(self, name: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run a named query on a pooled connection.
+
+        Args:
+            name (str): The query name from get_queries.
+            params (Dict[str, Any]): Bound parameters.
+
+        Returns:
+            List[Dict[str, Any]]: JSON-safe rows.
+        """
+
+        with self.engine.connect() as connection:
+            rows = connection.execute(self.queries[name], params).mappings().all()
+
+        return [{k: get_json_safe(v) for k, v in row.items()} for row in rows]
+
+    def __get_df(self, name: str) -> pd.DataFrame:
+        """
+        Run a named query without parameters into a DataFrame, keeping database types.
+
+        Args:
+            name (str): The query name from get_queries.
+
+        Returns:
+            pd.DataFrame: The rows returned.
+        """
+
+        with self.engine.connect() as connection:
+            result = connection.execute(self.queries[name])
+            return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+    def __get_rookies(self) -> List[Dict[str, Any]]:
+        """
+        Compute the rookie-vs-teammate summary of every season with RookieAnalysis.
+
+        The service runs apart from the ETL's staging directory, so the aggregates are
+        rebuilt from the database rather than read from the ETL's state, with the same
+        rookie definition and gaps.
+
+        Returns:
+            List[Dict[str, Any]]: One JSON-safe row per rookie, teammate and session type.
+        """
+
+        df_results = self.__get_df("rookie_results")
+        df_teams = self.__get_df("rookie_teams")
+        if df_results.empty or df_teams.empty:
+            return []
+
+        instance_rookies = RookieAnalysis()
+        instance_rookies.update(df_results[COLS_RESULTS], df_teams)
+        df_summary = instance_rookies.get_df_summary()
+
+        return [
+            {k: get_json_safe(v) for k, v in row.items()}
+            for row in df_summary.astype(object)
+            .where(df_summary.notna(), None)
+            .to_dict("records")
+        ]
+
+    def check_version(self, force: bool = False) -> None:
+        """
+        Invalidate the cache and recompute hot aggregates once the data changes.
+
+        The ETL and watch mode bump the single row of data_version in the same
+        transaction as every write inserting or changing rows, so reading it is a
+        primary-key lookup, run at most once per interval_version.
+
+        Args:
+            force (bool): Whether to check regardless of the interval.
+
+        Returns:
+            None.
+        """
+
+        with self.lock:
+            if (
+                not force
+                and time.monotonic() - self.time_version < self.interval_version
+            ):
+                return
+            self.time_version = time.monotonic()
+
+            version = self.__get_rows("version", {})[0]["version"]
+            if version == self.version:
+                return
+
+            logger.info(f"Data version changed to {version}; refreshing cache.")
+            self.rookies = self.__get_rookies()
+            self.version = version
+            self.cache.clear(version)
+
+    def get_driver_results(self, id_driver: str, year: int) -> List[Dict[str, Any]]:
+        """
+        Get a driver's results for every session of a season.
+
+        Args:
+            id_driver (str): The driver ID.
+            year (int): The season.
+
+        Returns:
+            List[Dict[str, Any]]: One row per round and session.
+        """
+
+        return self.__get_rows("driver_results", {"id_driver": id_driver, "year": year})
+
+    def get_head_to_head(self, id_driver: str, year: int) -> List[Dict[str, Any]]:
+        """
+        Compare a driver with their teammates session by session for a season.
+
+        Args:
+            id_driver (str): The driver ID.
+            year (int): The season.
+
+        Returns:
+            List[Dict[str, Any]]: One row per round, session and teammate.
+        """
+
+        return self.__get_rows("head_to_head", {"id_driver": id_driver, "year": year})
+
+    def get_rookies(self, year: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the precomputed rookie-vs-teammate summary of RookieAnalysis.
+
+        Args:
+            year (Optional[int]): Restrict to rookies of this season.
+
+        Returns:
+            List[Dict[str, Any]]: One row per rookie, teammate and session type, as in
+                RookieAnalysis.get_df_summary.
+        """
+
+        return [r for r in self.rookies if year is None or r["year"] == year]
+
+    def get_response(self, path: str, params: Dict[str, str]) -> Tuple[int, bytes]:
+        """
+        Route a request to its query and serve it from the cache when possible.
+
+        Args:
+            path (str): The request path.
+            params (Dict[str, str]): The query-string parameters.
+
+        Returns:
+            Tuple[int, bytes]: The HTTP status and JSON body.
+        """
+
+        self.check_version()
+        version = self.version
+
+        key = (path, tuple(sorted(params.items())))
+        body = self.cache.get(key)
+        if body is not None:
+            return 200, body
+
+        try:
+            year = int(params["year"]) if "year" in params else None
+        except ValueError:
+            return 400, json.dumps({"error": "year must be an integer."}).encode()
+
+        match_results = re.fullmatch(r"/drivers/([^/]+)/results", path)
+        match_h2h = re.fullmatch(r"/drivers/([^/]+)/head-to-head", path)
+
+        if path == "/rookies":
+            data = self.get_rookies(year)
+        elif (match_results or match_h2h) and year is None:
+            return 400, json.dumps({"error": "year is required."}).encode()
+        elif match_results:
+            data = self.get_driver_results(match_results.group(1), year)
+        elif match_h2h:
+            data = self.get_head_to_head(match_h2h.group(1), year)
+        else:
+            return 404, json.dumps({"error": f"Unknown endpoint {path}."}).encode()
+
+        body = json.dumps(data).encode()
+        self.cache.put(key, body, version)
+
+        return 200, body
+
+
+def get_handler(service: QueryService) -> type:
+    """
+    Build a request handler class bound to a query service.
+
+    Args:
+        service (QueryService): The service answering requests.
+
+    Returns:
+        type: A BaseHTTPRequestHandler subclass.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+            try:
+                status, body = service.get_response(url.path.rstrip("/"), params)
+            except Exception as e:
+                logger.error(f"Error serving {self.path}: {e}.")
+                status, body = 500, json.dumps({"error": "Internal error."}).encode()
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return Handler
+
+
+def main():
+    """
+    Main function for the read-only results query service.
+
+    This function performs the following steps:
+    1. Retrieves environment variables from the ".env" file.
+    2. Creates a pooled engine for the Postgres database.
+    3. Precomputes hot aggregates and starts the HTTP server.
+
+    Parameters:
+    None
+
+    Returns:
+    None
+    """
+
+    get_env_var(".env")
+
+    (
+        db_name,
+        db_user,
+        db_password,
+        db_host,
+        db_port,
+        year_start,
+        year_end,
+        schema,
+        pw,
+    ) = set_env_var()
+
+    engine = get_engine(db_user, db_password, db_name, db_host, db_port)
+    service = QueryService(engine, schema)
+    service.check_version(force=True)
+
+    port = int(os.environ.get("SERVICE_PORT", "8000"))
+    server = ThreadingHTTPServer(("0.0.0.0", port), get_handler(service))
+    logger.info(f"Serving results on port {port}.")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
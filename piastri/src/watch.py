@@ -0,0 +1,446 @@
+import argparse
+import time
+from typing import List, Optional, Tuple
+
+import fastf1 as ff1
+import pandas as pd
+
+from functions.functions import (
+    get_data_session_results,
+    get_env_var,
+    get_schedule,
+    set_env_var,
+    setup_logger,
+)
+from .etl import TABLES, extract_transform_tables, load_postgres
+from .processing.data_event import DataEvent
+from .processing.data_quali import DataQuali
+from .processing.data_race import DataRace
+from .processing.data_validation import DataValidation
+from .processing.data_weather import SESSION_NAMES
+
+
+logger = setup_logger("watch")
+
+# Tables a live update writes; weather and messages are left to the batch ETL.
+TABLES_WATCH = ["events", "drivers", "teams", "circuits", "results"]
+
+# Expected length of each session, from its scheduled start.
+DURATIONS = {"Q": pd.Timedelta(hours=1), "R": pd.Timedelta(hours=2)}
+
+# How long after a session's expected end to keep checking for amended results, such
+# as post-race penalties.
+WINDOWS_AMEND = {"Q": pd.Timedelta(hours=3), "R": pd.Timedelta(hours=24)}
+
+# Results are polled at the fastest interval from LEAD before a session's expected end
+# until they are published, or for at most WINDOW_PUBLISH after it.
+LEAD = pd.Timedelta(minutes=5)
+WINDOW_PUBLISH = pd.Timedelta(minutes=30)
+
+# How long a fetched schedule is reused before fetching it again.
+SCHEDULE_TTL = pd.Timedelta(hours=6)
+
+# The column that is only set once a session's results are published; before that,
+# FastF1 returns one placeholder row per entered driver.
+COLUMNS_PUBLISHED = {"Q": "Position", "R": "ClassifiedPosition"}
+
+
+def get_df_schedule_sessions(schedule: pd.DataFrame) -> pd.DataFrame:
+    """
+    List the qualifying and race sessions of a schedule with their watch windows.
+
+    Args:
+        schedule (pd.DataFrame): The event schedule from get_schedule.
+
+    Returns:
+        pd.DataFrame: One row per session with 'round', 'session' (Q, R), and the
+            UTC 'start', expected 'end' and 'until' when amendments stop being checked.
+    """
+
+    codes = {name: code for code, name in SESSION_NAMES.items()}
+
+    df = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "round": schedule["RoundNumber"],
+                    "session": schedule[f"Session{i}"].map(codes),
+                    "start": pd.to_datetime(schedule[f"Session{i}DateUtc"]),
+                }
+            )
+            for i in range(1, 6)
+            if f"Session{i}" in schedule.columns
+        ],
+        ignore_index=True,
+    )
+    df = df.dropna(subset=["session", "start"])
+    df = df[df["round"] > 0].astype({"round": int})
+
+    df["end"] = df["start"] + df["session"].map(DURATIONS)
+    df["until"] = df["end"] + df["session"].map(WINDOWS_AMEND)
+
+    return df.sort_values("start").reset_index(drop=True)
+
+
+class RaceWeekendWatch:
+    def __init__(
+        self,
+        db_user: str,
+        db_password: str,
+        db_name: str,
+        db_host: str,
+        db_port: str,
+        schema: str,
+        interval_live: float = 15.0,
+        interval_near: float = 120.0,
+        interval_idle: float = 3600.0,
+    ):
+        self.db = [db_user, db_password, db_name, db_host, db_port]
+        self.schema = schema
+        self.interval_live = interval_live
+        self.interval_near = interval_near
+        self.interval_idle = interval_idle
+        self.df_sessions = None
+        self.time_schedule = None
+        self.keys = {}
+        self.snapshots = {}
+
+    def __get_df_sessions(self, now: pd.Timestamp) -> pd.DataFrame:
+        """
+        Get the sessions of the current season, fetching the schedule at most once per
+        SCHEDULE_TTL.
+
+        Args:
+            now (pd.Timestamp): The current UTC time, without a timezone.
+
+        Returns:
+            pd.DataFrame: The sessions from get_df_schedule_sessions.
+        """
+
+        if (
+            self.df_sessions is None
+            or now - self.time_schedule > SCHEDULE_TTL
+            or now.year != self.time_schedule.year
+        ):
+            self.df_sessions = get_df_schedule_sessions(get_schedule(now.year))
+            self.time_schedule = now
+
+        return self.df_sessions
+
+    def __is_published(self, results: Optional[pd.DataFrame], session: str) -> bool:
+        """
+        Check whether a session's results are published rather than placeholders.
+
+        Args:
+            results (Optional[pd.DataFrame]): The session's results from FastF1.
+            session (str): The session type (Q, R).
+
+        Returns:
+            bool: True if every driver has an ID and at least one driver is placed.
+        """
+
+        if results is None or results.empty:
+            return False
+
+        column = COLUMNS_PUBLISHED[session]
+        if "DriverId" not in results.columns or column not in results.columns:
+            return False
+
+        ids = results["DriverId"].fillna("").astype(str).str.strip()
+        placed = results[column].notna() & (results[column].astype(str) != "")
+
+        return bool((ids != "").all() and placed.any())
+
+    def __get_df_results(
+        self, year: int, round: int, session: str
+    ) -> Optional[Tuple[pd.DataFrame, object]]:
+        """
+        Load a session's published results and transform them like the batch ETL.
+
+        Args:
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (Q, R).
+
+        Returns:
+            Optional[Tuple[pd.DataFrame, object]]: The transformed results, and the
+                session; None while only placeholder results are available.
+        """
+
+        data_session = get_data_session_results(year, round, session)
+        if not self.__is_published(data_session.results, session):
+            return None
+
+        if session == "Q":
+            df = DataQuali().get_df_quali(data_session, year, round)
+        else:
+            df = DataRace().get_df_race(data_session, year, round)
+
+        return df, data_session
+
+    def __get_df_changed(
+        self, key: Tuple[int, int, str], df_results: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Keep the result rows that are new or differ from the last ones pushed.
+
+        Args:
+            key (Tuple[int, int, str]): The (year, round, session) of the results.
+            df_results (pd.DataFrame): The session's transformed results.
+
+        Returns:
+            pd.DataFrame: The new or amended rows.
+        """
+
+        df_previous = self.snapshots.get(key)
+        if df_previous is None:
+            return df_results
+
+        df = df_results.merge(df_previous, how="left", indicator=True)
+
+        return df_results[(df["_merge"] == "left_only").to_numpy()]
+
+    def __push(
+        self,
+        year: int,
+        round: int,
+        df_quali: Optional[pd.DataFrame],
+        df_race: Optional[pd.DataFrame],
+        data_session: object,
+    ) -> int:
+        """
+        Normalize, validate and upsert changed result rows, then refresh the views.
+
+        Args:
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            df_quali (Optional[pd.DataFrame]): Changed qualifying rows, or None.
+            df_race (Optional[pd.DataFrame]): Changed race rows, or None.
+            data_session (object): The session, for its event data.
+
+        Returns:
+            int: The number of result rows loaded.
+        """
+
+        df_event = DataEvent().get_df_event(data_session)
+        tables = extract_transform_tables(
+            df_quali, df_race, df_event, None, None, self.keys
+        )
+
+        instance_validation = DataValidation()
+        tables = [
+            instance_validation.get_df_valid(df, TABLES[name]["table"])
+            for name, df in zip(TABLES, tables)
+        ]
+        report = instance_validation.get_report()
+        if report:
+            logger.warning(f"Quarantined rows for round {round} of {year}: {report}.")
+
+        load_postgres(*self.db, *tables, self.schema, TABLES_WATCH, upsert=True)
+
+        return len(tables[list(TABLES).index("df_results")])
+
+    def poll(self, now: pd.Timestamp) -> int:
+        """
+        Check every session in its watch window and push new or amended results.
+
+        Args:
+            now (pd.Timestamp): The current UTC time, without a timezone.
+
+        Returns:
+            int: The number of result rows loaded.
+        """
+
+        df_sessions = self.__get_df_sessions(now)
+        df_due = df_sessions[
+            (df_sessions["start"] <= now) & (now <= df_sessions["until"])
+        ]
+
+        n_rows = 0
+        for row in df_due.itertuples():
+            key = (now.year, row.round, row.session)
+            try:
+                published = self.__get_df_results(*key)
+            except Exception as e:
+                logger.debug(f"No results for {key}: {e}.")
+                continue
+
+            if published is None:
+                logger.debug(f"Results for {key} aren't published yet.")
+                continue
+
+            df_results, data_session = published
+
+            df_changed = self.__get_df_changed(key, df_results)
+            if df_changed.empty:
+                continue
+
+            logger.info(f"Pushing {len(df_changed)} new or amended rows for {key}.")
+            n_rows += self.__push(
+                now.year,
+                row.round,
+                df_changed if row.session == "Q" else None,
+                df_changed if row.session == "R" else None,
+                data_session,
+            )
+            self.snapshots[key] = df_results
+
+        return n_rows
+
+    def get_interval(self, now: pd.Timestamp) -> float:
+        """
+        Choose how long to wait before the next poll, from the session timetable.
+
+        Polls are fastest around a session's expected end until its results are
+        published, slower while amendments are possible, and otherwise wait for the
+        next session, at most interval_idle at a time.
+
+        Args:
+            now (pd.Timestamp): The current UTC time, without a timezone.
+
+        Returns:
+            float: Seconds to wait.
+        """
+
+        df = self.__get_df_sessions(now)
+        published = [
+            (now.year, r, s) in self.snapshots
+            for r, s in zip(df["round"], df["session"])
+        ]
+
+        live = (df["end"] - LEAD <= now) & (now <= df["end"] + WINDOW_PUBLISH)
+        if (live & ~pd.Series(published, index=df.index, dtype=bool)).any():
+            return self.interval_live
+
+        if ((df["start"] <= now) & (now <= df["until"])).any():
+            return self.interval_near
+
+        upcoming = df.loc[df["end"] - LEAD > now, "end"]
+        if upcoming.empty:
+            return self.interval_idle
+
+        seconds = (upcoming.min() - LEAD - now).total_seconds()
+
+        return min(max(seconds, self.interval_live), self.interval_idle)
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """
+        Poll for results until interrupted, or for max_polls polls.
+
+        Args:
+            max_polls (Optional[int]): The number of polls to run. Defaults to no limit.
+
+        Returns:
+            None
+        """
+
+        n_polls = 0
+        while max_polls is None or n_polls < max_polls:
+            now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+            try:
+                n_rows = self.poll(now)
+                if n_rows:
+                    logger.info(f"Loaded {n_rows} result rows.")
+            except Exception as e:
+                logger.error(f"Error polling results: {e}.")
+
+            n_polls += 1
+            if max_polls is not None and n_polls >= max_polls:
+                break
+
+            interval = self.get_interval(now)
+            logger.debug(f"Next poll in {interval:.0f}s.")
+            time.sleep(interval)
+
+
+def get_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command-line arguments of the watch mode.
+
+    Args:
+        argv (Optional[List[str]]): The arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.watch",
+        description="Poll FastF1 during race weekends and load new or amended results.",
+    )
+    parser.add_argument(
+        "--interval-live",
+        type=float,
+        default=15.0,
+        help="Seconds between polls while results are due.",
+    )
+    parser.add_argument(
+        "--interval-near",
+        type=float,
+        default=120.0,
+        help="Seconds between polls while results may still be amended.",
+    )
+    parser.add_argument(
+        "--interval-idle",
+        type=float,
+        default=3600.0,
+        help="Longest wait between polls away from sessions.",
+    )
+    parser.add_argument(
+        "--max-polls", type=int, help="Stop after this many polls, e.g. 1 for cron."
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Main function for the live race-weekend watch mode.
+
+    This function performs the following steps:
+    1. Retrieves environment variables from the ".env" file.
+    2. Sets environment variables for database connection.
+    3. Disables the FastF1 cache, so amended results aren't served from it.
+    4. Polls the sessions of the current season, loading new or amended results and
+       refreshing the materialized views as they are published.
+
+    Parameters:
+    argv (Optional[List[str]]): The command-line arguments. Defaults to sys.argv.
+
+    Returns:
+    None
+    """
+
+    get_env_var(".env")
+
+    (
+        db_name,
+        db_user,
+        db_password,
+        db_host,
+        db_port,
+        year_start,
+        year_end,
+        schema,
+        pw,
+    ) = set_env_var()
+
+    args = get_args(argv)
+
+    ff1.Cache.set_disabled()
+
+    RaceWeekendWatch(
+        db_user,
+        db_password,
+        db_name,
+        db_host,
+        db_port,
+        schema,
+        args.interval_live,
+        args.interval_near,
+        args.interval_idle,
+    ).run(args.max_polls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import pandas as pd
+import pytest
+
+from src.analysis.conditions import COLS_WEATHER, get_df_laps_conditions
+
+
+COLS_SAMPLE = ["year", "round", "session", "time"]
+
+
+def s(seconds: float) -> pd.Timedelta:
+    return pd.Timedelta(seconds=seconds)
+
+
+def get_df_laps(rows) -> pd.DataFrame:
+    """
+    Build laps from (round, session, start, end) tuples of 2023, in seconds.
+    """
+
+    return pd.DataFrame(
+        [
+            {
+                "year": 2023,
+                "round": round,
+                "session": session,
+                "LapStartTime": s(start) if start is not None else pd.NaT,
+                "Time": s(end),
+            }
+            for round, session, start, end in rows
+        ]
+    )
+
+
+def get_df_weather(rows) -> pd.DataFrame:
+    """
+    Build weather samples from (round, session, time, air_temp) tuples of 2023.
+    """
+
+    return pd.DataFrame(
+        [
+            {
+                "year": 2023,
+                "round": round,
+                "session": session,
+                "time": s(time),
+                "air_temp": air_temp,
+                "track_temp": air_temp + 10,
+                "humidity": 50.0,
+                "rainfall": False,
+                "wind_speed": 1.0,
+            }
+            for round, session, time, air_temp in rows
+        ],
+        columns=COLS_SAMPLE + COLS_WEATHER,
+    )
+
+
+def get_df_race_control(rows) -> pd.DataFrame:
+    """
+    Build race control messages from (session, time, flag, message) tuples of round 1
+    of 2023, with track scope for flags.
+    """
+
+    return pd.DataFrame(
+        [
+            {
+                "year": 2023,
+                "round": 1,
+                "session": session,
+                "seq": seq,
+                "time": s(time),
+                "flag": flag,
+                "scope": "Track" if flag else None,
+                "message": message,
+            }
+            for seq, (session, time, flag, message) in enumerate(rows, start=1)
+        ]
+    )
+
+
+EMPTY_RACE_CONTROL = get_df_race_control([("Race", 0, "GREEN", "GREEN LIGHT")])
+
+
+def test_weather_is_matched_within_the_same_session():
+    df_laps = get_df_laps(
+        [(1, "Race", 100, 190), (1, "Qualifying", 100, 190), (2, "Race", 100, 190)]
+    )
+    df_weather = get_df_weather(
+        [
+            (1, "Race", 60, 20.0),
+            (1, "Race", 120, 21.0),
+            (1, "Qualifying", 90, 30.0),
+            (2, "Race", 30, 40.0),
+        ]
+    )
+
+    df = get_df_laps_conditions(df_laps, df_weather, EMPTY_RACE_CONTROL)
+
+    assert df["air_temp"].tolist() == [20.0, 30.0, 40.0]
+    assert df["track_temp"].tolist() == [30.0, 40.0, 50.0]
+
+
+def test_laps_keep_their_order_and_index():
+    df_laps = get_df_laps([(1, "Race", 200, 290), (1, "Race", 100, 190)])
+    df_laps.index = [10, 11]
+    df_weather = get_df_weather([(1, "Race", 90, 20.0), (1, "Race", 150, 21.0)])
+
+    df = get_df_laps_conditions(df_laps, df_weather, EMPTY_RACE_CONTROL)
+
+    assert df["LapStartTime"].tolist() == [s(200), s(100)]
+    assert df["air_temp"].tolist() == [21.0, 20.0]
+
+
+def test_weather_older_than_the_tolerance_is_not_attached():
+    df_laps = get_df_laps([(1, "Race", 400, 490), (1, "Race", 1000, 1090)])
+    df_weather = get_df_weather([(1, "Race", 300, 20.0)])
+
+    df = get_df_laps_conditions(df_laps, df_weather, EMPTY_RACE_CONTROL)
+
+    assert df["air_temp"].iloc[0] == 20.0
+    assert pd.isna(df["air_temp"].iloc[1])
+
+
+def test_laps_without_an_earlier_row_get_no_conditions():
+    df_laps = get_df_laps([(1, "Race", 10, 100), (1, "Race", None, 200)])
+    df_weather = get_df_weather([(1, "Race", 50, 20.0)])
+    df_race_control = get_df_race_control([("Race", 50, "GREEN", "GREEN LIGHT")])
+
+    df = get_df_laps_conditions(df_laps, df_weather, df_race_control)
+
+    assert df["air_temp"].isna().all()
+    assert df["flag"].isna().all()
+    assert not df["neutralised"].any()
+
+
+@pytest.fixture
+def df_race_control() -> pd.DataFrame:
+    return get_df_race_control(
+        [
+            ("Race", 0, "GREEN", "GREEN LIGHT - PIT EXIT OPEN"),
+            ("Race", 250, None, "SAFETY CAR DEPLOYED"),
+            ("Race", 400, "CLEAR", "TRACK CLEAR"),
+            ("Race", 550, None, "VIRTUAL SAFETY CAR DEPLOYED"),
+            ("Race", 620, "GREEN", "VIRTUAL SAFETY CAR ENDING"),
+            ("Race", 800, "RED", "RED FLAG"),
+            ("Qualifying", 0, "GREEN", "GREEN LIGHT - PIT EXIT OPEN"),
+        ]
+    )
+
+
+def test_laps_under_a_safety_car_or_red_flag_are_neutralised(df_race_control):
+    df_laps = get_df_laps(
+        [
+            (1, "Race", 100, 190),
+            (1, "Race", 300, 390),
+            (1, "Race", 450, 540),
+            (1, "Race", 600, 690),
+            (1, "Race", 850, 940),
+            (1, "Qualifying", 300, 390),
+        ]
+    )
+
+    df = get_df_laps_conditions(df_laps, get_df_weather([]), df_race_control)
+
+    assert df["safety_car"].tolist() == [None, "SC", None, "VSC", None, None]
+    assert df["flag"].tolist() == [
+        "GREEN",
+        "GREEN",
+        "GREEN",
+        "GREEN",
+        "RED",
+        "GREEN",
+    ]
+    assert df["neutralised"].tolist() == [False, True, False, True, True, False]
+
+
+def test_laps_during_which_a_neutralisation_began_are_neutralised(df_race_control):
+    df_laps = get_df_laps([(1, "Race", 200, 290), (1, "Race", 500, 560)])
+
+    df = get_df_laps_conditions(df_laps, get_df_weather([]), df_race_control)
+
+    assert df["safety_car"].isna().all()
+    assert df["neutralised"].tolist() == [True, True]
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from src.processing.data_messages import DataMessages
+
+
+T0 = pd.Timestamp("2023-03-05 15:00")
+
+
+@pytest.fixture
+def data_session() -> SimpleNamespace:
+    return SimpleNamespace(
+        t0_date=T0,
+        race_control_messages=pd.DataFrame(
+            {
+                "Time": T0 + pd.to_timedelta([300, 60, 60, 120], unit="s"),
+                "Lap": [5.0, 1.0, 1.0, None],
+                "Category": ["SafetyCar", "Flag", "Flag", "Other"],
+                "Flag": [None, "GREEN", "YELLOW", None],
+                "Scope": [None, "Track", "Sector", None],
+                "Sector": [None, None, 4.0, None],
+                "RacingNumber": [None, None, "81", None],
+                "Status": ["DEPLOYED", None, None, None],
+                "Message": ["SAFETY CAR DEPLOYED", "GREEN LIGHT", "YELLOW", None],
+            }
+        ),
+    )
+
+
+@pytest.mark.parametrize("session, name", [("Q", "Qualifying"), ("R", "Race")])
+def test_session_is_named_like_laps(data_session, session, name):
+    df = DataMessages().get_df_messages(data_session, 2023, 1, session)
+
+    assert set(df["session"]) == {name}
+
+
+def test_messages_are_ordered_by_session_time(data_session):
+    df = DataMessages().get_df_messages(data_session, 2023, 1, "R")
+
+    assert df["seq"].tolist() == [1, 2, 3]
+    assert df["time"].tolist() == pd.to_timedelta([60, 60, 300], unit="s").tolist()
+    assert df["message"].tolist() == ["GREEN LIGHT", "YELLOW", "SAFETY CAR DEPLOYED"]
+
+
+def test_missing_fields_are_none(data_session):
+    df = DataMessages().get_df_messages(data_session, 2023, 1, "R")
+
+    assert df["lap"].tolist() == [1, 1, 5]
+    assert df["sector"].tolist() == [None, 4, None]
+    assert df["racing_number"].tolist() == [None, "81", None]
+
+
+def test_session_without_start_time_raises(data_session):
+    data_session.t0_date = None
+
+    with pytest.raises(ValueError, match="start time"):
+        DataMessages().get_df_messages(data_session, 2023, 1, "R")
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from src.processing.data_normalized import DataNormalized
+
+
+def get_df_sessions() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "year": 2023,
+            "round": 1,
+            "id_driver": ["piastri", "norris", "hamilton", "russell", "sargeant"],
+            "name_driver_last": [
+                "Piastri",
+                "Norris",
+                "Hamilton",
+                "Russell",
+                "Sargeant",
+            ],
+            "name_driver_first": ["Oscar", "Lando", "Lewis", "George", "Logan"],
+            "name_team": ["McLaren", "McLaren", "Mercedes", "Mercedes", "Williams"],
+            "session": ["Race", "Race", "Race", "Q3", "Q1"],
+            "position": ["1", "2.0", "R", "DNQ", "X"],
+            "time": pd.to_timedelta([5400, 5401, np.nan, 90, np.nan], unit="s"),
+        }
+    )
+
+
+def test_results_split_positions_and_statuses():
+    df = DataNormalized().get_df_results(get_df_sessions())
+
+    assert df["position"].tolist() == [1, 2, None, None, None]
+    assert df["status"].tolist() == [
+        "classified",
+        "classified",
+        "retired",
+        "dnq",
+        "not_classified",
+    ]
+    assert df["key_session"].tolist() == [4, 4, 4, 3, 1]
+
+
+def test_results_share_keys_with_the_dimensions():
+    instance = DataNormalized()
+    df_sessions = get_df_sessions()
+    df_drivers = instance.get_df_drivers(df_sessions)
+    df_teams = instance.get_df_teams(df_sessions)
+
+    df = instance.get_df_results(df_sessions)
+
+    drivers = df_drivers.set_index("id_driver")["key_driver"]
+    teams = df_teams.drop_duplicates("name_team").set_index("name_team")["key_team"]
+    assert df["key_driver"].tolist() == drivers[df_sessions["id_driver"]].tolist()
+    assert df["key_team"].tolist() == teams[df_sessions["name_team"]].tolist()
+
+
+def test_keys_are_reused_across_instances_sharing_them():
+    keys = {}
+    df_sessions = get_df_sessions()
+    df_first = DataNormalized(keys).get_df_drivers(df_sessions.iloc[:3])
+
+    df_second = DataNormalized(keys).get_df_drivers(df_sessions.iloc[2:])
+
+    assert df_second.loc[0, "key_driver"] == df_first.loc[2, "key_driver"]
+    assert set(df_second["key_driver"]).isdisjoint(df_first["key_driver"][:2])
+
+
+def test_named_replaces_keys_with_natural_keys():
+    instance = DataNormalized()
+    df_sessions = get_df_sessions()
+    df_drivers = instance.get_df_drivers(df_sessions)
+    df_teams = instance.get_df_teams(df_sessions)
+    df_results = instance.get_df_results(df_sessions)
+
+    df = instance.get_df_named(df_results, df_drivers, df_teams)
+
+    assert df["id_driver"].tolist() == df_sessions["id_driver"].tolist()
+    assert df["name_team"].tolist() == df_sessions["name_team"].tolist()
+    assert df["session"].tolist() == df_sessions["session"].tolist()
+
+
+def test_named_teams_keep_a_single_name_column():
+    instance = DataNormalized()
+    df_sessions = get_df_sessions()
+    df_drivers = instance.get_df_drivers(df_sessions)
+    df_teams = instance.get_df_teams(df_sessions)
+
+    df = instance.get_df_named(df_teams, df_drivers, df_teams)
+
+    assert list(df.columns) == ["name_team", "year", "id_driver"]
+    assert df["name_team"].tolist() == df_sessions["name_team"].tolist()
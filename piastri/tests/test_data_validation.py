@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing.data_validation import DataValidation
+
+
+def get_df_results(**overrides) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "year": [2024, 2024, 2024],
+            "round": [1, 1, 1],
+            "key_driver": [1, 2, 3],
+            "key_team": [1, 1, 2],
+            "key_session": [4, 4, 4],
+            "position": [1, 2, np.nan],
+            "status": ["classified", "classified", "retired"],
+            "time": pd.to_timedelta([5400, 5405, np.nan], unit="s"),
+        }
+    )
+
+    return df.assign(**overrides)
+
+
+def test_valid_rows_pass_untouched():
+    instance = DataValidation()
+
+    df = instance.get_df_valid(get_df_results(), "results")
+
+    pd.testing.assert_frame_equal(df, get_df_results())
+    assert instance.get_report() == {}
+
+
+def test_null_and_domain_failures_are_quarantined_with_reasons():
+    instance = DataValidation()
+    df_results = get_df_results(
+        key_team=[1, None, 2], position=[1, 2, 120], status=["classified"] * 3
+    )
+    df_results.loc[0, "status"] = "crashed"
+
+    df = instance.get_df_valid(df_results, "results")
+
+    assert df.empty
+    reasons = instance.df_quarantine["results"]["reason"].tolist()
+    assert reasons == ["domain status", "null key_team", "range position"]
+    assert instance.get_report() == {
+        "results": {"domain status": 1, "null key_team": 1, "range position": 1}
+    }
+
+
+def test_missing_optional_values_are_not_domain_failures():
+    df = DataValidation().get_df_valid(get_df_results(), "results")
+
+    assert df["position"].isna().sum() == 1
+
+
+def test_exact_duplicates_are_dropped():
+    df_results = get_df_results()
+
+    df = DataValidation().get_df_valid(
+        pd.concat([df_results, df_results.iloc[[0]]]), "results"
+    )
+
+    assert len(df) == 3
+
+
+def test_conflicting_rows_sharing_a_key_are_all_quarantined():
+    instance = DataValidation()
+    df_results = get_df_results()
+    df_conflict = df_results.iloc[[0]].assign(position=3.0)
+
+    df = instance.get_df_valid(pd.concat([df_results, df_conflict]), "results")
+
+    assert df["key_driver"].tolist() == [2, 3]
+    assert instance.get_report() == {"results": {"duplicate key": 2}}
+
+
+def test_missing_required_column_raises():
+    with pytest.raises(ValueError, match="status"):
+        DataValidation().get_df_valid(
+            get_df_results().drop(columns="status"), "results"
+        )
+
+
+def test_every_table_keeps_its_own_quarantine():
+    instance = DataValidation()
+    df_drivers = pd.DataFrame(
+        {
+            "key_driver": [1, 1],
+            "id_driver": ["piastri", "norris"],
+            "name_driver_last": ["Piastri", "Norris"],
+            "name_driver_first": ["Oscar", "Lando"],
+        }
+    )
+
+    instance.get_df_valid(df_drivers, "drivers")
+    instance.get_df_valid(get_df_results(), "results")
+
+    assert set(instance.df_quarantine) == {"drivers", "results"}
+    assert instance.get_report() == {"drivers": {"duplicate key": 2}}
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing.data_weather import DataWeather
+
+
+@pytest.fixture
+def data_session() -> SimpleNamespace:
+    return SimpleNamespace(
+        weather_data=pd.DataFrame(
+            {
+                "Time": pd.to_timedelta([60, 120, 120, None], unit="s"),
+                "AirTemp": [20.5, 21.0, 21.0, 22.0],
+                "TrackTemp": [30.0, 31.0, 31.0, 32.0],
+                "Humidity": [50.0, 51.0, 51.0, 52.0],
+                "Pressure": [1010.0, 1010.0, 1010.0, 1010.0],
+                "Rainfall": [False, None, None, True],
+                "WindSpeed": [1.0, 1.5, 1.5, 2.0],
+                "WindDirection": [90, None, None, 180],
+            }
+        )
+    )
+
+
+@pytest.mark.parametrize("session, name", [("Q", "Qualifying"), ("R", "Race")])
+def test_session_is_named_like_laps(data_session, session, name):
+    df = DataWeather().get_df_weather(data_session, 2023, 1, session)
+
+    assert set(df["session"]) == {name}
+
+
+def test_samples_are_keyed_by_session_time(data_session):
+    df = DataWeather().get_df_weather(data_session, 2023, 1, "R")
+
+    assert df[["year", "round"]].drop_duplicates().values.tolist() == [[2023, 1]]
+    assert df["time"].tolist() == pd.to_timedelta([60, 120], unit="s").tolist()
+    assert df["air_temp"].dtype == np.float32
+
+
+def test_missing_samples_stay_missing(data_session):
+    df = DataWeather().get_df_weather(data_session, 2023, 1, "R")
+
+    assert df["rainfall"].dtype == "boolean"
+    assert df["rainfall"].isna().tolist() == [False, True]
+    assert df["wind_direction"].isna().tolist() == [False, True]
+
+
+def test_session_without_weather_raises():
+    with pytest.raises(ValueError, match="weather"):
+        DataWeather().get_df_weather(SimpleNamespace(weather_data=None), 2023, 1, "R")
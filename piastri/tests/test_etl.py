@@ -0,0 +1,311 @@
+from typing import Any, Dict, List
+
+import pandas as pd
+import pytest
+
+import functions.functions
+import src.etl
+from benchmark.fastf1_offline import FastF1Offline
+from src.etl import (
+    extract_transform_tables,
+    get_args,
+    log_plan,
+    main,
+    resolve_keys_postgres,
+    run_pipeline,
+    SESSIONS,
+    TABLES,
+)
+
+
+@pytest.fixture
+def dict_df() -> Dict[str, pd.DataFrame]:
+    df_sessions = pd.DataFrame(
+        {
+            "year": 2023,
+            "round": 1,
+            "id_driver": ["piastri", "norris", "hamilton"],
+            "name_driver_last": ["Piastri", "Norris", "Hamilton"],
+            "name_driver_first": ["Oscar", "Lando", "Lewis"],
+            "name_team": ["McLaren", "McLaren", "Mercedes"],
+            "session": "Race",
+            "position": ["1", "2", "3"],
+            "time": pd.to_timedelta([5400, 5401, 5402], unit="s"),
+        }
+    )
+    df_event = pd.DataFrame(
+        {
+            "year": [2023],
+            "round": [1],
+            "name_circuit": ["Albert Park"],
+            "country_circuit": ["Australia"],
+        }
+    )
+
+    return dict(zip(TABLES, extract_transform_tables(df_sessions, None, df_event)))
+
+
+@pytest.fixture
+def writes(monkeypatch) -> List[Dict[str, Any]]:
+    """
+    Stand in for the database: existing rows keep their keys, and new rows get the
+    next keys from 100, by natural key.
+    """
+
+    existing = {"drivers": {"hamilton": 7}, "team_names": {}, "circuits": {}}
+    writes = []
+
+    def write_keys_postgres(u, p, d, h, po, df, schema, table, natural, key, upsert):
+        writes.append({"table": table, "df": df, "upsert": upsert})
+        keys = existing[table]
+        for value in sorted(set(df[natural]) - set(keys)):
+            keys[value] = 100 + len(keys)
+        return {value: keys[value] for value in df[natural]}
+
+    monkeypatch.setattr(src.etl, "write_keys_postgres", write_keys_postgres)
+
+    return writes
+
+
+def resolve(dict_df, **kwargs) -> Dict[str, pd.DataFrame]:
+    return resolve_keys_postgres("u", "p", "d", "h", "5432", dict_df, "s", **kwargs)
+
+
+def test_provisional_keys_are_replaced_with_database_keys(dict_df, writes):
+    tables = resolve(dict_df)
+
+    drivers = tables["df_drivers"].set_index("id_driver")["key_driver"]
+    assert drivers["hamilton"] == 7
+    assert sorted(drivers[["norris", "piastri"]]) == [101, 102]
+    df_results = tables["df_results"].merge(
+        tables["df_drivers"], on="key_driver", how="left"
+    )
+    assert df_results["id_driver"].tolist() == ["piastri", "norris", "hamilton"]
+    assert tables["df_events"]["key_circuit"].tolist() == [100]
+    assert {w["table"] for w in writes} == {"drivers", "team_names", "circuits"}
+
+
+def test_teams_are_loaded_without_their_names(dict_df, writes):
+    tables = resolve(dict_df)
+
+    assert list(tables["df_teams"].columns) == ["key_team", "year", "key_driver"]
+    assert list(dict_df["df_teams"].columns) == [
+        "key_team",
+        "name_team",
+        "year",
+        "key_driver",
+    ]
+    team_names = next(w["df"] for w in writes if w["table"] == "team_names")
+    assert sorted(team_names["name_team"]) == ["McLaren", "McLaren", "Mercedes"]
+
+
+def test_only_dimensions_of_loaded_tables_are_resolved(dict_df, writes):
+    resolve(dict_df, list_tables=["events"])
+
+    assert [w["table"] for w in writes] == ["circuits"]
+    assert not writes[0]["upsert"]
+
+
+def test_upsert_only_overwrites_loaded_dimensions(dict_df, writes):
+    resolve(dict_df, list_tables=["drivers", "results"], upsert=True)
+
+    upserts = {w["table"]: w["upsert"] for w in writes}
+    assert upserts == {"drivers": True, "team_names": False}
+
+
+def test_rows_referencing_a_missing_dimension_row_are_dropped(dict_df, writes):
+    dict_df["df_drivers"] = dict_df["df_drivers"].iloc[:2]
+
+    tables = resolve(dict_df)
+
+    assert len(tables["df_results"]) == 2
+    assert len(tables["df_teams"]) == 2
+
+
+@pytest.fixture
+def loads(monkeypatch) -> List[Dict[str, Any]]:
+    """
+    Extract offline sessions and record the tables of each load.
+    """
+
+    loads = []
+
+    def load_postgres(u, p, d, h, po, *args, **kwargs):
+        loads.append(dict(zip(TABLES, args)))
+
+    monkeypatch.setattr(
+        functions.functions, "ff1", FastF1Offline(n_rounds=3, n_teams=2, n_rookies=0)
+    )
+    monkeypatch.setattr(src.etl, "load_postgres", load_postgres)
+    monkeypatch.setattr(src.etl, "SLEEP_REQUEST", 0)
+
+    return loads
+
+
+@pytest.fixture
+def pipeline(monkeypatch, loads) -> List[Dict[str, Any]]:
+    """
+    Record the loads of offline sessions in which a driver is renamed from round 2 on.
+    """
+
+    def get_data_session(year, round, session):
+        data_session = functions.functions.get_data_session(year, round, session)
+        if round >= 2:
+            data_session.results = data_session.results.replace(
+                {"LastName": {"Driver_2023_0": "Renamed"}}
+            )
+        return data_session
+
+    monkeypatch.setattr(src.etl, "get_data_session", get_data_session)
+
+    return loads
+
+
+def run(**kwargs):
+    return run_pipeline(
+        [2023], [1, 2, 3], SESSIONS, ["drivers", "results"], *"updhps", **kwargs
+    )
+
+
+def test_pipeline_loads_every_table_round_by_round(pipeline):
+    tables, _, _ = run()
+
+    assert len(pipeline) == 3
+    assert all(set(load) == set(TABLES) for load in pipeline)
+    rounds = sorted(load["df_results"]["round"].unique()[0] for load in pipeline)
+    assert rounds == [1, 2, 3]
+    assert len(tables["df_results"]) == sum(
+        len(load["df_results"]) for load in pipeline
+    )
+
+
+def test_pipeline_reports_rows_conflicting_between_rounds(pipeline):
+    tables, quarantine, _ = run()
+
+    drivers = tables["df_drivers"]
+    assert drivers["id_driver"].is_unique
+    assert (drivers["id_driver"] == "driver_2023_0").sum() == 1
+    assert set(quarantine["drivers"]["name_driver_last"]) == {
+        "Driver_2023_0",
+        "Renamed",
+    }
+
+
+def test_pipeline_without_load_writes_nothing(pipeline):
+    run(load=False)
+
+    assert pipeline == []
+
+
+def test_args_default_to_every_stage_session_and_table():
+    args = get_args(["--year-start", "2023"])
+
+    assert args.year_start == 2023
+    assert args.year_end is None
+    assert args.stages == ["extract", "transform", "load"]
+    assert args.sessions == SESSIONS
+    assert args.tables is None
+    assert not args.dry_run and not args.pipeline
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--pipeline", "--stages", "load"],
+        ["--tables", "laps"],
+        ["--sessions", "FP1"],
+        ["--year-start", "last"],
+    ],
+)
+def test_invalid_args_are_rejected(argv):
+    with pytest.raises(SystemExit):
+        get_args(argv)
+
+
+def test_plan_lists_the_rounds_from_the_schedule(monkeypatch, caplog):
+    monkeypatch.setattr(src.etl, "get_rounds", lambda year: [1, 2, 3])
+    args = get_args(["--rounds", "2", "3", "9", "--sessions", "Q"])
+
+    with caplog.at_level("INFO", logger="etl"):
+        log_plan(args, [2022, 2023], ["results"])
+
+    assert "Extract Q for 2022, rounds: 2, 3." in caplog.messages
+    assert "Extract Q for 2023, rounds: 2, 3." in caplog.messages
+    assert "Extract 4 sessions in total." in caplog.messages
+    assert "Load (insert new rows) tables: results." in caplog.messages
+
+
+def test_plan_without_the_schedule_lists_the_requested_rounds(monkeypatch, caplog):
+    def get_rounds(year):
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(src.etl, "get_rounds", get_rounds)
+
+    with caplog.at_level("INFO", logger="etl"):
+        log_plan(get_args([]), [2023], ["results"])
+        log_plan(get_args(["--rounds", "5"]), [2023], ["results"])
+
+    assert any("offline" in message for message in caplog.messages)
+    assert "Extract Q/R for 2023, rounds: all." in caplog.messages
+    assert "Extract Q/R for 2023, rounds: 5." in caplog.messages
+    assert "Extract 2 sessions in total." in caplog.messages
+
+
+def test_plan_of_later_stages_reads_staging(caplog):
+    args = get_args(["--stages", "load", "--upsert", "--staging-dir", "s"])
+
+    with caplog.at_level("INFO", logger="etl"):
+        log_plan(args, [2023], ["drivers"])
+
+    assert caplog.messages[1:] == [
+        "Read transformed tables from s.",
+        "Load (upsert) tables: drivers.",
+    ]
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path) -> List[str]:
+    """
+    Run from a directory whose .env has the database settings but no years.
+    """
+
+    settings = {
+        "POSTGRES_DB": "d",
+        "POSTGRES_USER": "u",
+        "POSTGRES_PASSWORD": "p",
+        "POSTGRES_HOST": "h",
+        "POSTGRES_PORT": "5432",
+        "SCHEMA_NAME": "s",
+        "EMAIL_PW": "pw",
+    }
+    for var, value in settings.items():
+        monkeypatch.setenv(var, value)
+    monkeypatch.delenv("YEAR_START", raising=False)
+    monkeypatch.delenv("YEAR_END", raising=False)
+    (tmp_path / ".env").write_text(
+        "\n".join(f"{var}={value}" for var, value in settings.items())
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(src.etl, "email_missing_data", lambda *args: None)
+
+    return ["--year-start", "2023", "--year-end", "2023", "--rounds", "1", "2"]
+
+
+def test_years_from_args_need_no_year_variables(loads, env):
+    main(env + ["--tables", "drivers"])
+
+    assert len(loads) == 1
+    assert set(loads[0]["df_drivers"]["id_driver"]) == {
+        f"driver_2023_{i}" for i in range(4)
+    }
+
+
+def test_staged_stages_load_the_tables_of_a_single_run(loads, env):
+    for stage in ["extract", "transform", "load"]:
+        main(env + ["--stages", stage, "--staging-dir", "staged"])
+    main(env + ["--staging-dir", "single"])
+
+    assert len(loads) == 2
+    for name in TABLES:
+        assert not loads[0][name].empty
+        pd.testing.assert_frame_equal(loads[0][name], loads[1][name])
@@ -0,0 +1,98 @@
+import pyarrow as pa
+import pytest
+
+from functions.readers import get_query_select, get_types_arrow
+
+
+TYPES = {
+    "year": "smallint",
+    "round": "smallint",
+    "key_driver": "smallint",
+    "status": "result_status",
+    "time": "interval",
+    "air_temp": "real",
+    "rainfall": "boolean",
+    "message": "text",
+}
+
+
+def test_query_selects_every_column_by_default():
+    query, params = get_query_select(TYPES, "sessions", "results")
+
+    assert query == (
+        'SELECT "year", "round", "key_driver", "status", '
+        'EXTRACT(EPOCH FROM "time") AS "time", "air_temp", "rainfall", "message" '
+        'FROM "sessions"."results"'
+    )
+    assert params == {}
+
+
+def test_query_projects_and_filters_on_year_and_round():
+    query, params = get_query_select(
+        TYPES, "sessions", "results", ["key_driver", "time"], [2023], ["5", 6]
+    )
+
+    assert query == (
+        'SELECT "key_driver", EXTRACT(EPOCH FROM "time") AS "time" '
+        'FROM "sessions"."results" '
+        'WHERE "year" = ANY(%(years)s) AND "round" = ANY(%(rounds)s)'
+    )
+    assert params == {"years": [2023], "rounds": [5, 6]}
+
+
+def test_query_filters_on_columns_not_selected():
+    query, params = get_query_select(
+        TYPES, "sessions", "results", ["message"], rounds=[1]
+    )
+
+    assert query.endswith('WHERE "round" = ANY(%(rounds)s)')
+    assert params == {"rounds": [1]}
+
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(ValueError, match="lap"):
+        get_query_select(TYPES, "sessions", "results", ["year", "lap"])
+
+
+def test_filter_on_a_missing_column_is_rejected():
+    types = {"key_driver": "smallint", "id_driver": "text"}
+
+    with pytest.raises(ValueError, match="year"):
+        get_query_select(types, "sessions", "drivers", years=[2023])
+
+
+def test_types_map_to_arrow_with_strings_for_others():
+    assert get_types_arrow(TYPES) == {
+        "year": pa.int16(),
+        "round": pa.int16(),
+        "key_driver": pa.int16(),
+        "status": pa.string(),
+        "time": pa.float64(),
+        "air_temp": pa.float32(),
+        "rainfall": pa.bool_(),
+        "message": pa.string(),
+    }
+
+
+def test_types_cover_only_selected_columns():
+    assert get_types_arrow(TYPES, ["time", "year"]) == {
+        "time": pa.float64(),
+        "year": pa.int16(),
+    }
+
+
+@pytest.mark.parametrize(
+    "type_postgres, type_arrow",
+    [
+        ("integer", pa.int32()),
+        ("bigint", pa.int64()),
+        ("double precision", pa.float64()),
+        ("numeric", pa.float64()),
+        ("date", pa.date32()),
+        ("timestamp without time zone", pa.timestamp("us")),
+        ("timestamp with time zone", pa.timestamp("us", tz="UTC")),
+        ("character varying", pa.string()),
+    ],
+)
+def test_postgres_types_map_to_arrow(type_postgres, type_arrow):
+    assert get_types_arrow({"col": type_postgres}) == {"col": type_arrow}
@@ -0,0 +1,170 @@
+from typing import Dict, List
+
+import pandas as pd
+import pytest
+
+from src.analysis.rookies import RookieAnalysis
+
+
+KEYS = ["year", "id_rookie", "id_teammate", "session_type"]
+
+
+def get_season(year: int, teams: Dict[str, List[str]], offsets: Dict[str, float]):
+    """
+    Build a three-round season in which each driver's times are 90 s plus their
+    offset in every session, and positions follow the times.
+    """
+
+    drivers = sorted(offsets, key=offsets.get)
+    team_of = {d: team for team, members in teams.items() for d in members}
+    rows = [
+        {
+            "year": year,
+            "round": round,
+            "id_driver": driver,
+            "name_team": team_of[driver],
+            "session": session,
+            "position": str(drivers.index(driver) + 1),
+            "time": pd.Timedelta(seconds=90 + offsets[driver]),
+        }
+        for round in (1, 2, 3)
+        for session in ["Q1", "Race"]
+        for driver in drivers
+    ]
+    df_teams = pd.DataFrame(
+        [
+            {"name_team": team, "year": year, "id_driver": driver}
+            for driver, team in team_of.items()
+        ]
+    )
+
+    return pd.DataFrame(rows), df_teams
+
+
+SEASONS = {
+    2021: get_season(
+        2021,
+        {"A": ["ham", "bot"], "B": ["ver", "per"]},
+        {"ham": 0.0, "bot": 0.3, "ver": 0.1, "per": 0.6},
+    ),
+    2022: get_season(
+        2022,
+        {"A": ["ham", "rus"], "B": ["ver", "per"]},
+        {"ham": 0.0, "rus": 0.2, "ver": 0.1, "per": 0.6},
+    ),
+    2023: get_season(
+        2023,
+        {"A": ["ham", "rus"], "B": ["ver", "pia"]},
+        {"ham": 0.1, "rus": 0.2, "ver": 0.0, "pia": 0.9},
+    ),
+}
+
+
+def get_df_summary(instance: RookieAnalysis) -> pd.DataFrame:
+    return instance.get_df_summary().sort_values(KEYS).reset_index(drop=True)
+
+
+def test_rookies_are_compared_with_their_teammates():
+    instance = RookieAnalysis()
+    instance.update(
+        pd.concat([SEASONS[y][0] for y in (2021, 2022)]),
+        pd.concat([SEASONS[y][1] for y in (2021, 2022)]),
+    )
+
+    df = get_df_summary(instance)
+
+    assert df[KEYS].values.tolist() == [
+        [2022, "rus", "ham", "quali"],
+        [2022, "rus", "ham", "race"],
+    ]
+    assert (df["n_rounds"] == 3).all()
+    assert (df["share_ahead"] == 0).all()
+    assert df["mean_gap"].tolist() == pytest.approx([0.2, 0.2])
+    assert df["std_gap"].tolist() == pytest.approx([0.0, 0.0], abs=1e-6)
+
+
+def test_incremental_updates_match_a_full_run():
+    instance = RookieAnalysis()
+    for year in (2021, 2022, 2023):
+        df_results, df_teams = SEASONS[year]
+        for round in (1, 2, 3):
+            instance.update(df_results[df_results["round"] == round], df_teams)
+
+    instance_full = RookieAnalysis()
+    instance_full.update(
+        pd.concat([s[0] for s in SEASONS.values()]),
+        pd.concat([s[1] for s in SEASONS.values()]),
+    )
+
+    pd.testing.assert_frame_equal(
+        get_df_summary(instance), get_df_summary(instance_full), check_dtype=False
+    )
+
+
+def test_rounds_already_processed_are_skipped():
+    instance = RookieAnalysis()
+    df_results, df_teams = SEASONS[2021]
+    instance.update(df_results, df_teams)
+    instance.update(*SEASONS[2022])
+
+    df_gaps = instance.update(*SEASONS[2022])
+
+    assert df_gaps.empty
+    assert get_df_summary(instance)["n_rounds"].tolist() == [3, 3]
+
+
+def test_backfilled_season_rebuilds_changed_rookie_years():
+    instance = RookieAnalysis()
+    instance.update(*SEASONS[2022])
+    instance.update(*SEASONS[2023])
+    # Without 2021, every 2022 driver looks established, so only pia is a rookie.
+    assert set(get_df_summary(instance)["id_rookie"]) == {"pia"}
+
+    instance.update(*SEASONS[2021])
+
+    df = get_df_summary(instance)
+    assert df[["year", "id_rookie"]].drop_duplicates().values.tolist() == [
+        [2022, "rus"],
+        [2023, "pia"],
+    ]
+    assert df["n_rounds"].tolist() == [3, 3, 3, 3]
+
+
+def test_replaced_rounds_are_reanalysed():
+    instance = RookieAnalysis()
+    instance.update(*SEASONS[2021])
+    instance.update(*SEASONS[2022])
+    df_results, df_teams = SEASONS[2022]
+    df_results = df_results.assign(
+        time=df_results["time"].where(
+            df_results["id_driver"] != "rus", pd.Timedelta(seconds=90.5)
+        )
+    )
+
+    instance.update(df_results, df_teams, replace=True)
+
+    df = get_df_summary(instance)
+    assert df["n_rounds"].tolist() == [3, 3]
+    assert df["mean_gap"].tolist() == pytest.approx([0.5, 0.5])
+
+
+def test_state_round_trips_through_staging(tmp_path):
+    instance = RookieAnalysis()
+    instance.update(*SEASONS[2021])
+    instance.save_state(str(tmp_path))
+
+    instance_loaded = RookieAnalysis()
+    instance_loaded.load_state(str(tmp_path))
+    instance_loaded.update(*SEASONS[2022])
+    instance.update(*SEASONS[2022])
+
+    pd.testing.assert_frame_equal(
+        get_df_summary(instance_loaded), get_df_summary(instance), check_dtype=False
+    )
+
+
+def test_missing_state_leaves_the_instance_empty(tmp_path):
+    instance = RookieAnalysis()
+    instance.load_state(str(tmp_path))
+
+    assert instance.df_aggregates is None
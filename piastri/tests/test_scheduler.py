@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+
+from functions.scheduler import Pipeline, Stage
+
+
+def test_tasks_pass_through_every_stage():
+    pipeline = Pipeline(
+        [
+            Stage("extract", lambda key, payload: payload + 1),
+            Stage("transform", lambda key, payload: payload * 10, workers=2),
+            Stage("load", lambda key, payload: (key, payload)),
+        ]
+    )
+
+    results = pipeline.run([(k, k) for k in range(8)])
+
+    assert results == {k: (k, (k + 1) * 10) for k in range(8)}
+    assert not pipeline.failed
+    assert set(pipeline.seconds) == {"extract", "transform", "load"}
+
+
+def test_stages_overlap_across_tasks():
+    loaded = threading.Event()
+
+    def extract(key, payload):
+        # The second extract only finishes once the first task has been loaded.
+        if key == 2:
+            assert loaded.wait(timeout=5)
+        return payload
+
+    def load(key, payload):
+        loaded.set()
+        return payload
+
+    results = Pipeline([Stage("extract", extract), Stage("load", load)]).run(
+        [(1, "a"), (2, "b")]
+    )
+
+    assert results == {1: "a", 2: "b"}
+
+
+def test_failed_attempts_are_retried():
+    attempts = {}
+
+    def flaky(key, payload):
+        attempts[key] = attempts.get(key, 0) + 1
+        if attempts[key] < 3:
+            raise ConnectionError("timed out")
+        return payload
+
+    pipeline = Pipeline([Stage("extract", flaky, retries=2, backoff=0.0)])
+
+    assert pipeline.run([("a", 1)]) == {"a": 1}
+    assert attempts == {"a": 3}
+    assert not pipeline.failed
+
+
+def test_task_failing_every_attempt_is_recorded_and_skipped():
+    def extract(key, payload):
+        if key == "bad":
+            raise ValueError("no data")
+        return payload
+
+    calls = []
+
+    def load(key, payload):
+        calls.append(key)
+        return payload
+
+    pipeline = Pipeline(
+        [Stage("extract", extract, retries=1, backoff=0.0), Stage("load", load)]
+    )
+
+    results = pipeline.run([("good", 1), ("bad", 2), ("other", 3)])
+
+    assert results == {"good": 1, "other": 3}
+    assert sorted(calls) == ["good", "other"]
+    stage, error = pipeline.failed["bad"]
+    assert stage == "extract" and isinstance(error, ValueError)
+
+
+def test_none_outputs_are_dropped():
+    pipeline = Pipeline(
+        [
+            Stage("extract", lambda key, payload: None if key % 2 else payload),
+            Stage("load", lambda key, payload: payload),
+        ]
+    )
+
+    assert pipeline.run([(k, k) for k in range(6)]) == {0: 0, 2: 2, 4: 4}
+    assert not pipeline.failed
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_more_tasks_than_queue_slots_complete(workers):
+    pipeline = Pipeline(
+        [
+            Stage("extract", lambda key, payload: payload, workers=workers),
+            Stage("load", lambda key, payload: payload, workers=workers),
+        ],
+        maxsize=1,
+    )
+
+    assert len(pipeline.run([(k, k) for k in range(50)])) == 50
+
+
+def test_pipeline_can_run_again():
+    pipeline = Pipeline([Stage("extract", lambda key, payload: payload)])
+    pipeline.run([(1, 1)])
+
+    assert pipeline.run([(2, 2)]) == {2: 2}
@@ -0,0 +1,229 @@
+import json
+from typing import Any, Dict, List
+
+import pandas as pd
+import pytest
+
+from src.service import CacheLRU, QueryService
+
+
+class ResultFake:
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+
+    def mappings(self) -> "ResultFake":
+        return self
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self.rows
+
+    def keys(self) -> List[str]:
+        return list(self.rows[0]) if self.rows else []
+
+    def fetchall(self) -> List[tuple]:
+        return [tuple(row.values()) for row in self.rows]
+
+
+class EngineFake:
+    """
+    Stand in for a SQLAlchemy engine, answering each named query of the service with
+    fixed rows and recording the names and parameters of the queries run.
+    """
+
+    def __init__(self, rows: Dict[str, List[Dict[str, Any]]]):
+        self.rows = rows
+        self.queries = {}
+        self.executed = []
+
+    def connect(self) -> "EngineFake":
+        return self
+
+    def __enter__(self) -> "EngineFake":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def execute(self, query, params=None) -> ResultFake:
+        name = self.queries[str(query)]
+        self.executed.append((name, params))
+        return ResultFake(self.rows.get(name, []))
+
+
+def get_rows_rookies() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Two seasons of one team, in which "pia" replaces "ric" in 2023 and is 0.5 s
+    slower than "nor" in every session.
+    """
+
+    teams = {2022: ["nor", "ric"], 2023: ["nor", "pia"]}
+    offsets = {"nor": 0.0, "ric": 0.3, "pia": 0.5}
+    results = [
+        {
+            "year": year,
+            "round": round,
+            "id_driver": driver,
+            "name_team": "McLaren",
+            "session": session,
+            "position": i + 1,
+            "time": pd.Timedelta(seconds=90 + offsets[driver]),
+        }
+        for year, drivers in teams.items()
+        for round in (1, 2)
+        for session in ["Q1", "Race"]
+        for i, driver in enumerate(drivers)
+    ]
+    df_teams = [
+        {"name_team": "McLaren", "year": year, "id_driver": driver}
+        for year, drivers in teams.items()
+        for driver in drivers
+    ]
+
+    return {"rookie_results": results, "rookie_teams": df_teams}
+
+
+@pytest.fixture
+def engine() -> EngineFake:
+    return EngineFake(
+        {
+            "version": [{"version": 1}],
+            "driver_results": [{"round": 1, "session": "Race", "position": 2}],
+            **get_rows_rookies(),
+        }
+    )
+
+
+@pytest.fixture
+def service(engine) -> QueryService:
+    service = QueryService(engine, "s", interval_version=3600.0)
+    engine.queries = {str(query): name for name, query in service.queries.items()}
+    service.check_version(force=True)
+    engine.executed.clear()
+
+    return service
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CacheLRU(maxsize=2)
+    cache.clear(version=1)
+    cache.put("a", b"a", 1)
+    cache.put("b", b"b", 1)
+    cache.get("a")
+    cache.put("c", b"c", 1)
+
+    assert cache.get("a") == b"a"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"c"
+
+
+def test_cache_drops_bodies_of_another_version():
+    cache = CacheLRU()
+    cache.clear(version=2)
+    cache.put("a", b"stale", 1)
+    cache.put("b", b"fresh", 2)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == b"fresh"
+
+    cache.clear(version=3)
+    assert cache.get("b") is None
+
+
+def test_rookies_are_summarized_with_rookie_analysis(service):
+    rookies = {row["session_type"]: row for row in service.get_rookies()}
+
+    assert set(rookies) == {"quali", "race"}
+    assert rookies["quali"]["id_rookie"] == "pia"
+    assert rookies["quali"]["id_teammate"] == "nor"
+    assert rookies["quali"]["year"] == 2023
+    assert rookies["quali"]["n_rounds"] == 2
+    assert rookies["quali"]["mean_gap"] == pytest.approx(0.5)
+    assert service.get_rookies(2022) == []
+    json.dumps(service.get_rookies())
+
+
+def test_response_routes_driver_results_and_caches_them(service, engine):
+    status, body = service.get_response("/drivers/pia/results", {"year": "2023"})
+
+    assert status == 200
+    assert json.loads(body) == [{"round": 1, "session": "Race", "position": 2}]
+    assert engine.executed == [("driver_results", {"id_driver": "pia", "year": 2023})]
+
+    assert service.get_response("/drivers/pia/results", {"year": "2023"})[1] == body
+    assert len(engine.executed) == 1
+
+
+def test_response_routes_head_to_head(service, engine):
+    status, _ = service.get_response("/drivers/pia/head-to-head", {"year": "2023"})
+
+    assert status == 200
+    assert engine.executed == [("head_to_head", {"id_driver": "pia", "year": 2023})]
+
+
+def test_response_filters_rookies_by_year(service):
+    status, body = service.get_response("/rookies", {"year": "2023"})
+
+    assert status == 200
+    assert {row["year"] for row in json.loads(body)} == {2023}
+    assert json.loads(service.get_response("/rookies", {"year": "2022"})[1]) == []
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/drivers/pia/results", {"year": "last"}),
+        ("/drivers/pia/results", {}),
+        ("/drivers/pia/head-to-head", {}),
+        ("/rookies", {"year": "2023.5"}),
+    ],
+)
+def test_response_rejects_invalid_years(service, engine, path, params):
+    status, body = service.get_response(path, params)
+
+    assert status == 400
+    assert "error" in json.loads(body)
+    assert engine.executed == []
+
+
+def test_response_unknown_path_is_not_found(service):
+    status, body = service.get_response("/drivers/pia", {})
+
+    assert status == 404
+    assert "/drivers/pia" in json.loads(body)["error"]
+
+
+def test_version_is_read_at_most_once_per_interval(service, engine):
+    service.check_version()
+    assert engine.executed == []
+
+    service.check_version(force=True)
+    assert engine.executed == [("version", {})]
+
+
+def test_unchanged_version_keeps_cache(service, engine):
+    service.get_response("/drivers/pia/results", {"year": "2023"})
+    engine.executed.clear()
+
+    service.check_version(force=True)
+
+    assert [name for name, _ in engine.executed] == ["version"]
+    assert service.cache.get(("/drivers/pia/results", (("year", "2023"),)))
+
+
+def test_changed_version_clears_cache_and_recomputes_rookies(service, engine):
+    service.get_response("/drivers/pia/results", {"year": "2023"})
+    engine.rows["version"] = [{"version": 2}]
+    engine.rows["rookie_results"] = []
+    engine.executed.clear()
+
+    service.check_version(force=True)
+
+    assert [name for name, _ in engine.executed] == [
+        "version",
+        "rookie_results",
+        "rookie_teams",
+    ]
+    assert service.version == 2
+    assert service.cache.version == 2
+    assert service.cache.get(("/drivers/pia/results", (("year", "2023"),))) is None
+    assert service.get_rookies() == []
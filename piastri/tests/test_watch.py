@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.watch
+from src.watch import get_df_schedule_sessions, RaceWeekendWatch
+
+
+def get_schedule(year: int) -> pd.DataFrame:
+    """
+    A pre-season test and two weekends, the second a sprint weekend, with sessions
+    on the hour.
+    """
+
+    names = [
+        ["Day 1", "Day 2", "Day 3", None, None],
+        ["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"],
+        ["Practice 1", "Sprint Qualifying", "Sprint", "Qualifying", "Race"],
+    ]
+    starts = [
+        [f"{year}-02-2{i} 08:00" for i in range(1, 4)] + [None, None],
+        [f"{year}-03-0{d} {h}" for d, h in [(3, "11:30"), (3, "15:00")]]
+        + [f"{year}-03-04 11:30", f"{year}-03-04 15:00", f"{year}-03-05 15:00"],
+        [f"{year}-03-1{d} {h}" for d, h in [(0, "12:30"), (0, "16:30")]]
+        + [f"{year}-03-11 11:00", f"{year}-03-11 15:00", f"{year}-03-12 15:00"],
+    ]
+    schedule = {"RoundNumber": [0, 1, 2]}
+    for i in range(5):
+        schedule[f"Session{i + 1}"] = [row[i] for row in names]
+        schedule[f"Session{i + 1}DateUtc"] = pd.to_datetime([row[i] for row in starts])
+
+    return pd.DataFrame(schedule)
+
+
+def test_schedule_lists_qualifying_and_races_of_rounds():
+    df = get_df_schedule_sessions(get_schedule(2023))
+
+    assert df[["round", "session"]].values.tolist() == [
+        [1, "Q"],
+        [1, "R"],
+        [2, "Q"],
+        [2, "R"],
+    ]
+    race = df.iloc[1]
+    assert race["start"] == pd.Timestamp("2023-03-05 15:00")
+    assert race["end"] == pd.Timestamp("2023-03-05 17:00")
+    assert race["until"] == pd.Timestamp("2023-03-06 17:00")
+    assert df.iloc[0]["until"] == pd.Timestamp("2023-03-04 19:00")
+
+
+@pytest.fixture
+def watch(monkeypatch) -> RaceWeekendWatch:
+    monkeypatch.setattr(src.watch, "get_schedule", get_schedule)
+
+    return RaceWeekendWatch(*"updhp", "s")
+
+
+@pytest.mark.parametrize(
+    "results, session, published",
+    [
+        (None, "R", False),
+        (pd.DataFrame(columns=["DriverId", "ClassifiedPosition"]), "R", False),
+        (pd.DataFrame({"DriverId": ["a", "b"]}), "R", False),
+        (pd.DataFrame({"DriverId": ["a", "b"], "Position": [np.nan, ""]}), "Q", False),
+        (pd.DataFrame({"DriverId": ["a", ""], "Position": [1.0, 2.0]}), "Q", False),
+        (pd.DataFrame({"DriverId": ["a", None], "Position": [1.0, 2.0]}), "Q", False),
+        (pd.DataFrame({"DriverId": ["a", "b"], "Position": [1.0, np.nan]}), "Q", True),
+        (
+            pd.DataFrame({"DriverId": ["a", "b"], "ClassifiedPosition": ["1", "R"]}),
+            "R",
+            True,
+        ),
+        (pd.DataFrame({"DriverId": ["a", "b"], "Position": [1.0, 2.0]}), "R", False),
+    ],
+)
+def test_results_are_published_once_drivers_are_placed(
+    watch, results, session, published
+):
+    assert watch._RaceWeekendWatch__is_published(results, session) is published
+
+
+def test_only_new_or_amended_rows_are_pushed(watch):
+    key = (2023, 1, "R")
+    df_results = pd.DataFrame(
+        {"id_driver": ["a", "b", "c"], "position": ["1", "2", "3"]}
+    )
+
+    assert watch._RaceWeekendWatch__get_df_changed(key, df_results) is df_results
+
+    watch.snapshots[key] = df_results
+    df_amended = pd.DataFrame(
+        {"id_driver": ["a", "b", "c", "d"], "position": ["1", "3", "2", "R"]}
+    )
+    df_changed = watch._RaceWeekendWatch__get_df_changed(key, df_amended)
+
+    assert df_changed["id_driver"].tolist() == ["b", "c", "d"]
+    assert watch._RaceWeekendWatch__get_df_changed(key, df_results).empty
+
+
+@pytest.mark.parametrize(
+    "now, interval",
+    [
+        # Between weekends, at most an hour at a time.
+        ("2023-03-08 12:00", 3600.0),
+        # During a session.
+        ("2023-03-11 15:30", 120.0),
+        # Around a session's expected end, until its results are published.
+        ("2023-03-05 16:55", 15.0),
+        ("2023-03-05 17:29", 15.0),
+        # Then while amendments are possible.
+        ("2023-03-05 17:31", 120.0),
+        ("2023-03-06 16:59", 120.0),
+        # After the last session of the season.
+        ("2023-12-01 00:00", 3600.0),
+    ],
+)
+def test_interval_follows_the_session_timetable(watch, now, interval):
+    assert watch.get_interval(pd.Timestamp(now)) == interval
+
+
+def test_published_session_is_polled_at_the_amendment_interval(watch):
+    now = pd.Timestamp("2023-03-05 17:10")
+    assert watch.get_interval(now) == 15.0
+
+    watch.snapshots[(2023, 1, "R")] = pd.DataFrame()
+
+    assert watch.get_interval(now) == 120.0
+
+
+def test_idle_interval_runs_until_shortly_before_the_next_session_ends(watch):
+    watch.interval_idle = 86400.0
+
+    assert watch.get_interval(pd.Timestamp("2023-03-11 14:00")) == 6900.0
+    assert watch.get_interval(pd.Timestamp("2023-12-01 00:00")) == 86400.0
@@ -0,0 +1,54 @@
+# Makes `src` importable from the tests when pytest runs from this directory.
+
+from types import SimpleNamespace
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# Teammates of the sessions built by get_data_session, by driver number.
+DRIVERS = {"PIA": "81", "NOR": "4"}
+
+
+def get_laps_driver(
+    driver: str, number: str, lap_time: float, n_laps: int
+) -> pd.DataFrame:
+    # Laps of constant lap time, run back to back from session time 0.
+    start = np.arange(n_laps) * lap_time
+
+    return pd.DataFrame(
+        {
+            "Driver": driver,
+            "DriverNumber": number,
+            "Team": "McLaren",
+            "LapNumber": np.arange(1, n_laps + 1, dtype=float),
+            "LapStartTime": pd.to_timedelta(start, unit="s"),
+            "Time": pd.to_timedelta(start + lap_time, unit="s"),
+            "LapTime": pd.to_timedelta(np.full(n_laps, lap_time), unit="s"),
+            "Compound": "SOFT",
+        }
+    )
+
+
+@pytest.fixture
+def get_data_session() -> Callable[..., SimpleNamespace]:
+    """
+    Build a session in which PIA and NOR run n_laps laps each at constant lap times,
+    with other session data, such as car_data or pos_data, passed as keywords.
+    """
+
+    def get_data_session(
+        lap_time_pia: float, lap_time_nor: float, n_laps: int = 3, **data
+    ) -> SimpleNamespace:
+        laps = [
+            get_laps_driver(driver, number, lap_time, n_laps)
+            for (driver, number), lap_time in zip(
+                DRIVERS.items(), [lap_time_pia, lap_time_nor]
+            )
+        ]
+
+        return SimpleNamespace(laps=pd.concat(laps, ignore_index=True), **data)
+
+    return get_data_session
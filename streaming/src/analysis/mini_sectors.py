@@ -0,0 +1,262 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+
+# A mini-sector of a team in a session, within which teammates are compared.
+KEYS_SECTOR = ["year", "round", "session", "team", "mini_sector"]
+
+
+class MiniSectors:
+    def __init__(self, n_sectors: int = 25, resolution: float = 5.0):
+        self.n_sectors = n_sectors
+        self.resolution = resolution
+        self.track = None
+        self.df_sectors = None
+
+    def get_track(self, data_session: object, driver: Optional[str] = None) -> Dict:
+        """
+        Build the track line from a reference lap and split it into mini-sectors.
+
+        The reference lap's X/Y positions are resampled every resolution units of
+        distance along the lap and indexed in a KD-tree, so any position can be located
+        on the track with a nearest-neighbour query.
+
+        Args:
+            data_session (object): Loaded FastF1 session with telemetry.
+            driver (Optional[str]): The driver abbreviation whose fastest lap is the
+                reference. Defaults to the fastest lap of the session.
+
+        Returns:
+            Dict: The track line 'points', their distance along the lap 'distance',
+                the lap 'length', the mini-sector 'edges' and the KD-tree 'tree'.
+        """
+
+        laps = data_session.laps.dropna(subset=["LapTime", "LapStartTime", "Time"])
+        laps = laps[laps["DriverNumber"].isin(list(data_session.pos_data))]
+        if driver is not None:
+            laps = laps[laps["Driver"] == driver]
+        if laps.empty:
+            raise ValueError("Session data doesn't contain a timed lap with positions.")
+
+        lap = laps.loc[laps["LapTime"].idxmin()]
+        pos = data_session.pos_data[lap["DriverNumber"]]
+        pos = pos[
+            (pos["SessionTime"] >= lap["LapStartTime"])
+            & (pos["SessionTime"] <= lap["Time"])
+        ]
+
+        xy = pos[["X", "Y"]].to_numpy(dtype=float)
+        step = np.hypot(*np.diff(xy, axis=0).T)
+        xy = xy[np.concatenate([[True], step > 0])]
+        distance = np.concatenate([[0.0], np.cumsum(step[step > 0])])
+        if len(xy) < 2:
+            raise ValueError("Reference lap doesn't contain enough positions.")
+
+        length = distance[-1]
+        distance_grid = np.linspace(0.0, length, int(length // self.resolution) + 1)
+        points = np.column_stack(
+            [
+                np.interp(distance_grid, distance, xy[:, 0]),
+                np.interp(distance_grid, distance, xy[:, 1]),
+            ]
+        )
+
+        self.track = {
+            "points": points,
+            "distance": distance_grid,
+            "length": length,
+            "edges": np.linspace(0.0, length, self.n_sectors + 1),
+            "tree": cKDTree(points),
+        }
+
+        return self.track
+
+    def get_distance(self, track: Dict, xy: np.ndarray) -> np.ndarray:
+        """
+        Locate positions on the track line by projecting them on its nearest segment.
+
+        The KD-tree gives each position's nearest track point; the position is then
+        projected on the segments before and after that point and the closer
+        projection wins, for a distance finer than the track resolution.
+
+        Args:
+            track (Dict): The track from get_track.
+            xy (np.ndarray): Positions, of shape (n, 2).
+
+        Returns:
+            np.ndarray: Distance along the track line of each position, in
+                [0, length).
+        """
+
+        points, distance = track["points"], track["distance"]
+        _, nearest = track["tree"].query(xy)
+
+        # Segment k joins points k and k + 1; try the one ending and the one starting
+        # at the nearest point.
+        segments = np.stack(
+            [np.clip(nearest - 1, 0, None), np.clip(nearest, None, len(points) - 2)],
+            axis=1,
+        )
+        a, b = points[segments], points[segments + 1]
+        ab = b - a
+        ap = xy[:, None, :] - a
+        ab2 = np.einsum("nkj,nkj->nk", ab, ab)
+        u = np.clip(np.einsum("nkj,nkj->nk", ap, ab) / np.where(ab2 > 0, ab2, 1), 0, 1)
+        offset = np.hypot(*(ap - u[..., None] * ab).transpose(2, 0, 1))
+
+        best = np.argmin(offset, axis=1)
+        rows = np.arange(len(xy))
+        segment = segments[rows, best]
+        d = distance[segment] + u[rows, best] * (
+            distance[segment + 1] - distance[segment]
+        )
+
+        return np.mod(d, track["length"])
+
+    def __get_times_driver(
+        self, track: Dict, pos: pd.DataFrame, laps_driver: pd.DataFrame
+    ) -> np.ndarray:
+        """
+        Compute the time at which a driver crosses every mini-sector edge of every lap.
+
+        Track distances are unwrapped into the distance covered since the session start,
+        so every edge crossing of every lap is found with one interpolation.
+
+        Args:
+            track (Dict): The track from get_track.
+            pos (pd.DataFrame): The driver's position data.
+            laps_driver (pd.DataFrame): The driver's laps with start and end times.
+
+        Returns:
+            np.ndarray: Crossing times in seconds of session time, of shape
+                (laps, n_sectors + 1); NaN where positions don't cover the lap.
+        """
+
+        t = pos["SessionTime"].dt.total_seconds().to_numpy()
+        d = self.get_distance(track, pos[["X", "Y"]].to_numpy(dtype=float))
+        length = track["length"]
+
+        jump = np.diff(d)
+        wraps = np.cumsum(
+            np.where(jump < -length / 2, 1, 0) - np.where(jump > length / 2, 1, 0)
+        )
+        covered = np.maximum.accumulate(d + length * np.concatenate([[0], wraps]))
+
+        start = laps_driver["LapStartTime"].dt.total_seconds().to_numpy()
+        end = laps_driver["Time"].dt.total_seconds().to_numpy()
+
+        # The lap count at each lap start anchors its edges on the covered distance.
+        n_lap = np.round(np.interp(start, t, covered) / length)
+        targets = n_lap[:, None] * length + track["edges"][None, :]
+
+        times = np.interp(targets.ravel(), covered, t).reshape(targets.shape)
+        times[:, 0], times[:, -1] = start, end
+        outside = (targets < covered[0]) | (targets > covered[-1])
+        outside |= (start < t[0])[:, None] | (end > t[-1])[:, None]
+        times[outside] = np.nan
+
+        return times
+
+    def get_df_mini_sectors(
+        self,
+        data_session: object,
+        year: int,
+        round: int,
+        session: str,
+        track: Optional[Dict] = None,
+    ) -> pd.DataFrame:
+        """
+        Time every lap of every driver through each mini-sector.
+
+        The first and last edges are the official lap start and end, so the mini-sector
+        times of a lap add up to its lap time.
+
+        Args:
+            data_session (object): Loaded FastF1 session with telemetry.
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type.
+            track (Optional[Dict]): The track from get_track, e.g. of another session at
+                the circuit, for comparable mini-sectors. Defaults to this session's.
+
+        Returns:
+            pd.DataFrame: One row per driver, lap and mini-sector, numbered from 1, with
+                its time in seconds.
+        """
+
+        if track is None:
+            track = self.get_track(data_session)
+        laps = data_session.laps.dropna(subset=["LapNumber", "LapStartTime", "Time"])
+
+        list_df = []
+        for number, laps_driver in laps.groupby("DriverNumber"):
+            pos = data_session.pos_data.get(number)
+            if pos is None or len(pos) < 2:
+                continue
+
+            laps_driver = laps_driver.sort_values("LapNumber")
+            times = np.diff(self.__get_times_driver(track, pos, laps_driver), axis=1)
+
+            list_df.append(
+                pd.DataFrame(
+                    {
+                        "year": year,
+                        "round": round,
+                        "session": session,
+                        "driver": laps_driver["Driver"].iloc[0],
+                        "team": laps_driver["Team"].iloc[0],
+                        "lap": np.repeat(
+                            laps_driver["LapNumber"].astype(int).to_numpy(),
+                            self.n_sectors,
+                        ),
+                        "mini_sector": np.tile(
+                            np.arange(1, self.n_sectors + 1), len(laps_driver)
+                        ),
+                        "time": times.ravel(),
+                    }
+                )
+            )
+
+        if not list_df:
+            raise ValueError("Session data doesn't contain position data for any lap.")
+
+        self.df_sectors = pd.concat(list_df, ignore_index=True)
+
+        return self.df_sectors
+
+    def get_df_teammates(
+        self, df_sectors: pd.DataFrame, laps: Optional[List[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Compare teammates' best times through every mini-sector of each session.
+
+        Args:
+            df_sectors (pd.DataFrame): Mini-sector times from get_df_mini_sectors, of
+                one or many sessions.
+            laps (Optional[List[int]]): Lap numbers to compare. Defaults to all laps.
+
+        Returns:
+            pd.DataFrame: One row per session, team, mini-sector and ordered pair of
+                teammates, with the driver's best time minus the teammate's; negative
+                means the driver is quicker there.
+        """
+
+        df = df_sectors.dropna(subset=["time"])
+        if laps is not None:
+            df = df[df["lap"].isin(laps)]
+
+        df = df.groupby(KEYS_SECTOR + ["driver"], as_index=False)["time"].min()
+
+        df_pairs = df.merge(
+            df,
+            on=KEYS_SECTOR,
+            suffixes=("", "_teammate"),
+        )
+        df_pairs = df_pairs[df_pairs["driver"] != df_pairs["driver_teammate"]]
+
+        return df_pairs.assign(
+            delta_time=df_pairs["time"] - df_pairs["time_teammate"]
+        ).reset_index(drop=True)
@@ -0,0 +1,274 @@
+import numpy as np
+import pandas as pd
+
+
+class RaceEvents:
+    def __init__(
+        self,
+        window_pit_laps: int = 3,
+        window_pit_gap: float = 3.0,
+        status_safety_car: str = "4",
+    ):
+        self.window_pit_laps = window_pit_laps
+        self.window_pit_gap = window_pit_gap
+        self.status_safety_car = status_safety_car
+        self.drivers = None
+        self.laps = None
+        self.matrices = None
+        self.df_events = None
+
+    def __get_matrices(self, laps: pd.DataFrame) -> dict:
+        """
+        Pivot the session's laps into lap x driver matrices.
+
+        Args:
+            laps (pd.DataFrame): FastF1 laps for a race session.
+
+        Returns:
+            dict: NumPy arrays of shape (n_laps, n_drivers) for position, session time at
+                lap end, lap time, pit flag and safety-car flag.
+        """
+
+        df = laps[
+            [
+                "Driver",
+                "LapNumber",
+                "Position",
+                "Time",
+                "LapTime",
+                "PitInTime",
+                "PitOutTime",
+                "TrackStatus",
+            ]
+        ].dropna(subset=["LapNumber"])
+
+        df = df.assign(
+            Time=df["Time"].dt.total_seconds(),
+            LapTime=df["LapTime"].dt.total_seconds(),
+            Pit=(df["PitInTime"].notna() | df["PitOutTime"].notna()).astype(float),
+            SafetyCar=df["TrackStatus"]
+            .fillna("")
+            .astype(str)
+            .str.contains(self.status_safety_car, regex=False)
+            .astype(float),
+        )
+
+        df_wide = df.pivot(
+            index="LapNumber",
+            columns="Driver",
+            values=["Position", "Time", "LapTime", "Pit", "SafetyCar"],
+        )
+
+        self.laps = df_wide.index.to_numpy(dtype=int)
+        self.drivers = df_wide["Position"].columns.to_numpy()
+
+        return {
+            "position": df_wide["Position"].to_numpy(dtype=float),
+            "time": df_wide["Time"].to_numpy(dtype=float),
+            "lap_time": df_wide["LapTime"].to_numpy(dtype=float),
+            "pit": np.nan_to_num(df_wide["Pit"].to_numpy(dtype=float)) > 0,
+            "safety_car": (
+                np.nan_to_num(df_wide["SafetyCar"].to_numpy(dtype=float)) > 0
+            ).any(axis=1),
+        }
+
+    def __get_df_overtakes(self, m: dict) -> pd.DataFrame:
+        """
+        Detect on-track overtakes as pairwise order swaps between consecutive laps.
+
+        Swaps where either driver was on an in- or out-lap are left to pit-cycle detection.
+
+        Args:
+            m (dict): Lap x driver matrices from __get_matrices.
+
+        Returns:
+            pd.DataFrame: One row per overtake, with the overtaking driver in 'driver'.
+        """
+
+        before, after = m["position"][:-1], m["position"][1:]
+        pit = m["pit"][:-1] | m["pit"][1:]
+
+        # (lap, i, j): i was behind j and is now ahead of j.
+        swapped = (before[:, :, None] > before[:, None, :]) & (
+            after[:, :, None] < after[:, None, :]
+        )
+        clean = ~(pit[:, :, None] | pit[:, None, :])
+        lap_idx, i, j = np.nonzero(swapped & clean)
+
+        return pd.DataFrame(
+            {
+                "lap": self.laps[1:][lap_idx],
+                "event": "overtake",
+                "driver": self.drivers[i],
+                "driver_other": self.drivers[j],
+                "value": after[lap_idx, i],
+            }
+        )
+
+    def __get_df_pit_cycles(self, m: dict) -> pd.DataFrame:
+        """
+        Classify close pit-stop pairs as undercuts or overcuts.
+
+        Driver A stops on lap La and driver B within window_pit_laps after it, having been
+        within window_pit_gap seconds of each other on the lap before A stopped. The order
+        on the lap after B's stop against the order before A's stop decides the outcome.
+
+        Args:
+            m (dict): Lap x driver matrices from __get_matrices.
+
+        Returns:
+            pd.DataFrame: One row per successful undercut or overcut, with the driver who
+                gained the position in 'driver' and the gap before the cycle in 'value'.
+        """
+
+        pit_in = m["pit"] & ~np.vstack([np.zeros_like(m["pit"][:1]), m["pit"][:-1]])
+        lap_idx, driver_idx = np.nonzero(pit_in)
+        df_stops = pd.DataFrame({"lap": lap_idx, "driver": driver_idx})
+
+        df_cycles = df_stops.merge(df_stops, how="cross", suffixes=("_a", "_b"))
+        lag = df_cycles["lap_b"] - df_cycles["lap_a"]
+        df_cycles = df_cycles[(lag > 0) & (lag <= self.window_pit_laps)]
+        df_cycles = df_cycles[df_cycles["lap_a"] > 0]
+
+        lap_before = df_cycles["lap_a"].to_numpy() - 1
+        lap_after = np.minimum(df_cycles["lap_b"].to_numpy() + 1, len(self.laps) - 1)
+        a = df_cycles["driver_a"].to_numpy()
+        b = df_cycles["driver_b"].to_numpy()
+
+        gap = m["time"][lap_before, a] - m["time"][lap_before, b]
+        ahead_before = m["position"][lap_before, a] < m["position"][lap_before, b]
+        ahead_after = m["position"][lap_after, a] < m["position"][lap_after, b]
+
+        # Both drivers must still be running on both laps, or a retirement would
+        # read as a lost position.
+        running = (
+            ~np.isnan(m["position"][lap_before, a])
+            & ~np.isnan(m["position"][lap_before, b])
+            & ~np.isnan(m["position"][lap_after, a])
+            & ~np.isnan(m["position"][lap_after, b])
+        )
+
+        close = running & (np.abs(gap) <= self.window_pit_gap)
+        undercut = close & ~ahead_before & ahead_after
+        overcut = close & ahead_before & ~ahead_after
+
+        df_undercut = pd.DataFrame(
+            {
+                "lap": self.laps[lap_after[undercut]],
+                "event": "undercut",
+                "driver": self.drivers[a[undercut]],
+                "driver_other": self.drivers[b[undercut]],
+                "value": gap[undercut],
+            }
+        )
+        df_overcut = pd.DataFrame(
+            {
+                "lap": self.laps[lap_after[overcut]],
+                "event": "overcut",
+                "driver": self.drivers[b[overcut]],
+                "driver_other": self.drivers[a[overcut]],
+                "value": -gap[overcut],
+            }
+        )
+
+        return pd.concat([df_undercut, df_overcut], ignore_index=True)
+
+    def __get_df_safety_car(self, m: dict) -> pd.DataFrame:
+        """
+        Measure how much each safety-car period compressed the field.
+
+        Args:
+            m (dict): Lap x driver matrices from __get_matrices.
+
+        Returns:
+            pd.DataFrame: One row per safety-car period, starting on 'lap', with the ratio
+                of leader-to-last spread after the period to the spread before it in 'value'.
+        """
+
+        spread = np.nanmax(m["time"], axis=1) - np.nanmin(m["time"], axis=1)
+        flag = m["safety_car"].astype(int)
+        change = np.diff(np.concatenate([[0], flag, [0]]))
+        starts = np.flatnonzero(change == 1)
+        ends = np.flatnonzero(change == -1)
+
+        before = spread[np.maximum(starts - 1, 0)]
+        after = spread[np.minimum(ends, len(spread) - 1)]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = after / before
+
+        return pd.DataFrame(
+            {
+                "lap": self.laps[starts],
+                "event": "safety_car",
+                "driver": None,
+                "driver_other": None,
+                "value": ratio,
+            }
+        )
+
+    def __get_df_fastest_laps(self, m: dict) -> pd.DataFrame:
+        """
+        Detect each lap on which the session's fastest lap was improved.
+
+        Args:
+            m (dict): Lap x driver matrices from __get_matrices.
+
+        Returns:
+            pd.DataFrame: One row per fastest-lap change with the lap time in seconds.
+        """
+
+        lap_time = np.where(np.isnan(m["lap_time"]), np.inf, m["lap_time"])
+        best_lap = lap_time.min(axis=1)
+        best_running = np.minimum.accumulate(best_lap)
+        improved = np.isfinite(best_lap) & (
+            best_lap < np.concatenate([[np.inf], best_running[:-1]])
+        )
+
+        lap_idx = np.flatnonzero(improved)
+        driver_idx = lap_time[lap_idx].argmin(axis=1)
+
+        return pd.DataFrame(
+            {
+                "lap": self.laps[lap_idx],
+                "event": "fastest_lap",
+                "driver": self.drivers[driver_idx],
+                "driver_other": None,
+                "value": best_lap[lap_idx],
+            }
+        )
+
+    def get_df_events(
+        self, data_session: object, year: int, round: int
+    ) -> pd.DataFrame:
+        """
+        Detect the race-story events of a race session.
+
+        Args:
+            data_session (object): Loaded FastF1 race session.
+            year (int): The year of the session.
+            round (int): The round number of the session.
+
+        Returns:
+            pd.DataFrame: Event table with columns 'year', 'round', 'lap', 'event',
+                'driver', 'driver_other' and 'value', sorted by lap.
+        """
+
+        self.matrices = self.__get_matrices(data_session.laps)
+
+        self.df_events = pd.concat(
+            [
+                self.__get_df_overtakes(self.matrices),
+                self.__get_df_pit_cycles(self.matrices),
+                self.__get_df_safety_car(self.matrices),
+                self.__get_df_fastest_laps(self.matrices),
+            ],
+            ignore_index=True,
+        )
+        self.df_events.insert(0, "year", year)
+        self.df_events.insert(1, "round", round)
+        self.df_events = self.df_events.sort_values(
+            ["lap", "event"], kind="stable"
+        ).reset_index(drop=True)
+
+        return self.df_events
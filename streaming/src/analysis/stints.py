@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+
+KEYS_STINT = ["year", "round", "driver", "stint"]
+
+# TrackStatus codes for safety car, red flag and virtual safety car periods.
+STATUS_NEUTRALISED = "4567"
+
+
+class StintAnalysis:
+    def __init__(
+        self,
+        fuel_effect: float = 0.03,
+        threshold_slow: float = 1.07,
+        min_laps: int = 4,
+    ):
+        self.fuel_effect = fuel_effect
+        self.threshold_slow = threshold_slow
+        self.min_laps = min_laps
+        self.df_laps = None
+        self.df_stints = None
+
+    def get_df_laps(self, data_session: object, year: int, round: int) -> pd.DataFrame:
+        """
+        Segment every driver's race into stints and mark the laps usable for fitting.
+
+        A stint starts at the first lap, on every pit exit and on every compound change.
+        Lap times are fuel-corrected to an empty tank, assuming fuel burns linearly over
+        the race and costs fuel_effect seconds per lap of fuel on board.
+
+        Args:
+            data_session (object): Loaded FastF1 race session.
+            year (int): The year of the session.
+            round (int): The round number of the session.
+
+        Returns:
+            pd.DataFrame: One row per lap with its stint, compound, tyre age, corrected
+                lap time in seconds and a 'fit' flag excluding in/out laps, the first
+                lap, neutralised laps and laps slower than threshold_slow times the
+                stint median.
+        """
+
+        df = (
+            data_session.laps[
+                [
+                    "Driver",
+                    "Team",
+                    "LapNumber",
+                    "LapTime",
+                    "Compound",
+                    "TyreLife",
+                    "PitInTime",
+                    "PitOutTime",
+                    "TrackStatus",
+                ]
+            ]
+            .dropna(subset=["LapNumber"])
+            .sort_values(["Driver", "LapNumber"])
+            .reset_index(drop=True)
+        )
+
+        compound = df["Compound"].fillna("UNKNOWN")
+        first = df["Driver"] != df["Driver"].shift()
+        change = first | df["PitOutTime"].notna() | (compound != compound.shift())
+        stint = change.astype(int).groupby(df["Driver"]).cumsum()
+
+        n_laps = df["LapNumber"].max()
+        lap_time = df["LapTime"].dt.total_seconds()
+        lap_time_corrected = lap_time - self.fuel_effect * (n_laps - df["LapNumber"])
+
+        neutralised = (
+            df["TrackStatus"]
+            .fillna("")
+            .astype(str)
+            .str.contains(f"[{STATUS_NEUTRALISED}]")
+        )
+        fit = (
+            lap_time.notna()
+            & df["TyreLife"].notna()
+            & df["PitInTime"].isna()
+            & df["PitOutTime"].isna()
+            & (df["LapNumber"] > 1)
+            & ~neutralised
+        )
+
+        self.df_laps = pd.DataFrame(
+            {
+                "year": year,
+                "round": round,
+                "driver": df["Driver"],
+                "team": df["Team"],
+                "stint": stint,
+                "compound": compound,
+                "lap": df["LapNumber"].astype(int),
+                "tyre_age": df["TyreLife"],
+                "lap_time": lap_time,
+                "lap_time_corrected": lap_time_corrected,
+                "fit": fit,
+            }
+        )
+
+        median = (
+            self.df_laps["lap_time"]
+            .where(fit)
+            .groupby([self.df_laps[k] for k in KEYS_STINT])
+            .transform("median")
+        )
+        self.df_laps["fit"] = fit & (lap_time <= self.threshold_slow * median)
+
+        return self.df_laps
+
+    def get_df_stints(self, df_laps: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fit tyre degradation for every stint at once, by least squares of corrected lap
+        time on tyre age.
+
+        Every fit comes from the same grouped sums, so the cost is one pass over the laps
+        of any number of drivers, races and seasons.
+
+        Args:
+            df_laps (pd.DataFrame): Laps from get_df_laps, of one or many sessions.
+
+        Returns:
+            pd.DataFrame: One row per stint with its compound, laps, the fitted
+                degradation in seconds per lap of tyre age, the corrected pace at age 0,
+                and the RMSE of the fit. Fits with fewer than min_laps laps are NaN.
+        """
+
+        df_fit = df_laps[df_laps["fit"]]
+        x = df_fit["tyre_age"]
+        y = df_fit["lap_time_corrected"]
+
+        df_sums = (
+            df_fit.assign(x=x, y=y, xx=x * x, xy=x * y, yy=y * y)
+            .groupby(KEYS_STINT)[["x", "y", "xx", "xy", "yy"]]
+            .agg(["sum", "count"])
+        )
+        n = df_sums[("x", "count")]
+        sx, sy = df_sums[("x", "sum")], df_sums[("y", "sum")]
+        sxx, sxy, syy = (
+            df_sums[("xx", "sum")],
+            df_sums[("xy", "sum")],
+            df_sums[("yy", "sum")],
+        )
+
+        var_x = n * sxx - sx**2
+        slope = (n * sxy - sx * sy) / var_x.where(var_x > 0)
+        intercept = (sy - slope * sx) / n
+        sse = (
+            syy
+            - 2 * slope * sxy
+            - 2 * intercept * sy
+            + slope**2 * sxx
+            + 2 * slope * intercept * sx
+            + n * intercept**2
+        )
+        valid = n >= self.min_laps
+
+        df_models = pd.DataFrame(
+            {
+                "n_fit": n,
+                "degradation": slope.where(valid),
+                "pace": intercept.where(valid),
+                "rmse": np.sqrt(np.maximum(sse, 0) / n).where(valid),
+            }
+        )
+
+        df_stints = df_laps.groupby(KEYS_STINT).agg(
+            team=("team", "first"),
+            compound=("compound", "first"),
+            lap_start=("lap", "min"),
+            lap_end=("lap", "max"),
+            n_laps=("lap", "size"),
+            tyre_age_start=("tyre_age", "min"),
+        )
+
+        self.df_stints = (
+            df_stints.join(df_models)
+            .fillna({"n_fit": 0})
+            .astype({"n_fit": int})
+            .reset_index()
+        )
+
+        return self.df_stints
+
+    def get_df_teammates(self, df_stints: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compare the degradation and pace of teammates on the same compound and race.
+
+        Each driver's fitted stints on a compound are averaged, weighted by their laps.
+
+        Args:
+            df_stints (pd.DataFrame): Stints from get_df_stints.
+
+        Returns:
+            pd.DataFrame: One row per race, team, compound and ordered pair of teammates,
+                with the driver's degradation and pace minus the teammate's.
+        """
+
+        df = df_stints.dropna(subset=["degradation"])
+        df = df.assign(
+            w_degradation=df["degradation"] * df["n_fit"],
+            w_pace=df["pace"] * df["n_fit"],
+        )
+        df = df.groupby(
+            ["year", "round", "team", "compound", "driver"], as_index=False
+        )[["n_fit", "w_degradation", "w_pace"]].sum()
+        df = df.assign(
+            degradation=df["w_degradation"] / df["n_fit"],
+            pace=df["w_pace"] / df["n_fit"],
+        ).drop(columns=["w_degradation", "w_pace"])
+
+        df_pairs = df.merge(
+            df,
+            on=["year", "round", "team", "compound"],
+            suffixes=("", "_teammate"),
+        )
+        df_pairs = df_pairs[df_pairs["driver"] != df_pairs["driver_teammate"]]
+
+        return df_pairs.assign(
+            delta_degradation=df_pairs["degradation"]
+            - df_pairs["degradation_teammate"],
+            delta_pace=df_pairs["pace"] - df_pairs["pace_teammate"],
+        ).reset_index(drop=True)
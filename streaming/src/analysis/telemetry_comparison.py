@@ -0,0 +1,241 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class TelemetryComparison:
+    def __init__(self, n_points: int = 500):
+        self.n_points = n_points
+        self.df_laps = None
+        self.distance = None
+        self.channels = None
+
+    def __get_arrays_driver(
+        self, data_session: object, laps_driver: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray, dict]:
+        """
+        Slice a driver's session-wide car data into laps and compute lap-relative distance.
+
+        Args:
+            data_session (object): Loaded FastF1 session with telemetry.
+            laps_driver (pd.DataFrame): The driver's laps, sorted by lap number.
+
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray, np.ndarray, dict]:
+                - The laps that contain telemetry samples, with their lap length in metres.
+                - The position of each retained sample's lap within those laps.
+                - The fraction of lap distance covered at each retained sample.
+                - Channel arrays (time, speed, throttle, brake) aligned with the fractions.
+        """
+
+        car_data = data_session.car_data[laps_driver["DriverNumber"].iloc[0]]
+
+        t = car_data["SessionTime"].dt.total_seconds().to_numpy()
+        speed = car_data["Speed"].to_numpy(dtype=float)
+        throttle = car_data["Throttle"].to_numpy(dtype=float)
+        brake = car_data["Brake"].to_numpy(dtype=float)
+
+        start = laps_driver["LapStartTime"].dt.total_seconds().to_numpy()
+        end = laps_driver["Time"].dt.total_seconds().to_numpy()
+
+        # Distance travelled along the whole session, trapezoidal in km/h -> m/s.
+        segment = 0.5 * (speed[1:] + speed[:-1]) / 3.6 * np.diff(t)
+        distance = np.concatenate([[0.0], np.cumsum(segment)])
+
+        first = np.searchsorted(t, start, side="left")
+        last = np.searchsorted(t, end, side="left") - 1
+        # Laps starting after the telemetry ends, or ending before it starts, index
+        # past either end; they have no samples and are dropped below.
+        length = (
+            distance[np.clip(last, 0, len(t) - 1)]
+            - distance[np.clip(first, 0, len(t) - 1)]
+        )
+        has_samples = (last > first) & (length > 0)
+
+        laps_valid = laps_driver.loc[has_samples].copy()
+        laps_valid["LapLength"] = length[has_samples]
+        first, last = first[has_samples], last[has_samples]
+        start, length = start[has_samples], length[has_samples]
+
+        # Sample indices of every retained lap, flattened in lap order.
+        counts = last - first + 1
+        lap_of_sample = np.repeat(np.arange(len(first)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        idx = first[lap_of_sample] + offsets
+
+        fraction = (distance[idx] - distance[first[lap_of_sample]]) / length[
+            lap_of_sample
+        ]
+
+        channels = {
+            "time": t[idx] - start[lap_of_sample],
+            "speed": speed[idx],
+            "throttle": throttle[idx],
+            "brake": brake[idx],
+        }
+
+        return laps_valid, lap_of_sample, fraction, channels
+
+    def get_resampled(
+        self, data_session: object, drivers: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Resample every lap of the given drivers onto a common distance grid.
+
+        All laps are interpolated by a single np.interp call per channel: each lap's
+        distance fraction is offset by twice its row number so laps never overlap on
+        the shared x-axis.
+
+        Args:
+            data_session (object): Loaded FastF1 session with telemetry.
+            drivers (Optional[List[str]]): Driver abbreviations, e.g. ["PIA", "NOR"].
+                Defaults to every driver in the session.
+
+        Returns:
+            pd.DataFrame: One row per resampled lap with its row index into the channel arrays.
+        """
+
+        laps = data_session.laps
+        if drivers is not None:
+            laps = laps[laps["Driver"].isin(drivers)]
+        laps = laps.dropna(subset=["LapStartTime", "Time"]).sort_values(
+            ["Driver", "LapNumber"]
+        )
+
+        list_laps = []
+        list_x = []
+        dict_y = {"time": [], "speed": [], "throttle": [], "brake": []}
+        row_offset = 0
+
+        for _, laps_driver in laps.groupby("Driver", sort=True):
+            laps_valid, lap_of_sample, fraction, channels = self.__get_arrays_driver(
+                data_session, laps_driver
+            )
+            if laps_valid.empty:
+                continue
+
+            list_laps.append(laps_valid)
+            list_x.append(2.0 * (lap_of_sample + row_offset) + fraction)
+            for name, values in channels.items():
+                dict_y[name].append(values)
+            row_offset += len(laps_valid)
+
+        if not list_laps:
+            raise ValueError(
+                "Session doesn't contain telemetry for the requested laps."
+            )
+
+        self.df_laps = pd.concat(list_laps, ignore_index=True)[
+            ["Driver", "Team", "LapNumber", "LapTime", "Compound", "LapLength"]
+        ]
+        self.df_laps["row"] = np.arange(len(self.df_laps))
+
+        grid = np.linspace(0.0, 1.0, self.n_points)
+        x = np.concatenate(list_x)
+        x_query = (
+            2.0 * self.df_laps["row"].to_numpy()[:, None] + grid[None, :]
+        ).ravel()
+
+        self.channels = {
+            name: np.interp(x_query, x, np.concatenate(values)).reshape(
+                len(self.df_laps), self.n_points
+            )
+            for name, values in dict_y.items()
+        }
+        self.distance = grid * float(self.df_laps["LapLength"].median())
+
+        return self.df_laps
+
+    def __get_pairs(
+        self,
+        driver_pairs: Optional[List[Tuple[str, str]]],
+        fastest: bool,
+    ) -> pd.DataFrame:
+        """
+        Match laps of each driver pair, either lap-for-lap or fastest against fastest.
+
+        Args:
+            driver_pairs (Optional[List[Tuple[str, str]]]): Pairs of driver abbreviations.
+                Defaults to every pair of teammates in the resampled laps.
+            fastest (bool): Whether to compare only each driver's fastest lap.
+
+        Returns:
+            pd.DataFrame: One row per lap pair with the row indices of both laps.
+        """
+
+        df_laps = self.df_laps
+        if fastest:
+            df_laps = df_laps.dropna(subset=["LapTime"])
+            df_laps = df_laps.loc[df_laps.groupby("Driver")["LapTime"].idxmin()]
+
+        if driver_pairs is None:
+            df_drivers = df_laps[["Team", "Driver"]].drop_duplicates()
+            df_teammates = df_drivers.merge(
+                df_drivers, on="Team", suffixes=("_a", "_b")
+            )
+            df_teammates = df_teammates[
+                df_teammates["Driver_a"] < df_teammates["Driver_b"]
+            ]
+            driver_pairs = list(zip(df_teammates["Driver_a"], df_teammates["Driver_b"]))
+
+        df_pairs = pd.DataFrame(driver_pairs, columns=["driver_a", "driver_b"])
+        cols = ["Driver", "LapNumber", "row"]
+        df_a = df_laps[cols].rename(
+            columns={"Driver": "driver_a", "LapNumber": "lap_a", "row": "row_a"}
+        )
+        df_b = df_laps[cols].rename(
+            columns={"Driver": "driver_b", "LapNumber": "lap_b", "row": "row_b"}
+        )
+
+        df_pairs = df_pairs.merge(df_a, on="driver_a")
+        if fastest:
+            df_pairs = df_pairs.merge(df_b, on="driver_b")
+        else:
+            df_pairs = df_pairs.merge(
+                df_b,
+                left_on=["driver_b", "lap_a"],
+                right_on=["driver_b", "lap_b"],
+            )
+
+        return df_pairs.reset_index(drop=True)
+
+    def get_df_deltas(
+        self,
+        driver_pairs: Optional[List[Tuple[str, str]]] = None,
+        fastest: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Compute speed, throttle, brake and cumulative time deltas for every lap pair.
+
+        Deltas are driver_a minus driver_b, so a positive time delta means driver_a is behind.
+
+        Args:
+            driver_pairs (Optional[List[Tuple[str, str]]]): Pairs of driver abbreviations.
+                Defaults to every pair of teammates.
+            fastest (bool): Whether to compare fastest laps instead of matching lap numbers.
+
+        Returns:
+            pd.DataFrame: Long DataFrame with one row per lap pair and distance grid point.
+        """
+
+        if self.channels is None:
+            raise ValueError("Call get_resampled() before computing deltas.")
+
+        df_pairs = self.__get_pairs(driver_pairs, fastest)
+        row_a = df_pairs["row_a"].to_numpy()
+        row_b = df_pairs["row_b"].to_numpy()
+
+        df_deltas = df_pairs[["driver_a", "driver_b", "lap_a", "lap_b"]].loc[
+            np.repeat(df_pairs.index.to_numpy(), self.n_points)
+        ]
+        df_deltas = df_deltas.reset_index(drop=True)
+        df_deltas["distance"] = np.tile(self.distance, len(df_pairs))
+
+        for name in ["speed", "throttle", "brake", "time"]:
+            values = self.channels[name]
+            df_deltas[f"delta_{name}"] = (values[row_a] - values[row_b]).ravel()
+
+        return df_deltas
@@ -0,0 +1,283 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Optional, Tuple
+
+import fastf1 as ff1
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from ..analysis.mini_sectors import MiniSectors
+from ..analysis.race_events import RaceEvents
+from ..analysis.stints import StintAnalysis
+from ..analysis.telemetry_comparison import TelemetryComparison
+
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[int, int, str]
+
+Loader = Callable[[int, int, str, bool], object]
+
+VARS_THREADS = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"]
+
+
+def init_worker(dir_cache: Optional[str], n_threads: int = 1) -> None:
+    """
+    Prepare a worker process to read the FastF1 cache shared by all workers, with
+    BLAS/OpenMP limited to n_threads so the workers don't oversubscribe the cores.
+
+    Numpy starts its BLAS threads when imported, before this runs, so those are
+    limited with threadpoolctl; the variables reach libraries loaded later.
+
+    Args:
+        dir_cache (Optional[str]): The FastF1 cache directory.
+        n_threads (int): Threads per worker for BLAS/OpenMP.
+
+    Returns:
+        None.
+    """
+
+    if dir_cache is not None:
+        ff1.Cache.enable_cache(dir_cache)
+
+    os.environ.update({var: str(n_threads) for var in VARS_THREADS})
+    threadpool_limits(n_threads)
+
+
+def load_session(year: int, round: int, session: str, telemetry: bool) -> object:
+    """
+    Load a session's laps, and car telemetry if needed, from FastF1.
+
+    Args:
+        year (int): The year of the session.
+        round (int): The round number of the session.
+        session (str): The session type.
+        telemetry (bool): Whether to load car telemetry.
+
+    Returns:
+        object: The loaded FastF1 session.
+    """
+
+    data_session = ff1.get_session(year, round, session)
+    data_session.load(laps=True, telemetry=telemetry, weather=False, messages=False)
+
+    return data_session
+
+
+def run_job(
+    func: Callable[[object, int, int, str], pd.DataFrame],
+    job: Job,
+    dir_output: str,
+    telemetry: bool,
+    loader: Loader = load_session,
+) -> Tuple[Job, str, int]:
+    """
+    Load one session in a worker, analyse it and write the result as a Parquet chunk.
+
+    Only the chunk's path goes back to the parent, so DataFrames are never pickled
+    across processes.
+
+    Args:
+        func (Callable[[object, int, int, str], pd.DataFrame]): Module-level analysis
+            function taking the loaded session, year, round and session type.
+        job (Job): The (year, round, session) to analyse.
+        dir_output (str): Directory for the result chunks.
+        telemetry (bool): Whether the analysis needs car telemetry.
+        loader (Loader): Module-level function loading a session from its year, round,
+            session type and whether telemetry is needed.
+
+    Returns:
+        Tuple[Job, str, int]: The job, the chunk path and its number of rows.
+    """
+
+    year, round, session = job
+
+    data_session = loader(year, round, session, telemetry)
+
+    df = func(data_session, year, round, session)
+
+    path = os.path.join(dir_output, f"{year}_{round:02d}_{session}.parquet")
+    df.to_parquet(path, index=False)
+
+    return job, path, len(df)
+
+
+def get_df_race_events(
+    data_session: object, year: int, round: int, session: str
+) -> pd.DataFrame:
+    """
+    Analysis job detecting race-story events of a session.
+
+    Args:
+        data_session (object): Loaded FastF1 session.
+        year (int): The year of the session.
+        round (int): The round number of the session.
+        session (str): The session type.
+
+    Returns:
+        pd.DataFrame: The session's event table.
+    """
+
+    return RaceEvents().get_df_events(data_session, year, round)
+
+
+def get_df_teammate_deltas(
+    data_session: object, year: int, round: int, session: str
+) -> pd.DataFrame:
+    """
+    Analysis job comparing the fastest laps of every pair of teammates.
+
+    Args:
+        data_session (object): Loaded FastF1 session with telemetry.
+        year (int): The year of the session.
+        round (int): The round number of the session.
+        session (str): The session type.
+
+    Returns:
+        pd.DataFrame: Distance-aligned deltas, keyed by year, round and session.
+    """
+
+    instance_comparison = TelemetryComparison()
+    instance_comparison.get_resampled(data_session)
+    df_deltas = instance_comparison.get_df_deltas(fastest=True)
+
+    return df_deltas.assign(year=year, round=round, session=session)
+
+
+def get_df_stint_laps(
+    data_session: object, year: int, round: int, session: str
+) -> pd.DataFrame:
+    """
+    Analysis job segmenting a race into stints, for StintAnalysis.get_df_stints to fit
+    across every session at once.
+
+    Args:
+        data_session (object): Loaded FastF1 race session.
+        year (int): The year of the session.
+        round (int): The round number of the session.
+        session (str): The session type.
+
+    Returns:
+        pd.DataFrame: The session's laps with stints and fuel-corrected lap times.
+    """
+
+    return StintAnalysis().get_df_laps(data_session, year, round)
+
+
+def get_df_mini_sectors(
+    data_session: object, year: int, round: int, session: str
+) -> pd.DataFrame:
+    """
+    Analysis job timing every lap of a session through its mini-sectors, for
+    MiniSectors.get_df_teammates to compare across every session at once.
+
+    Args:
+        data_session (object): Loaded FastF1 session with telemetry.
+        year (int): The year of the session.
+        round (int): The round number of the session.
+        session (str): The session type.
+
+    Returns:
+        pd.DataFrame: Mini-sector times, keyed by year, round and session.
+    """
+
+    return MiniSectors().get_df_mini_sectors(data_session, year, round, session)
+
+
+class SessionPool:
+    def __init__(
+        self,
+        dir_output: str,
+        max_workers: Optional[int] = None,
+        dir_cache: Optional[str] = None,
+        loader: Loader = load_session,
+        n_threads: int = 1,
+    ):
+        self.dir_output = dir_output
+        self.max_workers = max_workers or os.cpu_count()
+        self.dir_cache = dir_cache
+        self.loader = loader
+        self.n_threads = n_threads
+        self.paths = {}
+        self.failed = {}
+
+    def run(
+        self,
+        func: Callable[[object, int, int, str], pd.DataFrame],
+        jobs: List[Job],
+        name: str,
+        telemetry: bool = False,
+    ) -> Dict[Job, str]:
+        """
+        Run an analysis over many sessions, one session per worker process at a time.
+
+        Args:
+            func (Callable[[object, int, int, str], pd.DataFrame]): Module-level analysis
+                function, e.g. get_df_race_events.
+            jobs (List[Job]): The (year, round, session) tuples to analyse.
+            name (str): Name of the analysis, used as the output subdirectory.
+            telemetry (bool): Whether the analysis needs car telemetry.
+
+        Returns:
+            Dict[Job, str]: Chunk path of every successful job.
+        """
+
+        dir_output = os.path.join(self.dir_output, name)
+        os.makedirs(dir_output, exist_ok=True)
+
+        self.paths[name] = {}
+        self.failed[name] = {}
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=get_context("spawn"),
+            initializer=init_worker,
+            initargs=(self.dir_cache, self.n_threads),
+        )
+
+        try:
+            futures = {
+                executor.submit(
+                    run_job, func, job, dir_output, telemetry, self.loader
+                ): job
+                for job in jobs
+            }
+
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    _, path, n_rows = future.result()
+                    self.paths[name][job] = path
+                    logger.info(f"Analysed {job} for {name}: {n_rows} rows.")
+                except Exception as e:
+                    self.failed[name][job] = str(e)
+                    logger.error(f"Error analysing {job} for {name}: {e}.")
+        finally:
+            executor.shutdown()
+
+        return self.paths[name]
+
+    def get_df_results(
+        self, name: str, columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Read the chunks of a finished analysis into one DataFrame.
+
+        Args:
+            name (str): Name of the analysis passed to run.
+            columns (Optional[List[str]]): Columns to read. Defaults to all.
+
+        Returns:
+            pd.DataFrame: The concatenated results, in job order.
+        """
+
+        paths = [self.paths[name][job] for job in sorted(self.paths[name])]
+        if not paths:
+            return pd.DataFrame(columns=columns)
+
+        return pd.concat(
+            [pd.read_parquet(path, columns=columns) for path in paths],
+            ignore_index=True,
+        )
@@ -0,0 +1,70 @@
+from typing import List, Tuple
+
+import numpy as np
+
+
+def get_indices_minmax(values: np.ndarray, bucket: int) -> np.ndarray:
+    """
+    Select the samples of a series to keep so that its peaks survive decimation.
+
+    The series is cut into buckets of bucket samples and each bucket keeps the sample
+    of its minimum and the sample of its maximum, in time order. A plot of the kept
+    samples therefore has the same envelope as the full series, unlike striding,
+    which misses short spikes such as the braking points of a speed trace.
+
+    Args:
+        values (np.ndarray): The series, e.g. one driver's speed.
+        bucket (int): Samples per bucket; about 2 / bucket of the samples are kept.
+
+    Returns:
+        np.ndarray: Sorted, unique indices of the kept samples.
+    """
+
+    n = len(values)
+    if n <= 2 or bucket <= 2:
+        return np.arange(n)
+
+    # Pad the last bucket with its final value; indices past the end are clipped.
+    n_buckets = -(-n // bucket)
+    padded = np.pad(
+        np.asarray(values, dtype=np.float64), (0, n_buckets * bucket - n), mode="edge"
+    ).reshape(n_buckets, bucket)
+
+    offsets = np.arange(n_buckets) * bucket
+    i_min = offsets + np.argmin(padded, axis=1)
+    i_max = offsets + np.argmax(padded, axis=1)
+
+    indices = np.sort(np.stack([i_min, i_max], axis=1), axis=1).ravel()
+    indices = np.minimum(indices, n - 1)
+
+    return np.unique(np.concatenate([[0], indices, [n - 1]]))
+
+
+def get_levels(values: np.ndarray, buckets: Tuple[int, ...]) -> List[np.ndarray]:
+    """
+    Build a pyramid of ever coarser selections of a series.
+
+    Every level is decimated from the one below it rather than from the full series,
+    so building the pyramid costs little more than its first level.
+
+    Args:
+        values (np.ndarray): The series, e.g. one driver's speed.
+        buckets (Tuple[int, ...]): Increasing samples per bucket of each level,
+            relative to the full series, each a multiple of the one before.
+
+    Returns:
+        List[np.ndarray]: For each level, the sorted indices of its samples into values.
+    """
+
+    levels = []
+    indices = np.arange(len(values))
+    bucket_prev = 1
+
+    for bucket in buckets:
+        # The level below keeps up to 2 samples per bucket, so merge twice as many.
+        step = 2 * bucket // bucket_prev if levels else bucket
+        indices = indices[get_indices_minmax(values[indices], step)]
+        levels.append(indices)
+        bucket_prev = bucket
+
+    return levels
@@ -0,0 +1,408 @@
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .downsampling import get_levels
+
+CHANNELS = {
+    "SessionTime": np.float64,
+    "Speed": np.float32,
+    "RPM": np.float32,
+    "Throttle": np.float32,
+    "Brake": np.uint8,
+    "nGear": np.int8,
+    "DRS": np.uint8,
+}
+
+
+class TelemetryStore:
+    def __init__(
+        self,
+        path: str,
+        channels_pyramid: Tuple[str, ...] = ("Speed",),
+        buckets: Tuple[int, ...] = (4, 16, 64, 256),
+    ):
+        self.path = path
+        self.channels_pyramid = channels_pyramid
+        self.buckets = buckets
+        self.arrays = {}
+        self.indexes = {}
+
+    def __get_dir_session(self, year: int, round: int, session: str) -> str:
+        """
+        Get the directory holding one session's arrays and index.
+
+        Args:
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (P, Q, R).
+
+        Returns:
+            str: Path of the session directory.
+        """
+
+        return os.path.join(self.path, f"{year}_{round:02d}_{session}")
+
+    def write_session(
+        self, data_session: object, year: int, round: int, session: str
+    ) -> Dict:
+        """
+        Write a loaded FastF1 session's car data to fixed-dtype arrays on disk.
+
+        Every channel is stored as one .npy file with all drivers back to back; the
+        index records each driver's [start, stop) slice and each lap's slice within it.
+        Each channel of channels_pyramid also gets a pyramid of decimated levels, one
+        per bucket size, stored as the indices of their samples.
+
+        Args:
+            data_session (object): Loaded FastF1 session with telemetry.
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (P, Q, R).
+
+        Returns:
+            Dict: The session index.
+        """
+
+        dir_session = self.__get_dir_session(year, round, session)
+        os.makedirs(dir_session, exist_ok=True)
+
+        laps = data_session.laps.dropna(subset=["LapStartTime", "Time"])
+        numbers = [n for n in data_session.car_data if len(data_session.car_data[n])]
+
+        index = {"year": year, "round": round, "session": session, "drivers": {}}
+        list_car_data = []
+        offset = 0
+
+        for number in numbers:
+            df_car = data_session.car_data[number]
+            laps_driver = laps[laps["DriverNumber"] == number].sort_values("LapNumber")
+            t = df_car["SessionTime"].dt.total_seconds().to_numpy()
+
+            start = np.searchsorted(
+                t, laps_driver["LapStartTime"].dt.total_seconds().to_numpy()
+            )
+            stop = np.searchsorted(t, laps_driver["Time"].dt.total_seconds().to_numpy())
+            driver = laps_driver["Driver"].iloc[0] if len(laps_driver) else str(number)
+
+            index["drivers"][driver] = {
+                "number": str(number),
+                "start": offset,
+                "stop": offset + len(t),
+                "laps": {
+                    str(int(lap)): [offset + int(a), offset + int(b)]
+                    for lap, a, b in zip(laps_driver["LapNumber"], start, stop)
+                },
+            }
+            list_car_data.append(df_car)
+            offset += len(t)
+
+        df_car_all = pd.concat(list_car_data, ignore_index=True)
+
+        for channel, dtype in CHANNELS.items():
+            values = df_car_all[channel]
+            if channel == "SessionTime":
+                values = values.dt.total_seconds()
+            array = np.lib.format.open_memmap(
+                os.path.join(dir_session, f"{channel}.npy"),
+                mode="w+",
+                dtype=dtype,
+                shape=(len(values),),
+            )
+            array[:] = values.to_numpy(dtype=dtype)
+            array.flush()
+            del array
+
+        index["channels"] = {c: np.dtype(d).str for c, d in CHANNELS.items()}
+        index["pyramids"] = {
+            channel: self.__write_pyramid(
+                dir_session, index, df_car_all[channel], channel
+            )
+            for channel in self.channels_pyramid
+        }
+        with open(os.path.join(dir_session, "index.json"), "w") as file:
+            json.dump(index, file)
+
+        self.indexes.pop((year, round, session), None)
+        self.arrays = {
+            k: v for k, v in self.arrays.items() if k[:3] != (year, round, session)
+        }
+
+        return index
+
+    def __write_pyramid(
+        self, dir_session: str, index: Dict, values: pd.Series, channel: str
+    ) -> Dict:
+        """
+        Write the decimated levels of one channel, every driver's back to back.
+
+        Args:
+            dir_session (str): Path of the session directory.
+            index (Dict): The session index, with every driver's slice.
+            values (pd.Series): The channel for all drivers of the session.
+            channel (str): The telemetry channel, e.g. 'Speed'.
+
+        Returns:
+            Dict: The bucket size of each level and each driver's [start, stop) slice
+                of every level.
+        """
+
+        values = values.to_numpy(dtype=np.float64)
+        list_levels = {}
+        pyramid = {"buckets": list(self.buckets), "drivers": {}}
+
+        for driver, entry in index["drivers"].items():
+            levels = get_levels(values[entry["start"] : entry["stop"]], self.buckets)
+            pyramid["drivers"][driver] = []
+            for level, indices in enumerate(levels):
+                list_level = list_levels.setdefault(level, [])
+                start = sum(len(i) for i in list_level)
+                list_level.append(entry["start"] + indices)
+                pyramid["drivers"][driver].append([start, start + len(indices)])
+
+        for level in range(len(self.buckets)):
+            indices = list_levels.get(level, [])
+            np.save(
+                os.path.join(dir_session, f"{channel}_L{level}.npy"),
+                (
+                    np.concatenate(indices).astype(np.int32)
+                    if indices
+                    else np.array([], dtype=np.int32)
+                ),
+            )
+
+        return pyramid
+
+    def get_sessions(self) -> List[Tuple[int, int, str]]:
+        """
+        List the sessions available in the store.
+
+        Returns:
+            List[Tuple[int, int, str]]: (year, round, session) of every stored session.
+        """
+
+        if not os.path.isdir(self.path):
+            return []
+
+        sessions = []
+        for name in sorted(os.listdir(self.path)):
+            if os.path.isfile(os.path.join(self.path, name, "index.json")):
+                year, round, session = name.split("_", 2)
+                sessions.append((int(year), int(round), session))
+
+        return sessions
+
+    def get_index(self, year: int, round: int, session: str) -> Dict:
+        """
+        Read, and cache, a session's driver and lap offsets.
+
+        Args:
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (P, Q, R).
+
+        Returns:
+            Dict: The session index.
+        """
+
+        key = (year, round, session)
+        if key not in self.indexes:
+            dir_session = self.__get_dir_session(year, round, session)
+            with open(os.path.join(dir_session, "index.json")) as file:
+                self.indexes[key] = json.load(file)
+
+        return self.indexes[key]
+
+    def __get_array(
+        self, year: int, round: int, session: str, channel: str
+    ) -> np.memmap:
+        """
+        Memory-map one channel of a session read-only, opening it once.
+
+        Args:
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (P, Q, R).
+            channel (str): The telemetry channel, e.g. 'Speed'.
+
+        Returns:
+            np.memmap: The channel for all drivers of the session.
+        """
+
+        key = (year, round, session, channel)
+        if key not in self.arrays:
+            if channel not in CHANNELS:
+                raise ValueError(f"Unknown telemetry channel: {channel}.")
+            dir_session = self.__get_dir_session(year, round, session)
+            self.arrays[key] = np.load(
+                os.path.join(dir_session, f"{channel}.npy"), mmap_mode="r"
+            )
+
+        return self.arrays[key]
+
+    def __get_level(
+        self, year: int, round: int, session: str, channel: str, level: int
+    ) -> np.memmap:
+        """
+        Memory-map one level of a channel's pyramid read-only, opening it once.
+
+        Args:
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (P, Q, R).
+            channel (str): The telemetry channel of the pyramid, e.g. 'Speed'.
+            level (int): The level, 0 being the finest.
+
+        Returns:
+            np.memmap: Indices of the level's samples for all drivers of the session.
+        """
+
+        key = (year, round, session, f"{channel}_L{level}")
+        if key not in self.arrays:
+            dir_session = self.__get_dir_session(year, round, session)
+            self.arrays[key] = np.load(
+                os.path.join(dir_session, f"{channel}_L{level}.npy"), mmap_mode="r"
+            )
+
+        return self.arrays[key]
+
+    def get_arrays(
+        self,
+        year: int,
+        round: int,
+        session: str,
+        driver: str,
+        lap: Optional[int] = None,
+        channels: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get read-only views of a driver's telemetry, optionally for a single lap.
+
+        Slicing a memory map returns a view, so no data is copied or parsed; pages are
+        read lazily and shared through the OS page cache.
+
+        Args:
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (P, Q, R).
+            driver (str): The driver abbreviation, e.g. 'PIA'.
+            lap (Optional[int]): The lap number. Defaults to the whole session.
+            channels (Optional[List[str]]): Channels to return. Defaults to all.
+
+        Returns:
+            Dict[str, np.ndarray]: Channel name to array view.
+        """
+
+        index = self.get_index(year, round, session)
+        try:
+            entry = index["drivers"][driver]
+        except KeyError:
+            raise ValueError(f"No telemetry stored for driver {driver}.")
+
+        if lap is None:
+            start, stop = entry["start"], entry["stop"]
+        else:
+            try:
+                start, stop = entry["laps"][str(lap)]
+            except KeyError:
+                raise ValueError(f"No telemetry stored for lap {lap} of {driver}.")
+
+        return {
+            channel: self.__get_array(year, round, session, channel)[start:stop]
+            for channel in (channels or list(CHANNELS))
+        }
+
+    def get_arrays_budget(
+        self,
+        year: int,
+        round: int,
+        session: str,
+        driver: str,
+        max_points: int,
+        lap: Optional[int] = None,
+        channels: Optional[List[str]] = None,
+        channel_pyramid: str = "Speed",
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get a driver's telemetry decimated to at most max_points samples, e.g. to plot.
+
+        The finest level of the pyramid of channel_pyramid within the budget is served,
+        so peaks and troughs of that channel are kept at any resolution. Full-rate views
+        are returned when they fit, and the coarsest level when nothing does.
+
+        Args:
+            year (int): The year of the session.
+            round (int): The round number of the session.
+            session (str): The session type (P, Q, R).
+            driver (str): The driver abbreviation, e.g. 'PIA'.
+            max_points (int): The maximum number of samples to return.
+            lap (Optional[int]): The lap number. Defaults to the whole session.
+            channels (Optional[List[str]]): Channels to return. Defaults to all.
+            channel_pyramid (str): The channel whose shape decides the samples kept.
+
+        Returns:
+            Dict[str, np.ndarray]: Channel name to array, all with the same samples.
+        """
+
+        arrays = self.get_arrays(year, round, session, driver, lap, [channel_pyramid])
+        n = len(arrays[channel_pyramid])
+        if n <= max_points:
+            return self.get_arrays(year, round, session, driver, lap, channels)
+
+        index = self.get_index(year, round, session)
+        try:
+            pyramid = index["pyramids"][channel_pyramid]
+        except KeyError:
+            raise ValueError(
+                f"No pyramid stored for telemetry channel {channel_pyramid}."
+            )
+
+        entry = index["drivers"][driver]
+        start, stop = (
+            (entry["start"], entry["stop"]) if lap is None else entry["laps"][str(lap)]
+        )
+
+        for level, (level_start, level_stop) in enumerate(pyramid["drivers"][driver]):
+            indices = self.__get_level(year, round, session, channel_pyramid, level)[
+                level_start:level_stop
+            ]
+            # A lap is a contiguous range of samples, hence of every level's indices.
+            indices = indices[
+                np.searchsorted(indices, start) : np.searchsorted(indices, stop)
+            ]
+            if len(indices) <= max_points:
+                break
+
+        return {
+            channel: self.__get_array(year, round, session, channel)[indices]
+            for channel in (channels or list(CHANNELS))
+        }
+
+    def scan(
+        self,
+        channels: List[str],
+        sessions: Optional[List[Tuple[int, int, str]]] = None,
+        drivers: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[Tuple[int, int, str], str, Dict[str, np.ndarray]]]:
+        """
+        Iterate over the telemetry of many sessions without loading it into memory.
+
+        Args:
+            channels (List[str]): Channels to return.
+            sessions (Optional[List[Tuple[int, int, str]]]): Sessions to scan.
+                Defaults to every stored session.
+            drivers (Optional[List[str]]): Driver abbreviations. Defaults to all drivers.
+
+        Yields:
+            Tuple[Tuple[int, int, str], str, Dict[str, np.ndarray]]:
+                The session key, the driver and its channel views.
+        """
+
+        for key in sessions or self.get_sessions():
+            index = self.get_index(*key)
+            for driver in index["drivers"]:
+                if drivers is None or driver in drivers:
+                    yield key, driver, self.get_arrays(*key, driver, channels=channels)
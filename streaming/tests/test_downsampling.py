@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.storage.downsampling import get_indices_minmax, get_levels
+
+
+@pytest.fixture
+def values() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    values = 200 + 50 * np.sin(np.linspace(0, 20, 10_000)) + rng.normal(0, 1, 10_000)
+    values[1234] = 400.0
+    values[5678] = 0.0
+
+    return values
+
+
+def test_minmax_keeps_peaks_and_ends(values):
+    indices = get_indices_minmax(values, 64)
+
+    assert {0, 1234, 5678, len(values) - 1} <= set(indices)
+    assert values[indices].max() == values.max()
+    assert values[indices].min() == values.min()
+
+
+def test_minmax_keeps_two_samples_per_bucket_sorted(values):
+    indices = get_indices_minmax(values, 100)
+
+    assert len(indices) <= 2 * 100 + 2
+    assert (np.diff(indices) > 0).all()
+
+
+def test_minmax_handles_a_partial_last_bucket():
+    values = np.array([1.0, 5.0, 2.0, 3.0, 9.0, 0.0, 4.0])
+
+    indices = get_indices_minmax(values, 3)
+
+    assert indices.max() == len(values) - 1
+    assert {1, 4, 5} <= set(indices)
+
+
+@pytest.mark.parametrize("n, bucket", [(0, 8), (2, 8), (100, 2)])
+def test_minmax_keeps_everything_when_there_is_nothing_to_merge(n, bucket):
+    indices = get_indices_minmax(np.arange(n, dtype=float), bucket)
+
+    np.testing.assert_array_equal(indices, np.arange(n))
+
+
+def test_levels_are_nested_and_shrinking(values):
+    levels = get_levels(values, (4, 16, 64, 256))
+
+    assert len(levels) == 4
+    for finer, coarser in zip(levels, levels[1:]):
+        assert len(coarser) < len(finer)
+        assert set(coarser) <= set(finer)
+    for level, bucket in zip(levels, (4, 16, 64, 256)):
+        assert len(level) <= 2 * -(-len(values) // bucket) + 2
+        assert values[level].max() == values.max()
+        assert values[level].min() == values.min()
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.mini_sectors import MiniSectors
+
+RADIUS = 500.0
+LENGTH = 2 * np.pi * RADIUS
+
+
+def get_pos(lap_time: float, n_laps: int) -> pd.DataFrame:
+    # Constant speed round a circle, starting on the line at angle 0.
+    t = np.arange(0.0, lap_time * n_laps + 0.05, 0.1)
+    angle = 2 * np.pi * t / lap_time
+
+    return pd.DataFrame(
+        {
+            "SessionTime": pd.to_timedelta(t, unit="s"),
+            "X": RADIUS * np.cos(angle),
+            "Y": RADIUS * np.sin(angle),
+        }
+    )
+
+
+@pytest.fixture
+def data_session(get_data_session) -> SimpleNamespace:
+    return get_data_session(
+        60.0, 62.0, pos_data={"81": get_pos(60.0, 3), "4": get_pos(62.0, 3)}
+    )
+
+
+def test_track_follows_the_reference_lap(data_session):
+    track = MiniSectors(n_sectors=10).get_track(data_session)
+
+    assert track["length"] == pytest.approx(LENGTH, rel=1e-3)
+    np.testing.assert_allclose(np.hypot(*track["points"].T), RADIUS, rtol=1e-3)
+    assert track["edges"][[0, -1]].tolist() == [0.0, track["length"]]
+
+
+def test_distance_projects_between_track_points(data_session):
+    instance = MiniSectors(resolution=50.0)
+    track = instance.get_track(data_session)
+    angle = np.array([0.1, 1.0, 3.0, 6.0])
+
+    d = instance.get_distance(
+        track, np.column_stack([RADIUS * np.cos(angle), RADIUS * np.sin(angle)])
+    )
+
+    np.testing.assert_allclose(d, angle * RADIUS, rtol=1e-2)
+
+
+def test_sector_times_add_up_to_the_lap_time(data_session):
+    df = MiniSectors(n_sectors=20).get_df_mini_sectors(data_session, 2024, 1, "R")
+
+    assert len(df) == 2 * 3 * 20
+    df_laps = df.groupby(["driver", "lap"])["time"].sum()
+    np.testing.assert_allclose(df_laps.loc["PIA"], 60.0)
+    np.testing.assert_allclose(df_laps.loc["NOR"], 62.0)
+    np.testing.assert_allclose(
+        df.loc[df["driver"] == "PIA", "time"], 60.0 / 20, atol=0.05
+    )
+
+
+def test_lap_not_covered_by_positions_is_nan(data_session):
+    data_session.pos_data["4"] = get_pos(62.0, 2)
+
+    df = MiniSectors(n_sectors=10).get_df_mini_sectors(data_session, 2024, 1, "R")
+
+    df_nor = df[df["driver"] == "NOR"]
+    assert df_nor.loc[df_nor["lap"] == 3, "time"].isna().all()
+    assert df_nor.loc[df_nor["lap"] < 3, "time"].notna().all()
+
+
+def test_teammates_compare_best_sector_times(data_session):
+    instance = MiniSectors(n_sectors=10)
+    df_pairs = instance.get_df_teammates(
+        instance.get_df_mini_sectors(data_session, 2024, 1, "R")
+    )
+
+    assert len(df_pairs) == 2 * 10
+    df_pia = df_pairs[df_pairs["driver"] == "PIA"]
+    np.testing.assert_allclose(df_pia["delta_time"], -0.2, atol=0.05)
+
+
+def test_session_without_positions_raises(data_session):
+    data_session.pos_data = {}
+
+    with pytest.raises(ValueError):
+        MiniSectors().get_track(data_session)
+
+
+def test_teammates_are_compared_within_each_session(data_session, get_data_session):
+    instance = MiniSectors(n_sectors=10)
+    df_quali = instance.get_df_mini_sectors(data_session, 2024, 1, "Q")
+    data_session_race = get_data_session(
+        63.0, 62.0, pos_data={"81": get_pos(63.0, 3), "4": get_pos(62.0, 3)}
+    )
+    df_race = instance.get_df_mini_sectors(data_session_race, 2024, 1, "R")
+
+    df_pairs = instance.get_df_teammates(pd.concat([df_quali, df_race]))
+
+    assert len(df_pairs) == 2 * 2 * 10
+    df_pia = df_pairs[df_pairs["driver"] == "PIA"].groupby("session")["delta_time"]
+    np.testing.assert_allclose(df_pia.mean().loc[["Q", "R"]], [-0.2, 0.1], atol=0.05)
@@ -0,0 +1,150 @@
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.race_events import RaceEvents
+
+
+def get_data_session(
+    positions: Dict[str, List[Optional[int]]],
+    pits: Optional[Dict[str, int]] = None,
+    lap_times: Optional[Dict[str, List[float]]] = None,
+    statuses: Optional[List[str]] = None,
+) -> SimpleNamespace:
+    """
+    Build a race session from per-lap positions; None marks a retired driver's laps.
+    Each position behind the leader is one second behind at the lap end.
+    """
+
+    pits = pits or {}
+    rows = []
+    for driver, driver_positions in positions.items():
+        for i, position in enumerate(driver_positions):
+            if position is None:
+                continue
+            lap_time = lap_times[driver][i] if lap_times else 90.0
+            rows.append(
+                {
+                    "Driver": driver,
+                    "LapNumber": float(i + 1),
+                    "Position": float(position),
+                    "Time": pd.Timedelta(seconds=90.0 * (i + 1) + position - 1),
+                    "LapTime": pd.Timedelta(seconds=lap_time),
+                    "PitInTime": (
+                        pd.Timedelta(seconds=1) if pits.get(driver) == i + 1 else pd.NaT
+                    ),
+                    "PitOutTime": pd.NaT,
+                    "TrackStatus": statuses[i] if statuses else "1",
+                }
+            )
+
+    return SimpleNamespace(laps=pd.DataFrame(rows))
+
+
+def get_df_events(data_session: SimpleNamespace, event: str) -> pd.DataFrame:
+    df = RaceEvents().get_df_events(data_session, 2024, 1)
+
+    return df[df["event"] == event].reset_index(drop=True)
+
+
+def test_order_swap_is_an_overtake():
+    data_session = get_data_session({"PIA": [2, 2, 1, 1], "NOR": [1, 1, 2, 2]})
+
+    df = get_df_events(data_session, "overtake")
+
+    assert len(df) == 1
+    assert df.loc[0, ["lap", "driver", "driver_other", "value"]].tolist() == [
+        3,
+        "PIA",
+        "NOR",
+        1.0,
+    ]
+
+
+def test_order_swap_around_a_pit_stop_is_not_an_overtake():
+    data_session = get_data_session(
+        {"PIA": [2, 2, 1, 1], "NOR": [1, 1, 2, 2]}, pits={"NOR": 3}
+    )
+
+    assert get_df_events(data_session, "overtake").empty
+
+
+def test_earlier_stop_gaining_the_place_is_an_undercut():
+    data_session = get_data_session(
+        {"PIA": [2, 2, 2, 2, 1, 1], "NOR": [1, 1, 1, 1, 2, 2]},
+        pits={"PIA": 3, "NOR": 4},
+    )
+
+    df = get_df_events(data_session, "undercut")
+
+    assert len(df) == 1
+    assert df.loc[0, ["lap", "driver", "driver_other"]].tolist() == [5, "PIA", "NOR"]
+    assert df.loc[0, "value"] == 1.0
+    assert get_df_events(data_session, "overcut").empty
+
+
+def test_later_stop_gaining_the_place_is_an_overcut():
+    data_session = get_data_session(
+        {"PIA": [1, 1, 1, 1, 2, 2], "NOR": [2, 2, 2, 2, 1, 1]},
+        pits={"PIA": 3, "NOR": 4},
+    )
+
+    df = get_df_events(data_session, "overcut")
+
+    assert len(df) == 1
+    assert df.loc[0, ["lap", "driver", "driver_other"]].tolist() == [5, "NOR", "PIA"]
+
+
+def test_retirement_after_a_stop_is_not_an_overcut():
+    data_session = get_data_session(
+        {"PIA": [1, 1, 1, 1, None, None], "NOR": [2, 2, 2, 2, 1, 1]},
+        pits={"PIA": 3, "NOR": 4},
+    )
+
+    assert get_df_events(data_session, "overcut").empty
+    assert get_df_events(data_session, "undercut").empty
+
+
+def test_safety_car_period_reports_the_spread_ratio():
+    data_session = get_data_session(
+        {"PIA": [1, 1, 1, 1, 1], "NOR": [2, 2, 2, 2, 2]},
+        statuses=["1", "1", "4", "4", "1"],
+    )
+
+    df = get_df_events(data_session, "safety_car")
+
+    assert df["lap"].tolist() == [3]
+    assert df.loc[0, "value"] == 1.0
+
+
+def test_fastest_lap_changes_are_reported_when_improved():
+    data_session = get_data_session(
+        {"PIA": [1, 1, 1], "NOR": [2, 2, 2]},
+        lap_times={"PIA": [92.0, 91.0, 91.5], "NOR": [93.0, 91.5, 90.5]},
+    )
+
+    df = get_df_events(data_session, "fastest_lap")
+
+    assert df["lap"].tolist() == [1, 2, 3]
+    assert df["driver"].tolist() == ["PIA", "PIA", "NOR"]
+    np.testing.assert_allclose(df["value"], [92.0, 91.0, 90.5])
+
+
+def test_events_are_tagged_and_sorted_by_lap():
+    data_session = get_data_session({"PIA": [2, 1, 1], "NOR": [1, 2, 2]})
+
+    df = RaceEvents().get_df_events(data_session, 2024, 7)
+
+    assert list(df.columns) == [
+        "year",
+        "round",
+        "lap",
+        "event",
+        "driver",
+        "driver_other",
+        "value",
+    ]
+    assert (df["year"] == 2024).all() and (df["round"] == 7).all()
+    assert df["lap"].is_monotonic_increasing
@@ -0,0 +1,92 @@
+import os
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from threadpoolctl import threadpool_info
+
+from src.execution.session_pool import run_job, SessionPool, VARS_THREADS
+
+
+def load_session(year: int, round: int, session: str, telemetry: bool):
+    if round == 13:
+        raise ValueError("No data for round 13.")
+    return SimpleNamespace(n_laps=round * 10, telemetry=telemetry)
+
+
+def get_df_laps(data_session, year: int, round: int, session: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "year": year,
+            "round": round,
+            "session": session,
+            "lap": range(data_session.n_laps),
+            "telemetry": data_session.telemetry,
+        }
+    )
+
+
+def get_df_threads(data_session, year: int, round: int, session: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "var": VARS_THREADS,
+            "value": [os.environ.get(var) for var in VARS_THREADS],
+            "max_threads": max(
+                [pool["num_threads"] for pool in threadpool_info()], default=1
+            ),
+        }
+    )
+
+
+def test_job_writes_one_chunk_from_the_loaded_session(tmp_path):
+    job, path, n_rows = run_job(
+        get_df_laps, (2023, 2, "R"), str(tmp_path), True, load_session
+    )
+
+    assert job == (2023, 2, "R")
+    assert path == str(tmp_path / "2023_02_R.parquet")
+    assert n_rows == 20
+    df = pd.read_parquet(path)
+    assert df["telemetry"].all()
+    assert set(df["round"]) == {2}
+
+
+@pytest.fixture
+def pool(tmp_path) -> SessionPool:
+    return SessionPool(str(tmp_path), max_workers=2, loader=load_session)
+
+
+def test_pool_collects_chunks_in_job_order(pool):
+    jobs = [(2023, 3, "R"), (2023, 1, "R"), (2022, 2, "Q")]
+
+    paths = pool.run(get_df_laps, jobs, "laps")
+
+    assert set(paths) == set(jobs)
+    df = pool.get_df_results("laps", columns=["year", "round"])
+    assert df.drop_duplicates().values.tolist() == [[2022, 2], [2023, 1], [2023, 3]]
+    assert len(df) == 60
+
+
+def test_pool_records_failed_jobs(pool):
+    paths = pool.run(get_df_laps, [(2023, 1, "R"), (2023, 13, "R")], "laps")
+
+    assert list(paths) == [(2023, 1, "R")]
+    assert "round 13" in pool.failed["laps"][(2023, 13, "R")]
+
+
+def test_pool_without_results_is_empty(pool):
+    pool.run(get_df_laps, [(2023, 13, "R")], "laps")
+
+    assert pool.get_df_results("laps", columns=["year"]).empty
+
+
+def test_threads_are_limited_in_workers_only(pool, monkeypatch):
+    for var in VARS_THREADS:
+        monkeypatch.delenv(var, raising=False)
+
+    pool.run(get_df_threads, [(2023, 1, "R")], "threads")
+
+    df = pool.get_df_results("threads")
+    assert df["value"].tolist() == ["1"] * len(VARS_THREADS)
+    assert df["max_threads"].max() == 1
+    assert not any(var in os.environ for var in VARS_THREADS)
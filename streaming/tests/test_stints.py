@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.stints import StintAnalysis
+
+
+N_LAPS = 20
+
+
+def get_laps(
+    driver: str, stints: List[Tuple[str, int, float, float]], statuses: dict = None
+) -> pd.DataFrame:
+    """
+    Build a driver's laps from (compound, laps, pace, degradation) stints, with lap
+    times exact for the fuel correction, a pit stop between stints and no first-lap
+    penalty.
+    """
+
+    rows = []
+    lap = 1
+    for i, (compound, n_laps, pace, degradation) in enumerate(stints):
+        for age in range(1, n_laps + 1):
+            corrected = pace + degradation * age
+            rows.append(
+                {
+                    "Driver": driver,
+                    "Team": "McLaren",
+                    "LapNumber": float(lap),
+                    "LapTime": pd.Timedelta(seconds=corrected + 0.03 * (N_LAPS - lap)),
+                    "Compound": compound,
+                    "TyreLife": float(age),
+                    "PitInTime": (
+                        pd.Timedelta(seconds=1)
+                        if age == n_laps and i < len(stints) - 1
+                        else pd.NaT
+                    ),
+                    "PitOutTime": (
+                        pd.Timedelta(seconds=1) if age == 1 and i > 0 else pd.NaT
+                    ),
+                    "TrackStatus": (statuses or {}).get(lap, "1"),
+                }
+            )
+            lap += 1
+
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def data_session() -> SimpleNamespace:
+    return SimpleNamespace(
+        laps=pd.concat(
+            [
+                get_laps("PIA", [("MEDIUM", 10, 90.0, 0.10), ("HARD", 10, 89.5, 0.05)]),
+                get_laps("NOR", [("MEDIUM", 12, 90.2, 0.15), ("HARD", 8, 89.4, 0.05)]),
+            ],
+            ignore_index=True,
+        )
+    )
+
+
+def test_stints_start_on_pit_exit_and_compound_change(data_session):
+    df_laps = StintAnalysis().get_df_laps(data_session, 2024, 1)
+    df_pia = df_laps[df_laps["driver"] == "PIA"]
+
+    assert df_pia["stint"].tolist() == [1] * 10 + [2] * 10
+    assert df_pia.loc[df_pia["stint"] == 2, "compound"].unique().tolist() == ["HARD"]
+
+
+def test_fit_excludes_first_pit_and_neutralised_laps():
+    laps = get_laps(
+        "PIA",
+        [("MEDIUM", 10, 90.0, 0.10), ("HARD", 10, 89.5, 0.05)],
+        statuses={5: "14"},
+    )
+    df_laps = StintAnalysis().get_df_laps(SimpleNamespace(laps=laps), 2024, 1)
+
+    assert df_laps.loc[~df_laps["fit"], "lap"].tolist() == [1, 5, 10, 11]
+
+
+def test_fit_excludes_laps_slower_than_the_threshold(data_session):
+    data_session.laps.loc[3, "LapTime"] += pd.Timedelta(seconds=20)
+
+    df_laps = StintAnalysis().get_df_laps(data_session, 2024, 1)
+
+    assert not df_laps.loc[
+        (df_laps["driver"] == "PIA") & (df_laps["lap"] == 4), "fit"
+    ].item()
+
+
+def test_degradation_and_pace_are_recovered(data_session):
+    instance = StintAnalysis()
+    df_stints = instance.get_df_stints(instance.get_df_laps(data_session, 2024, 1))
+    df_stints = df_stints.set_index(["driver", "stint"])
+
+    np.testing.assert_allclose(
+        df_stints["degradation"].sort_index(), [0.15, 0.05, 0.10, 0.05], atol=1e-6
+    )
+    np.testing.assert_allclose(
+        df_stints["pace"].sort_index(), [90.2, 89.4, 90.0, 89.5], atol=1e-6
+    )
+    np.testing.assert_allclose(df_stints["rmse"], 0.0, atol=1e-4)
+    assert df_stints.loc[("PIA", 1), "n_fit"] == 8
+    assert df_stints.loc[("PIA", 1), "n_laps"] == 10
+
+
+def test_short_stints_are_not_fitted():
+    laps = get_laps("PIA", [("SOFT", 3, 90.0, 0.1), ("HARD", 17, 89.5, 0.05)])
+    instance = StintAnalysis(min_laps=4)
+    df_stints = instance.get_df_stints(
+        instance.get_df_laps(SimpleNamespace(laps=laps), 2024, 1)
+    )
+
+    assert np.isnan(df_stints.loc[0, "degradation"])
+    assert df_stints.loc[1, "degradation"] == pytest.approx(0.05)
+
+
+def test_teammates_are_compared_per_compound(data_session):
+    instance = StintAnalysis()
+    df_stints = instance.get_df_stints(instance.get_df_laps(data_session, 2024, 1))
+    df_pairs = instance.get_df_teammates(df_stints).set_index(["driver", "compound"])
+
+    assert len(df_pairs) == 4
+    assert df_pairs.loc[("PIA", "MEDIUM"), "driver_teammate"] == "NOR"
+    assert df_pairs.loc[("PIA", "MEDIUM"), "delta_degradation"] == pytest.approx(-0.05)
+    assert df_pairs.loc[("NOR", "HARD"), "delta_pace"] == pytest.approx(-0.1)
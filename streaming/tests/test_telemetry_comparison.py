@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.telemetry_comparison import TelemetryComparison
+
+
+def get_car_data(speed: float, end: float) -> pd.DataFrame:
+    t = np.arange(0.0, end, 0.25)
+    return pd.DataFrame(
+        {
+            "SessionTime": pd.to_timedelta(t, unit="s"),
+            "Speed": np.full(len(t), speed),
+            "Throttle": np.full(len(t), 100.0),
+            "Brake": np.zeros(len(t)),
+        }
+    )
+
+
+@pytest.fixture
+def data_session(get_data_session) -> SimpleNamespace:
+    # Both drivers cover 5000 m a lap: PIA at 200 km/h in 90 s, NOR at 180 km/h in 100 s.
+    return get_data_session(
+        90.0,
+        100.0,
+        car_data={"81": get_car_data(200.0, 271.0), "4": get_car_data(180.0, 301.0)},
+    )
+
+
+def test_resampled_laps_share_the_distance_grid(data_session):
+    instance = TelemetryComparison(n_points=101)
+    df_laps = instance.get_resampled(data_session)
+
+    assert len(df_laps) == 6
+    np.testing.assert_allclose(df_laps["LapLength"], 5000.0, rtol=1e-2)
+    assert instance.channels["speed"].shape == (6, 101)
+    assert instance.distance[0] == 0.0
+
+
+def test_deltas_are_driver_a_minus_driver_b(data_session):
+    instance = TelemetryComparison(n_points=101)
+    instance.get_resampled(data_session)
+    df_deltas = instance.get_df_deltas([("PIA", "NOR")])
+
+    assert set(df_deltas["lap_a"]) == {1.0, 2.0, 3.0}
+    np.testing.assert_allclose(df_deltas["delta_speed"], 20.0)
+
+    df_end = df_deltas[df_deltas["distance"] == df_deltas["distance"].max()]
+    np.testing.assert_allclose(df_end["delta_time"], -10.0, atol=0.5)
+
+
+def test_default_pairs_are_teammates_fastest_laps(data_session):
+    instance = TelemetryComparison(n_points=11)
+    instance.get_resampled(data_session)
+    df_deltas = instance.get_df_deltas(fastest=True)
+
+    assert len(df_deltas) == 11
+    assert set(zip(df_deltas["driver_a"], df_deltas["driver_b"])) == {("NOR", "PIA")}
+
+
+def test_lap_starting_after_telemetry_ends_is_skipped(data_session):
+    laps = data_session.laps
+    late = laps[laps["Driver"] == "PIA"].tail(1).copy()
+    late["LapNumber"] = 4.0
+    late["LapStartTime"] = pd.Timedelta(seconds=400)
+    late["Time"] = pd.Timedelta(seconds=490)
+    data_session.laps = pd.concat([laps, late], ignore_index=True)
+
+    df_laps = TelemetryComparison(n_points=11).get_resampled(data_session)
+
+    assert 4.0 not in set(df_laps.loc[df_laps["Driver"] == "PIA", "LapNumber"])
+    assert len(df_laps) == 6
+
+
+def test_deltas_need_resampled_laps():
+    with pytest.raises(ValueError):
+        TelemetryComparison().get_df_deltas()
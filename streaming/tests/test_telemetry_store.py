@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.storage.telemetry_store import CHANNELS, TelemetryStore
+
+
+def get_car_data(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * 0.25
+
+    return pd.DataFrame(
+        {
+            "SessionTime": pd.to_timedelta(t, unit="s"),
+            "Speed": rng.uniform(80, 330, n),
+            "RPM": rng.uniform(8000, 12000, n),
+            "Throttle": rng.uniform(0, 100, n),
+            "Brake": rng.integers(0, 2, n),
+            "nGear": rng.integers(1, 9, n),
+            "DRS": np.zeros(n, dtype=int),
+        }
+    )
+
+
+@pytest.fixture
+def data_session() -> SimpleNamespace:
+    # Two 100 s laps each, sampled every 0.25 s.
+    laps = pd.DataFrame(
+        {
+            "Driver": ["PIA", "PIA", "NOR", "NOR"],
+            "DriverNumber": ["81", "81", "4", "4"],
+            "LapNumber": [1.0, 2.0, 1.0, 2.0],
+            "LapStartTime": pd.to_timedelta([0, 100, 0, 100], unit="s"),
+            "Time": pd.to_timedelta([100, 200, 100, 200], unit="s"),
+        }
+    )
+
+    return SimpleNamespace(
+        laps=laps, car_data={"81": get_car_data(800, 0), "4": get_car_data(800, 1)}
+    )
+
+
+@pytest.fixture
+def store(tmp_path, data_session) -> TelemetryStore:
+    store = TelemetryStore(str(tmp_path))
+    store.write_session(data_session, 2024, 1, "R")
+
+    return store
+
+
+def test_arrays_round_trip_with_their_dtypes(store, data_session):
+    arrays = store.get_arrays(2024, 1, "R", "NOR")
+
+    assert set(arrays) == set(CHANNELS)
+    for channel, dtype in CHANNELS.items():
+        assert arrays[channel].dtype == dtype
+    np.testing.assert_allclose(
+        arrays["Speed"], data_session.car_data["4"]["Speed"], rtol=1e-6
+    )
+    np.testing.assert_allclose(arrays["SessionTime"][[0, -1]], [0.0, 199.75])
+
+
+def test_lap_arrays_are_read_only_views(store):
+    arrays = store.get_arrays(2024, 1, "R", "PIA", lap=2, channels=["SessionTime"])
+    t = arrays["SessionTime"]
+
+    assert len(t) == 400
+    assert t[0] == 100.0
+    assert not t.flags.writeable
+
+
+def test_unknown_driver_or_lap_raises(store):
+    with pytest.raises(ValueError):
+        store.get_arrays(2024, 1, "R", "VER")
+    with pytest.raises(ValueError):
+        store.get_arrays(2024, 1, "R", "PIA", lap=3)
+
+
+def test_scan_yields_every_stored_driver(store):
+    scanned = list(store.scan(["Speed"]))
+
+    assert store.get_sessions() == [(2024, 1, "R")]
+    assert sorted(driver for _, driver, _ in scanned) == ["NOR", "PIA"]
+    assert all(len(arrays["Speed"]) == 800 for _, _, arrays in scanned)
+
+
+def test_budget_serves_a_pyramid_level_within_the_budget(store):
+    full = store.get_arrays(2024, 1, "R", "PIA", lap=1)
+
+    arrays = store.get_arrays_budget(2024, 1, "R", "PIA", max_points=120, lap=1)
+
+    assert len(arrays["Speed"]) <= 120
+    assert len({len(a) for a in arrays.values()}) == 1
+    assert arrays["Speed"].max() == full["Speed"].max()
+    assert arrays["Speed"].min() == full["Speed"].min()
+    t = arrays["SessionTime"]
+    assert (np.diff(t) > 0).all() and t[0] >= 0.0 and t[-1] < 100.0
+
+
+def test_budget_returns_full_rate_when_it_fits(store):
+    arrays = store.get_arrays_budget(2024, 1, "R", "PIA", max_points=1000, lap=1)
+
+    assert len(arrays["Speed"]) == 400